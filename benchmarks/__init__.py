@@ -0,0 +1,15 @@
+"""
+Benchmarks for edx_api_doc_tools.
+
+Run each benchmark as a module from the root of the repository, for example::
+
+    python -m benchmarks.bench_endpoint_enumeration
+
+These aren't tests, and aren't run by pytest.
+Importing this package sets up Django with the test settings.
+"""
+
+from .utils import setup_django
+
+
+setup_django()
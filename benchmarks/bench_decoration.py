@@ -0,0 +1,118 @@
+"""
+Benchmark the cost of importing a module of thousands of decorated views.
+
+Writes a module of APIViews whose handlers are documented with ``schema``
+(with long docstrings and parameter descriptions, like most Open edX views),
+then imports it in a fresh interpreter with Django already configured.
+Importing such modules is a cost that every worker pays on boot, so
+the decorators only record their inputs, and the docstrings are processed
+when a spec is generated. The last column is the time taken to process
+all of them, as the first spec generation does.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.utils import print_table
+
+
+VIEWS = (1000, 5000)
+
+VIEW_TEMPLATE = '''
+class View{number}(APIView):
+    @schema(
+        parameters=[
+            query_parameter('page', int, """
+                Page number of the results.
+
+                Starts at 1.
+            """),
+        ],
+        responses={{404: "Not found."}},
+    )
+    def get(self, request):
+        """
+        Get resource {number}.
+
+        Returns the resource, and the resources that it links to,
+        in the order that they were created. Only staff users can see
+        resources that are not published yet.
+        """
+
+    @schema(responses={{201: "Created."}})
+    def post(self, request):
+        """
+        Create resource {number}.
+
+        The new resource is not published until it's reviewed.
+        """
+'''
+
+RUNNER = """
+import json, os, sys, time
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, sys.argv[1])
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+import django
+django.setup()
+import rest_framework.views, drf_yasg.utils, drf_yasg.openapi
+start = time.perf_counter()
+import decorated_views
+import_seconds = time.perf_counter() - start
+start = time.perf_counter()
+for name, view in vars(decorated_views).items():
+    if name.startswith('View'):
+        for handler in (view.get, view.post):
+            overrides = handler._swagger_auto_schema
+            str(overrides['operation_summary']), str(overrides['operation_description'])
+            for parameter in overrides.get('manual_parameters', ()):
+                str(parameter.description)
+print(json.dumps([import_seconds, time.perf_counter() - start]))
+"""
+
+
+def write_module(module_dir, views):
+    """
+    Write the module of decorated views.
+    """
+    with open(os.path.join(module_dir, 'decorated_views.py'), 'w', encoding='utf-8') as module_file:
+        module_file.write(
+            "from rest_framework.views import APIView\n\n"
+            "from edx_api_doc_tools import query_parameter, schema\n"
+        )
+        for number in range(views):
+            module_file.write(VIEW_TEMPLATE.format(number=number))
+
+
+def run(module_dir, repeat=5):
+    """
+    Import the module in ``repeat`` fresh interpreters, and return the fastest import and processing times.
+    """
+    results = [
+        json.loads(subprocess.run(
+            [sys.executable, '-c', RUNNER, module_dir], check=True, capture_output=True, text=True,
+        ).stdout)
+        for _ in range(repeat)
+    ]
+    return min(import_seconds for import_seconds, _ in results), min(process for _, process in results)
+
+
+def main():
+    """
+    Time importing a module of each number of views.
+    """
+    rows = []
+    for views in VIEWS:
+        with tempfile.TemporaryDirectory() as module_dir:
+            write_module(module_dir, views)
+            # Compile the module once, so that the imports being timed don't.
+            subprocess.run([sys.executable, '-m', 'compileall', '-q', module_dir], check=True)
+            import_seconds, process_seconds = run(module_dir)
+        rows.append([views, views * 2, f'{import_seconds * 1000:.0f}', f'{process_seconds * 1000:.0f}'])
+    print_table(['views', 'operations', 'import (ms)', 'process docstrings (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark reporting documentation coverage for synthetic APIs of several sizes.
+
+Compares ``get_docs_coverage``, which joins the decorators' registries with
+the URLconf, with finding the documented endpoints by generating the spec,
+the only way to do it before.
+"""
+from django.test.utils import override_settings
+
+from benchmarks.utils import best_time, print_table, setup_django
+
+
+SCALES = (100, 1000, 10000)
+
+
+def main():
+    """
+    Time the coverage report and spec generation at each scale.
+    """
+    setup_django()
+    # pylint: disable=import-outside-toplevel
+    from benchmarks.synthetic import make_synthetic_urlconf
+    from edx_api_doc_tools import ApiSchemaGenerator, get_docs_coverage, make_api_info
+    from edx_api_doc_tools.doc_coverage import DOCUMENTED
+
+    rows = []
+    for operations in SCALES:
+        urlconf = make_synthetic_urlconf(operations)
+        with override_settings(ROOT_URLCONF=urlconf, OPENAPI_REUSE_OPERATIONS=False):
+            documented = sum(1 for endpoint in get_docs_coverage() if endpoint.status == DOCUMENTED)
+            coverage_seconds = best_time(get_docs_coverage)
+            generation_seconds = best_time(
+                lambda: ApiSchemaGenerator(make_api_info()).get_schema(None, public=True), repeat=1
+            )
+        rows.append([
+            operations,
+            documented,
+            f'{coverage_seconds * 1000:.1f}',
+            f'{generation_seconds * 1000:.0f}',
+            f'{generation_seconds / coverage_seconds:.0f}x',
+        ])
+    print_table(['operations', 'documented', 'coverage (ms)', 'generation (ms)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark endpoint enumeration by ApiSchemaGenerator against a large URLconf.
+
+Compares enumerating the whole URLconf and then filtering out non-/api/
+endpoints with skipping non-/api/ ``include()`` subtrees up front.
+"""
+from django.http import HttpResponse
+from django.urls import include, path
+from rest_framework.views import APIView
+
+from benchmarks.utils import best_time, install_urlconf, print_table
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info
+from edx_api_doc_tools.generators import PrefixEndpointEnumerator
+
+
+class BenchmarkView(APIView):
+    """
+    A trivial API view.
+    """
+
+    def get(self, request):
+        """
+        Do nothing.
+        """
+        return HttpResponse()
+
+
+def page_view(request):
+    """
+    Render an empty page, like a non-API view.
+    """
+    return HttpResponse()
+
+
+def make_urlconf(api_sections, other_sections, routes_per_section):
+    """
+    Build a URLconf with the given number of API and non-API ``include()`` sections.
+
+    Half of the routes in non-API sections are DRF views,
+    like the DRF-powered pages in the LMS.
+    """
+    api_view = BenchmarkView.as_view()
+
+    def section(index):
+        return [
+            path(f'route-{route}/<int:pk>/', api_view if route % 2 else page_view)
+            for route in range(routes_per_section)
+        ]
+
+    urlpatterns = [
+        path(f'api/section-{index}/', include(section(index)))
+        for index in range(api_sections)
+    ]
+    urlpatterns += [
+        path(f'pages/section-{index}/', include(section(index)))
+        for index in range(other_sections)
+    ]
+    return install_urlconf(f'benchmark_urls_{other_sections}', urlpatterns)
+
+
+def main():
+    """
+    Time endpoint enumeration with and without pruning at several URLconf sizes.
+    """
+    rows = []
+    for other_sections in (10, 100, 1000):
+        urlconf = make_urlconf(api_sections=10, other_sections=other_sections, routes_per_section=20)
+
+        def enumerate_all(urlconf=urlconf):
+            generator = ApiSchemaGenerator(make_api_info(), urlconf=urlconf)
+            generator.endpoint_enumerator_class = PrefixEndpointEnumerator
+            return generator.get_endpoints(None)
+
+        def enumerate_pruned(urlconf=urlconf):
+            return ApiSchemaGenerator(make_api_info(), urlconf=urlconf).get_endpoints(None)
+
+        assert enumerate_all().keys() == enumerate_pruned().keys()
+        all_seconds = best_time(enumerate_all)
+        pruned_seconds = best_time(enumerate_pruned)
+        rows.append([
+            (10 + other_sections) * 20,
+            len(enumerate_pruned()),
+            f'{all_seconds * 1000:.1f}',
+            f'{pruned_seconds * 1000:.1f}',
+            f'{all_seconds / pruned_seconds:.1f}x',
+        ])
+    print_table(['routes', '/api/ paths', 'unpruned (ms)', 'pruned (ms)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark merging the specs of dozens of services into one federated spec.
+
+Generates the spec of a synthetic API once, and writes a copy of it for each
+service, with every other service's definitions changed so that they conflict
+and have to be renamed. Then times merging the spec files and writing the
+merged spec as ``merge_api_docs --json-only`` does, broken down into loading,
+merging and rendering.
+"""
+import copy
+import json
+import os
+import tempfile
+import time
+
+from django.test.utils import override_settings
+
+from benchmarks.synthetic import make_synthetic_urlconf
+from benchmarks.utils import best_time, print_table
+from edx_api_doc_tools import ApiSchemaGenerator, ServiceSpec, make_api_info, merge_specs
+from edx_api_doc_tools.federation import FederatedSchemaProvider
+
+
+OPERATIONS_PER_SERVICE = 1000
+SERVICES = (10, 30)
+
+
+def write_service_specs(spec_dir, spec, services):
+    """
+    Write a copy of a spec for each service, and return their ServiceSpecs.
+    """
+    service_specs = []
+    for number in range(services):
+        service_spec = spec
+        if number % 2:
+            service_spec = copy.deepcopy(spec)
+            for definition in service_spec['definitions'].values():
+                definition['title'] = f'Service {number}'
+        path = os.path.join(spec_dir, f'service-{number}.json')
+        with open(path, 'w', encoding='utf-8') as spec_file:
+            json.dump(service_spec, spec_file)
+        service_specs.append(ServiceSpec(f'service-{number}', path))
+    return service_specs
+
+
+def main():
+    """
+    Time merging the specs of each number of services.
+    """
+    with override_settings(ROOT_URLCONF=make_synthetic_urlconf(OPERATIONS_PER_SERVICE)):
+        spec = ApiSchemaGenerator(make_api_info()).get_schema(public=True).as_dict()
+    spec = json.loads(json.dumps(spec))
+    rows = []
+    for services in SERVICES:
+        with tempfile.TemporaryDirectory() as spec_dir:
+            service_specs = write_service_specs(spec_dir, spec, services)
+            provider = FederatedSchemaProvider(make_api_info(), service_specs)
+            start = time.perf_counter()
+            loaded = [(service, service.load()) for service in service_specs]
+            load_seconds = time.perf_counter() - start
+            merge_seconds = best_time(lambda loaded=loaded: merge_specs({}, loaded), repeat=3)
+            merged = merge_specs({}, loaded)
+            render_seconds = best_time(lambda merged=merged: provider.render_data(merged, 'json'), repeat=3)
+            total_seconds = best_time(
+                lambda provider=provider, spec_dir=spec_dir: provider.write_spec_files(
+                    os.path.join(spec_dir, 'out'), spec_formats=('json',),
+                ),
+                repeat=1,
+            )
+        rows.append([
+            services,
+            len(merged['paths']),
+            len(merged['definitions']),
+            f'{load_seconds:.2f}',
+            f'{merge_seconds:.2f}',
+            f'{render_seconds:.2f}',
+            f'{total_seconds:.2f}',
+        ])
+    print(f"Each service has {OPERATIONS_PER_SERVICE} operations")
+    print_table(
+        ['services', 'paths', 'definitions', 'load JSON (s)', 'merge (s)', 'render JSON (s)',
+         'merge_api_docs --json-only (s)'],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark generating specs for synthetic APIs of several sizes.
+
+For each size, serves the JSON spec from a ``make_docs_data_view`` view with
+caching and operation reuse off, and measures the time taken, the peak memory
+allocated while generating, and the size of the spec. Results are compared
+with the baseline stored in ``benchmarks/baselines/generation.json``;
+pass ``--save-baseline`` to replace it with the current results.
+"""
+import argparse
+import json
+import os
+import tracemalloc
+
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from benchmarks.synthetic import make_synthetic_urlconf
+from benchmarks.utils import best_time, print_table
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info, make_docs_data_view
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'generation.json')
+DEFAULT_SCALES = (100, 1000, 10000)
+
+
+def get_spec(urlconf):
+    """
+    Serve the synthetic API's JSON spec from a fresh docs data view, and return the response.
+    """
+    with override_settings(
+        ROOT_URLCONF=urlconf,
+        ALLOWED_HOSTS=['testserver'],
+        OPENAPI_CACHE_TIMEOUT=0,
+        OPENAPI_REUSE_OPERATIONS=False,
+    ):
+        view = make_docs_data_view(make_api_info())
+        response = view(APIRequestFactory().get('/swagger.json'), format='.json')
+    assert response.status_code == 200, response.status_code
+    return response
+
+
+def measure(operations, repeat):
+    """
+    Measure generating the spec of a synthetic API with about ``operations`` operations.
+    """
+    urlconf = make_synthetic_urlconf(operations)
+    ApiSchemaGenerator._operation_cache.clear()  # pylint: disable=protected-access
+    spec = json.loads(get_spec(urlconf).content)
+    tracemalloc.start()
+    try:
+        get_spec(urlconf)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'operations': sum(
+            1 for path_item in spec['paths'].values() for key in path_item if key != 'parameters'
+        ),
+        'seconds': best_time(lambda: get_spec(urlconf), repeat),
+        'peak_memory_bytes': peak_bytes,
+        'size_bytes': len(json.dumps(spec, ensure_ascii=False).encode('utf-8')),
+    }
+
+
+def compare(value, baseline_value):
+    """
+    Describe the change from ``baseline_value`` to ``value``.
+    """
+    if not baseline_value:
+        return '-'
+    return f'{(value - baseline_value) / baseline_value:+.0%}'
+
+
+def main():
+    """
+    Measure spec generation at each requested size, and compare with the baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--scales',
+        type=int,
+        nargs='+',
+        default=DEFAULT_SCALES,
+        help="Approximate numbers of operations in the synthetic APIs.",
+    )
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs at each size.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    results = {}
+    rows = []
+    for scale in args.scales:
+        result = results[str(scale)] = measure(scale, args.repeat)
+        baseline_result = baseline.get(str(scale), {})
+        rows.append([
+            result['operations'],
+            f"{result['seconds'] * 1000:.0f}",
+            compare(result['seconds'], baseline_result.get('seconds')),
+            f"{result['peak_memory_bytes'] / 1024 / 1024:.1f}",
+            compare(result['peak_memory_bytes'], baseline_result.get('peak_memory_bytes')),
+            f"{result['size_bytes'] / 1024:.0f}",
+            compare(result['size_bytes'], baseline_result.get('size_bytes')),
+        ])
+    print_table(
+        [
+            'operations', 'time (ms)', 'vs. baseline', 'peak memory (MiB)', 'vs. baseline',
+            'size (KiB)', 'vs. baseline',
+        ],
+        rows,
+    )
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as baseline_file:
+            json.dump({**baseline, **results}, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+        print(f"Saved the baseline to {BASELINE_PATH}.")
+
+
+if __name__ == '__main__':
+    main()
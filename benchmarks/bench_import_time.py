@@ -0,0 +1,65 @@
+"""
+Benchmark the cost of importing edx_api_doc_tools.
+
+Each scenario runs in a fresh interpreter with Django already configured,
+and reports the time taken and the number of modules imported. The last
+scenario resolves every public name, which is what importing the package
+used to cost before its names were imported lazily.
+"""
+import json
+import subprocess
+import sys
+
+from benchmarks.utils import print_table
+
+
+SCENARIOS = [
+    ("import edx_api_doc_tools", "import edx_api_doc_tools"),
+    ("import the decorators", "from edx_api_doc_tools import query_parameter, schema, schema_for"),
+    (
+        "decorate a view",
+        "from edx_api_doc_tools import schema\n"
+        "schema(responses={404: 'Not found.'})(lambda self, request: None)",
+    ),
+    ("resolve every public name", "from edx_api_doc_tools import *"),
+]
+
+RUNNER = """
+import json, os, sys, time
+sys.path.insert(0, os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+from django.conf import settings
+settings.INSTALLED_APPS
+modules_before = len(sys.modules)
+start = time.perf_counter()
+exec(compile(sys.argv[1], '<scenario>', 'exec'), {})
+print(json.dumps([time.perf_counter() - start, len(sys.modules) - modules_before]))
+"""
+
+
+def run_scenario(code, repeat=5):
+    """
+    Run a scenario in ``repeat`` fresh interpreters, and return its fastest time and the modules it imported.
+    """
+    results = [
+        json.loads(subprocess.run(
+            [sys.executable, '-c', RUNNER, code], check=True, capture_output=True, text=True,
+        ).stdout)
+        for _ in range(repeat)
+    ]
+    return min(seconds for seconds, _ in results), results[0][1]
+
+
+def main():
+    """
+    Time each import scenario.
+    """
+    rows = []
+    for name, code in SCENARIOS:
+        seconds, modules = run_scenario(code)
+        rows.append([name, f'{seconds * 1000:.1f}', modules])
+    print_table(['scenario', 'time (ms)', 'modules imported'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark generating specs with several numbers of worker threads.
+
+Generates the spec of two synthetic APIs with OPENAPI_GENERATION_WORKERS set
+to each number: one whose views are pure Python, so that their inspection is
+CPU-bound and serialized by the GIL, and one whose views block on I/O while
+they're inspected, like views whose ``get_serializer_class`` or
+``get_queryset`` query the database or another service.
+"""
+import time
+
+from django.test.utils import override_settings
+from django.urls import path
+
+from benchmarks.utils import best_time, install_urlconf, print_table, setup_django
+
+
+WORKERS = (0, 2, 4, 8)
+OPERATIONS = 500
+# Roughly a database round trip.
+IO_SECONDS = 0.002
+
+
+def make_io_bound_urlconf(operations):
+    """
+    Make an API of ``operations`` GenericAPIViews whose ``get_serializer_class`` blocks on I/O.
+
+    Returns: str
+        The name of the URLconf module.
+    """
+    # pylint: disable=import-outside-toplevel
+    from rest_framework import serializers
+    from rest_framework.generics import GenericAPIView
+
+    from edx_api_doc_tools import schema
+
+    class ItemSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+        name = serializers.CharField()
+        count = serializers.IntegerField()
+
+    class IOBoundView(GenericAPIView):
+        """
+        A view that looks up its serializer class in the database.
+        """
+
+        def get_serializer_class(self):
+            time.sleep(IO_SECONDS)
+            return ItemSerializer
+
+        @schema()
+        def get(self, request):  # pylint: disable=unused-argument
+            """
+            Get an item.
+            """
+
+    view = IOBoundView.as_view()
+    urlpatterns = [path(f'api/items-{index}/', view) for index in range(operations)]
+    return install_urlconf(f'io_bound_urls_{operations}', urlpatterns)
+
+
+def main():
+    """
+    Time generating each API's spec with each number of workers.
+    """
+    setup_django()
+    # pylint: disable=import-outside-toplevel
+    from benchmarks.synthetic import make_synthetic_urlconf
+    from edx_api_doc_tools import ApiSchemaGenerator, make_api_info
+
+    apis = [('cpu-bound', make_synthetic_urlconf(OPERATIONS)), ('io-bound', make_io_bound_urlconf(OPERATIONS))]
+    rows = []
+    for name, urlconf in apis:
+        sequential_seconds = None
+        for workers in WORKERS:
+            with override_settings(
+                ROOT_URLCONF=urlconf, OPENAPI_REUSE_OPERATIONS=False, OPENAPI_GENERATION_WORKERS=workers,
+            ):
+                seconds = best_time(lambda: ApiSchemaGenerator(make_api_info()).get_schema(None, public=True), 3)
+            sequential_seconds = sequential_seconds or seconds
+            rows.append([name, workers, f'{seconds * 1000:.0f}', f'{sequential_seconds / seconds:.1f}x'])
+    print_table(['API', 'workers', 'time (ms)', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark rendering specs to JSON and YAML.
+
+Renders the example API's spec, and a synthetic large spec made by repeating
+its paths, to JSON and to YAML with PyYAML's LibYAML-based and pure-Python
+dumpers. Also times deriving the YAML spec from the rendered JSON spec, as
+the schema provider does when only the JSON spec is prebuilt or cached.
+"""
+import json
+
+import yaml
+from django.test.utils import override_settings
+from drf_yasg.codecs import YamlDumper
+
+from benchmarks.utils import best_time, print_table
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info
+from edx_api_doc_tools.schema_provider import SchemaProvider
+
+
+class PurePythonYamlDumper(yaml.SafeDumper):
+    """
+    drf_yasg's YAML dumper, without LibYAML.
+    """
+
+    ignore_aliases = YamlDumper.ignore_aliases
+    represent_text = YamlDumper.represent_text
+
+
+PurePythonYamlDumper.add_representer(str, PurePythonYamlDumper.represent_text)
+
+
+def make_spec(copies):
+    """
+    Generate the example API's spec, with its paths repeated ``copies`` times.
+    """
+    with override_settings(ROOT_URLCONF='example.urls'):
+        spec = ApiSchemaGenerator(make_api_info(), url='http://testserver').get_schema(public=True)
+    paths = list(spec['paths'].items())
+    for copy in range(1, copies):
+        for path, path_item in paths:
+            spec['paths'][f'/copy-{copy}{path}'] = path_item
+    return spec
+
+
+def dump_pure_python_yaml(data):
+    """
+    Dump plain data to YAML like drf_yasg does, but with the pure-Python dumper.
+    """
+    return yaml.dump(
+        data,
+        Dumper=PurePythonYamlDumper,
+        default_flow_style=False,
+        encoding='utf-8',
+        allow_unicode=True,
+        sort_keys=False,
+    )
+
+
+def main():
+    """
+    Time rendering each spec in each format.
+    """
+    rows = []
+    for name, copies in (('example', 1), ('synthetic', 1000)):
+        spec = make_spec(copies)
+        data = spec.as_dict()
+        json_content = SchemaProvider.render_data(data, 'json')
+        assert dump_pure_python_yaml(data) == SchemaProvider.render_data(data, 'yaml')
+        repeat = 5 if copies == 1 else 1
+        timings = [
+            best_time(lambda: SchemaProvider.render(spec, 'json'), repeat),
+            best_time(lambda: SchemaProvider.render(spec, 'yaml'), repeat),
+            best_time(lambda: dump_pure_python_yaml(data), repeat),
+            best_time(lambda: SchemaProvider.render_data(json.loads(json_content), 'yaml'), repeat),
+        ]
+        rows.append([
+            name,
+            len(spec['paths']),
+            f'{len(json_content) / 1024:.0f}',
+            *(f'{seconds * 1000:.1f}' for seconds in timings),
+        ])
+    if not yaml.__with_libyaml__:
+        print("Warning: PyYAML was built without LibYAML, so both YAML dumpers are pure Python.")
+    print_table(
+        [
+            'spec', 'paths', 'JSON size (KiB)', 'JSON (ms)', 'YAML, LibYAML (ms)',
+            'YAML, pure Python (ms)', 'YAML from JSON (ms)',
+        ],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
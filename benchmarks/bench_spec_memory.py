@@ -0,0 +1,83 @@
+"""
+Benchmark the memory that generated specs keep resident between requests.
+
+For a synthetic API, measures the memory retained by the generator's cache of
+reusable operations and by the index that spec shards are sliced from, with
+and without OPENAPI_COMPACT_SPECS, and checks that both produce the same spec.
+"""
+import gc
+import json
+import tracemalloc
+
+from django.test.utils import override_settings
+
+from benchmarks.synthetic import make_synthetic_urlconf
+from benchmarks.utils import print_table
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from edx_api_doc_tools.shards import SpecIndex
+
+
+OPERATIONS = 2000
+
+
+def retained_bytes(func):
+    """
+    Call ``func``, and return what it returns along with the memory still allocated once it returns.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def generate_schema():
+    """
+    Generate the synthetic API's schema, and discard it.
+    """
+    ApiSchemaGenerator(make_api_info()).get_schema(public=True)
+
+
+def generate(urlconf, compact):
+    """
+    Generate the synthetic API's spec from scratch, then again reusing cached operations.
+
+    Returns the memory retained by the operation cache, and the rendered spec.
+    """
+    with override_settings(ROOT_URLCONF=urlconf, OPENAPI_COMPACT_SPECS=compact):
+        ApiSchemaGenerator._operation_cache.clear()  # pylint: disable=protected-access
+        _, cache_bytes = retained_bytes(generate_schema)
+        spec = ApiSchemaGenerator(make_api_info()).get_schema(public=True)
+    return cache_bytes, SchemaProvider.render(spec, 'json')
+
+
+def main():
+    """
+    Measure the memory retained by generated specs, with and without compaction.
+    """
+    urlconf = make_synthetic_urlconf(OPERATIONS)
+    # Warm up the lazily built state of serializers and inspectors, which is retained either way.
+    generate(urlconf, compact=False)
+    rows = []
+    specs = []
+    for compact in (False, True):
+        cache_bytes, content = generate(urlconf, compact)
+        specs.append(content)
+        _, index_bytes = retained_bytes(lambda compact=compact: SpecIndex(json.loads(content), compact=compact))
+        rows.append([
+            'compact' if compact else 'default',
+            f'{cache_bytes / 1024 / 1024:.1f}',
+            f'{index_bytes / 1024 / 1024:.1f}',
+        ])
+    assert specs[0] == specs[1]
+    print(f"Synthetic API with {OPERATIONS} operations, {len(specs[0]) / 1024:.0f} KiB of JSON")
+    print_table(['representation', 'operation cache (MiB)', 'shard index (MiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
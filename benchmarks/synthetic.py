@@ -0,0 +1,141 @@
+"""
+Synthetic APIs of any size, for benchmarking spec generation.
+
+Each synthetic API is made of "resources". Every resource has its own nested
+serializers, a ViewSet documented with ``schema_for``, an APIView documented
+with ``schema``, and an undocumented ViewSet excluded with ``exclude_schema_for_all``.
+"""
+from django.urls import path
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.routers import SimpleRouter
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+from benchmarks.utils import install_urlconf
+from edx_api_doc_tools import exclude_schema_for_all, path_parameter, query_parameter, schema, schema_for
+
+
+# Number of documented operations per resource:
+# list, create, retrieve, update, partial_update and destroy on the ViewSet,
+# plus get and post on the APIView.
+OPERATIONS_PER_RESOURCE = 8
+
+# pylint: disable=abstract-method
+
+
+def make_serializers(name):
+    """
+    Make a resource's serializer, with a nested serializer and a nested list of another.
+    """
+    address_serializer = type(f'{name}AddressSerializer', (serializers.Serializer,), {
+        'street': serializers.CharField(),
+        'city': serializers.CharField(),
+        'postal_code': serializers.RegexField(r'^[0-9]{5}$'),
+    })
+    tag_serializer = type(f'{name}TagSerializer', (serializers.Serializer,), {
+        'slug': serializers.SlugField(),
+        'weight': serializers.FloatField(required=False),
+    })
+    return type(f'{name}Serializer', (serializers.Serializer,), {
+        'id': serializers.IntegerField(read_only=True),
+        'key': serializers.SlugField(),
+        'title': serializers.CharField(max_length=255),
+        'created': serializers.DateTimeField(read_only=True),
+        'status': serializers.ChoiceField(['draft', 'published', 'archived']),
+        'address': address_serializer(),
+        'tags': tag_serializer(many=True),
+    })
+
+
+def make_viewset(name, serializer_class):
+    """
+    Make a resource's documented ViewSet.
+    """
+    key_parameter = path_parameter('pk', int, f"ID of the {name}.")
+
+    def handler(self, request, pk=None):  # pylint: disable=unused-argument
+        return Response()
+
+    viewset_class = type(f'{name}ViewSet', (ViewSet,), {
+        'serializer_class': serializer_class,
+        **{
+            action: handler
+            for action in ('list', 'create', 'retrieve', 'update', 'partial_update', 'destroy')
+        },
+    })
+    decorators = [
+        schema_for(
+            'list',
+            f"List {name} objects.\n\nFiltered by the query parameters.",
+            parameters=[
+                query_parameter('status', str, "Only include objects with this status."),
+                query_parameter('page', int, "Page number."),
+            ],
+            responses={200: serializer_class(many=True)},
+        ),
+        schema_for('create', f"Create a {name}.", body=serializer_class, responses={201: serializer_class}),
+        schema_for('retrieve', f"Get a {name}.", parameters=[key_parameter], responses={200: serializer_class}),
+        schema_for('update', f"Replace a {name}.", body=serializer_class, parameters=[key_parameter]),
+        schema_for('partial_update', f"Update a {name}.", body=serializer_class, parameters=[key_parameter]),
+        schema_for('destroy', f"Delete a {name}.", parameters=[key_parameter], responses={404: "Not found."}),
+    ]
+    for decorator in decorators:
+        viewset_class = decorator(viewset_class)
+    return viewset_class
+
+
+def make_api_view(name, serializer_class):
+    """
+    Make a resource's documented APIView.
+    """
+    @schema(responses={200: serializer_class, 403: "Not allowed."})
+    def get(self, request):  # pylint: disable=unused-argument
+        """
+        Get the summary of a resource.
+
+        Only staff can see it.
+        """
+        return Response()
+
+    @schema(body=serializer_class, responses={204: "Done."})
+    def post(self, request):  # pylint: disable=unused-argument
+        """
+        Recalculate the summary of a resource.
+        """
+        return Response()
+
+    return type(f'{name}SummaryView', (APIView,), {'get': get, 'post': post})
+
+
+def make_excluded_viewset(name):
+    """
+    Make a resource's undocumented ViewSet.
+    """
+    def handler(self, request, pk=None):  # pylint: disable=unused-argument
+        return Response()
+
+    return exclude_schema_for_all(type(f'{name}InternalViewSet', (ViewSet,), {
+        'list': handler,
+        'retrieve': handler,
+    }))
+
+
+def make_synthetic_urlconf(operations):
+    """
+    Make a synthetic API with about ``operations`` documented operations under /api/.
+
+    Returns: str
+        The name of the URLconf module.
+    """
+    router = SimpleRouter()
+    urlpatterns = []
+    for index in range(max(operations // OPERATIONS_PER_RESOURCE, 1)):
+        name = f'Resource{index}'
+        serializer_class = make_serializers(name)
+        router.register(f'api/resource-{index}/v1/items', make_viewset(name, serializer_class), basename=name)
+        router.register(f'api/resource-{index}/v1/internal', make_excluded_viewset(name), basename=f'{name}-internal')
+        urlpatterns.append(
+            path(f'api/resource-{index}/v1/summary', make_api_view(name, serializer_class).as_view())
+        )
+    return install_urlconf(f'synthetic_urls_{operations}', urlpatterns + router.urls)
@@ -0,0 +1,50 @@
+"""
+Helpers shared by the benchmarks.
+"""
+import os
+import sys
+import time
+import types
+
+import django
+
+
+def setup_django():
+    """
+    Configure Django with the test settings, so that benchmarks can run outside of a Django project.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+    django.setup()
+
+
+def install_urlconf(module_name, urlpatterns):
+    """
+    Make a list of URL patterns importable as a URLconf module, and return the module's name.
+    """
+    module = types.ModuleType(module_name)
+    module.urlpatterns = urlpatterns
+    sys.modules[module_name] = module
+    return module_name
+
+
+def best_time(func, repeat=5):
+    """
+    Call ``func`` ``repeat`` times and return the fastest run time, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def print_table(headers, rows):
+    """
+    Print rows of values as a plain-text table.
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers, ['-' * width for width in widths], *rows]:
+        print('  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)))
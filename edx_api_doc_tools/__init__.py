@@ -3,47 +3,100 @@ Tools for writing and generating API documentation for Open edX REST APIs.
 
 In this file is the public Python API for REST documentation.
 """
+import importlib
+
 
 # The functions are split into separate files for code organization,
-# but they are imported into here so they can be imported
+# but they are exposed here so they can be imported
 # directly from `edx_api_doc_tools`.
-
-# Expose OpenAPI module through the edx_api_doc_tools package
-# so that general users don't have to know about drf_yasg.
-from drf_yasg import openapi
-
+#
+# Each submodule is only imported the first time one of its names is used,
+# so that processes which import this package but never generate docs
+# (Celery workers, most management commands) don't pay for importing
+# drf_yasg, DRF and Django's URL machinery.
+#
 # When adding new functions to this API,
 # add them to the appropriate sub-module,
-# and then "expose" them by importing them here.
-# Use explicit imports (as opposed to wildcard imports)
+# and then "expose" them by listing them here.
+# List names explicitly (as opposed to exposing whole modules)
 # so that we hide internal names and keep this module
 # a nice catalog of functions.
-from .conf_utils import (
-    ApiSchemaGenerator,
-    get_docs_cache_timeout,
-    get_docs_urls,
-    make_api_info,
-    make_docs_data_view,
-    make_docs_ui_view,
-    make_docs_urls,
-)
-from .data import (
-    FILE_PARAM,
-    PARAM_TYPES,
-    ParameterLocation,
-    parameter,
-    path_parameter,
-    query_parameter,
-    string_parameter,
-)
-from .view_utils import (
-    exclude_schema,
-    exclude_schema_for,
-    exclude_schema_for_all,
-    is_schema_request,
-    schema,
-    schema_for,
-)
+_SUBMODULE_EXPORTS = {
+    '.conf_utils': (
+        'get_docs_cache_timeout',
+        'get_docs_urls',
+        'make_api_info',
+        'make_docs_data_view',
+        'make_docs_ui_view',
+        'make_docs_urls',
+        'make_federated_docs_urls',
+    ),
+    '.data': (
+        'FILE_PARAM',
+        'PARAM_TYPES',
+        'ParameterLocation',
+        'parameter',
+        'path_parameter',
+        'query_parameter',
+        'string_parameter',
+    ),
+    '.doc_coverage': (
+        'get_docs_coverage',
+    ),
+    '.exclusions': (
+        'exclude_paths',
+    ),
+    '.federation': (
+        'ServiceSpec',
+        'merge_specs',
+    ),
+    '.generators': (
+        'ApiSchemaGenerator',
+    ),
+    '.view_utils': (
+        'exclude_schema',
+        'exclude_schema_for',
+        'exclude_schema_for_all',
+        'is_schema_request',
+        'schema',
+        'schema_for',
+        'schema_stubs',
+    ),
+}
 
+# Expose OpenAPI module through the edx_api_doc_tools package
+# so that general users don't have to know about drf_yasg.
+_MODULE_EXPORTS = {
+    'openapi': 'drf_yasg.openapi',
+}
+
+_LAZY_NAMES = {
+    name: module_name
+    for module_name, names in _SUBMODULE_EXPORTS.items()
+    for name in names
+}
+
+__all__ = ['openapi', *_LAZY_NAMES]  # pylint: disable=undefined-all-variable
 
 __version__ = "2.1.2"
+
+
+def __getattr__(name):
+    """
+    Import a public name from its module the first time it is used.
+    """
+    if name in _MODULE_EXPORTS:
+        value = importlib.import_module(_MODULE_EXPORTS[name])
+    elif name in _LAZY_NAMES:
+        value = getattr(importlib.import_module(_LAZY_NAMES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    List the public names, including those that haven't been imported yet.
+    """
+    return sorted(set(globals()) | set(__all__))
@@ -9,6 +9,8 @@ to generate API spec. It then uses Swagger to serve that spec.
 from django.apps import AppConfig, apps
 from django.core.exceptions import ImproperlyConfigured
 
+from .warmup import start_warmup
+
 
 class EdxApiDocToolsConfig(AppConfig):
     """
@@ -21,18 +23,19 @@ class EdxApiDocToolsConfig(AppConfig):
 
     def ready(self):
         """
-        Check whether 'drf_yasg' is in INSTALLED_APPS.
+        Check whether 'drf_yasg' is in INSTALLED_APPS, and start warming up specs if enabled.
 
         We prefer to throw an error upon initialization, because otherwise,
         a developer won't know something is wrong until they try to render the
         docs UI, at which point they'll just see a template load error.
 
+        See ``edx_api_doc_tools.warmup`` for warming up specs (OPENAPI_WARMUP).
+
         Overrides `AppConfig.ready`.
         """
-        for app in apps.get_app_configs():
-            if app.label == 'drf_yasg':
-                return
-        raise ImproperlyConfigured(
-            "To use edx_api_doc_tools, "
-            "'drf_yasg' must also be added to 'INSTALLED_APPS'."
-        )
+        if not any(app.label == 'drf_yasg' for app in apps.get_app_configs()):
+            raise ImproperlyConfigured(
+                "To use edx_api_doc_tools, "
+                "'drf_yasg' must also be added to 'INSTALLED_APPS'."
+            )
+        start_warmup()
@@ -3,23 +3,47 @@ Functions for setting up API doc generation & viewing in a repository.
 
 External users: import these from __init__.
 """
+import threading
 
 from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.urls import path, re_path
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from django.views.generic.base import RedirectView
 from drf_yasg import openapi
-from drf_yasg.generators import OpenAPISchemaGenerator
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
+from rest_framework.response import Response
 
+from .federation import FederatedSchemaProvider
+from .generators import ApiSchemaGenerator, DocsSchemaGenerator
+from .schema_provider import CONTENT_ENCODINGS, IDENTITY, SPEC_FILE_ENCODINGS, SchemaProvider, choose_content_encoding
 
-def make_docs_urls(api_info, api_url_patterns=None):
+
+# Map from the formats of drf_yasg's spec renderers to the format of the spec they render.
+# (The '.json' and '.yaml' formats used by our URL patterns are stripped of their dot first.)
+RENDERER_SPEC_FORMATS = {
+    'json': 'json',
+    'openapi': 'json',
+    'yaml': 'yaml',
+}
+
+# How many of the most expensive endpoints to list in Server-Timing headers.
+SERVER_TIMING_ENDPOINTS = 10
+
+
+def make_docs_urls(api_info, api_url_patterns=None, spec_dir=None, lazy=False):
     """
     Create API doc views given an API info object.
 
     Arguments:
         api_info (openapi.Info): Information about the API.
         api_url_patterns (list of url patterns): URL patterns that API docs will be generated for
+        spec_dir (str): Directory of prebuilt spec files to serve, if they exist.
+            Defaults to the OPENAPI_SPEC_DIR setting.
+        lazy (bool): If True, don't build the views (or read their settings)
+            until one of them is first requested; see ``LazyDocsViews``.
 
     Returns: list[RegexURLPattern]
         A list of url patterns to the API docs.
@@ -32,12 +56,126 @@ def make_docs_urls(api_info, api_url_patterns=None):
         api_info = make_api_info(title="Awesome API", version="v42")
         urlpatterns += make_docs_urls(api_info)
     """
+    if lazy:
+        lazy_views = LazyDocsViews(api_info, api_url_patterns, spec_dir=spec_dir)
+        return get_docs_urls(docs_data_view=lazy_views.data_view, docs_ui_view=lazy_views.ui_view)
+    # Back both views with the same provider, so that one generated spec
+    # serves the JSON and YAML specs and the UI's own fetch of the spec.
+    schema_provider = make_schema_provider(api_info, api_url_patterns, spec_dir=spec_dir)
+    return get_docs_urls(
+        docs_data_view=make_docs_data_view(api_info, api_url_patterns, schema_provider=schema_provider),
+        docs_ui_view=make_docs_ui_view(api_info, api_url_patterns, schema_provider=schema_provider),
+    )
+
+
+def make_federated_docs_urls(api_info, service_specs, spec_dir=None):
+    """
+    Create API doc views for a spec merged from the spec files of several services.
+
+    The views serve the merged spec files in ``spec_dir`` (as written by the
+    ``merge_api_docs`` or ``build_api_docs`` management commands) if they exist,
+    and otherwise merge the services' spec files once, when first requested.
+    See ``edx_api_doc_tools.federation`` for how specs are merged.
+
+    Arguments:
+        api_info (openapi.Info): Information about the federated API.
+        service_specs (list of ServiceSpec): The spec files of the services, in order of precedence.
+        spec_dir (str): Directory of prebuilt merged spec files to serve, if they exist.
+
+    Returns: list[RegexURLPattern]
+        A list of url patterns to the federated API docs.
+
+    Example::
+
+        # File: urls.py
+        from edx_api_doc_tools import ServiceSpec, make_api_info, make_federated_docs_urls
+        api_info = make_api_info(title="Open edX APIs", version="v1")
+        urlpatterns += make_federated_docs_urls(api_info, [
+            ServiceSpec('lms', '/edx/var/api-docs/lms/swagger.json'),
+            ServiceSpec('studio', '/edx/var/api-docs/studio/swagger.json'),
+        ])
+    """
+    schema_provider = FederatedSchemaProvider(
+        api_info, service_specs, spec_dir=spec_dir, compact=get_docs_compact_specs(),
+    )
     return get_docs_urls(
-        docs_data_view=make_docs_data_view(api_info, api_url_patterns),
-        docs_ui_view=make_docs_ui_view(api_info, api_url_patterns),
+        docs_data_view=make_docs_data_view(api_info, schema_provider=schema_provider),
+        docs_ui_view=make_docs_ui_view(api_info, schema_provider=schema_provider),
     )
 
 
+class LazyDocsViews:
+    """
+    The data and UI views for a set of API docs, built when either is first requested.
+
+    ``data_view`` and ``ui_view`` can be routed in place of the views themselves.
+    The first request to either builds both views, backed by one schema provider
+    configured from the settings at that time, so importing a URLconf that routes
+    them costs next to nothing. Management commands that look for docs views
+    (like ``build_api_docs``) find them through ``schema_provider``, which
+    builds the views too.
+    """
+
+    def __init__(self, api_info, api_url_patterns=None, spec_dir=None):
+        """
+        Prepare to build the views; takes the same arguments as ``make_docs_urls``.
+        """
+        self.api_info = api_info
+        self.api_url_patterns = api_url_patterns
+        self.spec_dir = spec_dir
+        self.data_view = _LazyDocsView(self, 'data')
+        self.ui_view = _LazyDocsView(self, 'ui')
+        self._views = None
+        self._lock = threading.Lock()
+
+    def get_views(self):
+        """
+        Return a dict of the 'data' and 'ui' views, building them if they haven't been yet.
+        """
+        views = self._views
+        if views is None:
+            with self._lock:
+                if self._views is None:
+                    schema_provider = make_schema_provider(
+                        self.api_info, self.api_url_patterns, spec_dir=self.spec_dir
+                    )
+                    self._views = {
+                        'data': make_docs_data_view(self.api_info, schema_provider=schema_provider),
+                        'ui': make_docs_ui_view(self.api_info, schema_provider=schema_provider),
+                    }
+                views = self._views
+        return views
+
+
+class _LazyDocsView:
+    """
+    Stand-in for one of the views of a ``LazyDocsViews``.
+    """
+
+    # Like the views it stands in for (which DRF exempts from CSRF checks).
+    csrf_exempt = True
+
+    def __init__(self, lazy_views, name):
+        """
+        Stand in for the view called ``name`` in ``lazy_views.get_views()``.
+        """
+        self.lazy_views = lazy_views
+        self.name = name
+
+    def __call__(self, request, *args, **kwargs):
+        """
+        Serve a request with the actual view.
+        """
+        return self.lazy_views.get_views()[self.name](request, *args, **kwargs)
+
+    @property
+    def schema_provider(self):
+        """
+        Return the schema provider behind the actual view.
+        """
+        return self.lazy_views.get_views()[self.name].cls.schema_provider
+
+
 def make_api_info(
         title="Open edX APIs",
         version="v1",
@@ -67,6 +205,12 @@ def get_docs_urls(docs_data_view, docs_ui_view):
     """
     Get some reasonable URL patterns to browsable API docs and API docs data.
 
+    The data view is routed at ``swagger.json`` and ``swagger.yaml``,
+    and at the same paths with a ``.gz`` or ``.br`` extension for compressed specs.
+    Shards of the spec, with only the operations that have one tag or are under
+    one path, are routed at ``swagger/tags/<tag>.json`` and
+    ``swagger/paths/<path prefix>.json`` (for example, ``swagger/paths/api/courses.json``),
+    and their ``.yaml`` counterparts.
     If these URL patterns don't work for your service,
     feel free to construct your own.
 
@@ -87,10 +231,20 @@ def get_docs_urls(docs_data_view, docs_ui_view):
     """
     return [
         re_path(
-            r'^swagger(?P<format>\.json|\.yaml)$',
+            r'^swagger(?P<format>\.json|\.yaml)(?P<encoding>\.gz|\.br)?$',
             docs_data_view,
             name='apidocs-data',
         ),
+        re_path(
+            r'^swagger/tags/(?P<tag>[^/]+)(?P<format>\.json|\.yaml)$',
+            docs_data_view,
+            name='apidocs-data-tag',
+        ),
+        re_path(
+            r'^swagger/paths/(?P<path_prefix>.+?)(?P<format>\.json|\.yaml)$',
+            docs_data_view,
+            name='apidocs-data-path-prefix',
+        ),
         path('api-docs/', docs_ui_view,
              name='apidocs-ui',
              ),
@@ -100,13 +254,38 @@ def get_docs_urls(docs_data_view, docs_ui_view):
     ]
 
 
-def make_docs_data_view(api_info, api_url_patterns=None):
+def make_docs_data_view(api_info, api_url_patterns=None, spec_dir=None, schema_provider=None):
     """
     Build View for API documentation data (either JSON or YAML).
 
+    If prebuilt spec files (as written by the ``build_api_docs`` management command)
+    exist in ``spec_dir``, they are served directly; otherwise, the spec is generated
+    on demand, and cached as configured by the OPENAPI_CACHE_TIMEOUT and
+    OPENAPI_CACHE_ALIAS settings.
+
+    The spec is served compressed if the request's Accept-Encoding header allows,
+    or if it was requested through a URL with a ``.gz`` or ``.br`` extension
+    (see ``get_docs_urls``).
+
+    Responses have ``ETag`` and ``Last-Modified`` headers, and a ``Cache-Control``
+    header whose max-age is the OPENAPI_HTTP_MAX_AGE setting. Conditional requests
+    for a prebuilt or cached spec that hasn't changed get a 304 response
+    without the spec being rendered or fetched.
+
+    If the OPENAPI_STREAMING_RESPONSES setting is True and caching is disabled,
+    generated specs are rendered incrementally into a streaming response.
+
+    If the OPENAPI_PROFILE_GENERATION setting is True, responses with a spec that
+    was generated for them have a ``Server-Timing`` header with the generation's
+    total time and its most expensive endpoints.
+
     Arguments:
         api_info (openapi.Info): Information about the API.
         api_url_patterns (list of url patterns): URL patterns that API docs will be generated for
+        spec_dir (str): Directory of prebuilt spec files to serve, if they exist.
+            Defaults to the OPENAPI_SPEC_DIR setting.
+        schema_provider (SchemaProvider): Optional provider of the spec to serve,
+            to share with other views; replaces the three arguments above.
 
     Returns: View
 
@@ -116,24 +295,20 @@ def make_docs_data_view(api_info, api_url_patterns=None):
         api_info = make_api_info(title="Awesome API", version="v42")
         my_data_view = make_docs_data_view(api_info)
     """
-    schema_generator = get_schema_generator(api_url_patterns)
-
-    return get_schema_view(
-        api_info,
-        generator_class=schema_generator,
-        public=True,
-        permission_classes=(permissions.AllowAny,),
-        patterns=api_url_patterns,
-    ).without_ui(cache_timeout=get_docs_cache_timeout())
+    if schema_provider is None:
+        schema_provider = make_schema_provider(api_info, api_url_patterns, spec_dir=spec_dir)
+    return make_schema_view_class(schema_provider).without_ui()
 
 
-def make_docs_ui_view(api_info, api_url_patterns=None):
+def make_docs_ui_view(api_info, api_url_patterns=None, schema_provider=None):
     """
     Build View for browsable API documentation.
 
     Arguments:
         api_info (openapi.Info): Information about the API.
         api_url_patterns (list of url patterns): URL patterns that API docs will be generated for
+        schema_provider (SchemaProvider): Optional provider of the spec that the UI
+            fetches, to share with other views; replaces the two arguments above.
 
     Returns: View
 
@@ -143,38 +318,209 @@ def make_docs_ui_view(api_info, api_url_patterns=None):
         api_info = make_api_info(title="Awesome API", version="v42")
         my_ui_view = make_docs_ui_view(api_info)
     """
-    schema_generator = get_schema_generator(api_url_patterns)
+    if schema_provider is None:
+        schema_provider = make_schema_provider(api_info, api_url_patterns)
+    return make_schema_view_class(schema_provider).with_ui('swagger')
 
-    return get_schema_view(
+
+def make_schema_provider(api_info, api_url_patterns=None, spec_dir=None):
+    """
+    Build the schema provider behind a set of API docs views, configured from settings.
+
+    Arguments:
+        api_info (openapi.Info): Information about the API.
+        api_url_patterns (list of url patterns): URL patterns that API docs will be generated for
+        spec_dir (str): Directory of prebuilt spec files to serve, if they exist.
+            Defaults to the OPENAPI_SPEC_DIR setting.
+
+    Returns: SchemaProvider
+    """
+    return SchemaProvider(
         api_info,
-        generator_class=schema_generator,
-        public=True,
-        permission_classes=(permissions.AllowAny,),
-        patterns=api_url_patterns,
-    ).with_ui('swagger', cache_timeout=get_docs_cache_timeout())
+        api_url_patterns,
+        generator_class=get_schema_generator(api_url_patterns),
+        spec_dir=spec_dir or get_docs_spec_dir(),
+        cache_alias=get_docs_cache_alias(),
+        cache_timeout=get_docs_cache_timeout(),
+        streaming=get_docs_streaming_responses(),
+        compact=get_docs_compact_specs(),
+        deployment_id=get_docs_deployment_id(),
+    )
 
 
-class ApiSchemaGenerator(OpenAPISchemaGenerator):
+def make_schema_view_class(schema_provider):
     """
-    A schema generator for ``/api/*``.
+    Build a drf_yasg schema view class whose spec comes from a schema provider.
 
-    Only includes endpoints in the ``/api/*`` url tree, and sets the path prefix
-    appropriately.
+    Arguments:
+        schema_provider (SchemaProvider): Source of the spec.
+
+    Returns: type
+        A subclass of the view class returned by drf_yasg's ``get_schema_view``.
     """
+    base_view_class = get_schema_view(
+        schema_provider.api_info,
+        generator_class=schema_provider.generator_class,
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+        patterns=schema_provider.api_url_patterns,
+    )
 
-    def get_endpoints(self, request):
+    class DocsSchemaView(base_view_class):
         """
-        Return dict of endpoints to be displayed.
-        """
-        endpoints = super().get_endpoints(request)
-        subpoints = {p: v for p, v in endpoints.items() if p.startswith("/api/")}
-        return subpoints
+        Schema view that gets the rendered spec from its schema provider.
 
-    def determine_path_prefix(self, paths):
-        """
-        Return common prefix for all paths.
+        Caching happens in the schema provider, so don't wrap instances
+        of this view in drf_yasg's page cache.
         """
-        return "/api/"
+
+        def get(
+                self, request, version="", format=None,  # pylint: disable=redefined-builtin
+                encoding=None, tag=None, path_prefix=None,
+        ):
+            """
+            Serve the spec in the requested format and encoding, or the docs UI page.
+
+            ``encoding`` is the extension of a compressed spec URL, like ".gz".
+            Without it, the encoding is negotiated from the Accept-Encoding header.
+
+            If ``tag`` or ``path_prefix`` is given, serve the shard of the spec
+            with only the operations that have that tag or are under that path.
+            """
+            renderer = request.accepted_renderer
+            spec_format = RENDERER_SPEC_FORMATS.get(renderer.format.lstrip('.'))
+            if spec_format is None:
+                return self.get_ui_page(request, version)
+            # Forget about any generation that wasn't for this request.
+            self.schema_provider.pop_generation_profile()
+            if encoding:
+                content_encoding = SPEC_FILE_ENCODINGS.get(encoding)
+                if content_encoding not in CONTENT_ENCODINGS:
+                    raise Http404(f"Specs can't be served with the {encoding} extension.")
+            else:
+                content_encoding = choose_content_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            content_type = f'{renderer.media_type}; charset={renderer.charset}'
+            if tag is not None or path_prefix is not None:
+                return self.get_shard(
+                    request, version, spec_format, content_encoding, encoding, content_type, tag, path_prefix,
+                )
+            metadata = self.schema_provider.get_spec_metadata(spec_format, request, version, content_encoding)
+            if metadata is not None:
+                not_modified_response = get_conditional_response(
+                    request, etag=f'"{metadata["etag"]}"', last_modified=metadata['last_modified'],
+                )
+                if not_modified_response is not None:
+                    return self.add_spec_headers(not_modified_response, metadata, content_encoding, encoding)
+            if content_encoding == IDENTITY:
+                chunks = self.schema_provider.get_spec_stream(spec_format, request, version)
+                if chunks is not None:
+                    response = StreamingHttpResponse(chunks, content_type=content_type)
+                    return self.add_spec_headers(response, None, content_encoding, encoding)
+            content = self.schema_provider.get_spec(spec_format, request, version, content_encoding)
+            if metadata is None:
+                metadata = (
+                    self.schema_provider.get_spec_metadata(spec_format, request, version, content_encoding) or
+                    self.schema_provider.get_content_metadata(content)
+                )
+                # The client may still hold this content, even though we had to generate it to know that.
+                response = get_conditional_response(
+                    request, etag=f'"{metadata["etag"]}"', last_modified=metadata['last_modified'],
+                )
+                if response is not None:
+                    return self.add_spec_headers(response, metadata, content_encoding, encoding)
+            response = HttpResponse(content, content_type=content_type)
+            return self.add_spec_headers(response, metadata, content_encoding, encoding)
+
+        def get_ui_page(self, request, version):
+            """
+            Serve the docs UI page, which fetches the spec itself (with ``?format=openapi``).
+
+            The page only shows the API's title and version, so it's rendered from
+            a spec with no paths, and never needs the spec to be generated.
+            """
+            stub_spec = openapi.Swagger(
+                info=self.schema_provider.api_info,
+                _version=request.version or version or '',
+                _prefix='/',
+                paths=openapi.Paths(paths={}),
+            )
+            return Response(stub_spec)
+
+        def get_shard(
+                self, request, version, spec_format, content_encoding, encoding, content_type, tag, path_prefix,
+        ):
+            """
+            Serve the shard of the spec for a tag or path prefix.
+            """
+            shard_kwargs = {'tag': tag, 'path_prefix': path_prefix}
+            metadata = self.schema_provider.get_spec_shard_metadata(
+                spec_format, request, version, content_encoding, **shard_kwargs,
+            )
+            if metadata is not None:
+                not_modified_response = get_conditional_response(
+                    request, etag=f'"{metadata["etag"]}"', last_modified=metadata['last_modified'],
+                )
+                if not_modified_response is not None:
+                    return self.add_spec_headers(not_modified_response, metadata, content_encoding, encoding)
+            content = self.schema_provider.get_spec_shard(
+                spec_format, request, version, content_encoding, **shard_kwargs,
+            )
+            if content is None:
+                raise Http404("No operations in the spec have that tag or path.")
+            if metadata is None:
+                metadata = (
+                    self.schema_provider.get_spec_shard_metadata(
+                        spec_format, request, version, content_encoding, **shard_kwargs,
+                    ) or
+                    self.schema_provider.get_content_metadata(content)
+                )
+                response = get_conditional_response(
+                    request, etag=f'"{metadata["etag"]}"', last_modified=metadata['last_modified'],
+                )
+                if response is not None:
+                    return self.add_spec_headers(response, metadata, content_encoding, encoding)
+            response = HttpResponse(content, content_type=content_type)
+            return self.add_spec_headers(response, metadata, content_encoding, encoding)
+
+        def add_spec_headers(self, response, metadata, content_encoding, encoding):
+            """
+            Add the content encoding, validator and caching headers of a spec to a response.
+
+            Streamed specs have no metadata, and so no validator headers.
+            """
+            if content_encoding != IDENTITY:
+                response['Content-Encoding'] = content_encoding
+            if not encoding:
+                patch_vary_headers(response, ('Accept-Encoding',))
+            if metadata is not None:
+                response['ETag'] = f'"{metadata["etag"]}"'
+                response['Last-Modified'] = http_date(metadata['last_modified'])
+            patch_cache_control(response, public=True, max_age=get_docs_http_max_age())
+            generation_profile = self.schema_provider.pop_generation_profile()
+            if generation_profile is not None:
+                response['Server-Timing'] = format_server_timing(*generation_profile)
+            return response
+
+    DocsSchemaView.schema_provider = schema_provider
+    return DocsSchemaView
+
+
+def format_server_timing(seconds, endpoint_profiles):
+    """
+    Format the profile of a spec generation as the value of a Server-Timing header.
+
+    Arguments:
+        seconds (float): Total time that the generation took.
+        endpoint_profiles (list[EndpointProfile]): Profiles of the generated endpoints.
+
+    Returns: str
+    """
+    metrics = [f'generate;dur={seconds * 1000:.1f}']
+    top_profiles = sorted(endpoint_profiles, key=lambda profile: profile.seconds, reverse=True)
+    for rank, profile in enumerate(top_profiles[:SERVER_TIMING_ENDPOINTS], start=1):
+        description = f'{profile.method} {profile.path}'.replace('\\', '\\\\').replace('"', '\\"')
+        metrics.append(f'endpoint-{rank};desc="{description}";dur={profile.seconds * 1000:.1f}')
+    return ', '.join(metrics)
 
 
 def get_schema_generator(patterns):
@@ -191,7 +537,7 @@ def get_schema_generator(patterns):
         Schema generator object.
     """
     if patterns:
-        return OpenAPISchemaGenerator
+        return DocsSchemaGenerator
     else:
         return ApiSchemaGenerator
 
@@ -199,8 +545,77 @@ def get_schema_generator(patterns):
 def get_docs_cache_timeout():
     """
     Return OPENAPI_CACHE_TIMEOUT setting, or zero if it's not defined.
+
+    This is how long generated specs are cached for. Zero disables caching,
+    and None caches specs for as long as the API they document doesn't change
+    (see ``SchemaProvider.get_fingerprint``).
     """
     try:
         return settings.OPENAPI_CACHE_TIMEOUT
     except AttributeError:
         return 0
+
+
+def get_docs_spec_dir():
+    """
+    Return OPENAPI_SPEC_DIR setting, or None if it's not defined.
+
+    This is the directory that prebuilt spec files are written to and served from.
+    """
+    return getattr(settings, 'OPENAPI_SPEC_DIR', None)
+
+
+def get_docs_cache_alias():
+    """
+    Return OPENAPI_CACHE_ALIAS setting, or 'default' if it's not defined.
+
+    This is the alias of the Django cache that generated specs are stored in.
+    Use a cache shared between processes (such as Redis or Memcached) so that
+    one process generates the spec and all others reuse it.
+    """
+    return getattr(settings, 'OPENAPI_CACHE_ALIAS', 'default')
+
+
+def get_docs_http_max_age():
+    """
+    Return OPENAPI_HTTP_MAX_AGE setting, or zero if it's not defined.
+
+    This is the max-age, in seconds, of the Cache-Control header on spec responses.
+    With the default of zero, browsers and CDNs revalidate the spec on every request,
+    which is cheap thanks to its ETag and Last-Modified headers.
+    """
+    return getattr(settings, 'OPENAPI_HTTP_MAX_AGE', 0)
+
+
+def get_docs_streaming_responses():
+    """
+    Return OPENAPI_STREAMING_RESPONSES setting, or False if it's not defined.
+
+    If True, specs that are generated for a single request (because caching is
+    disabled and there are no prebuilt spec files) are streamed to the client
+    as they are rendered, instead of being rendered in full first.
+    """
+    return getattr(settings, 'OPENAPI_STREAMING_RESPONSES', False)
+
+
+def get_docs_compact_specs():
+    """
+    Return OPENAPI_COMPACT_SPECS setting, or False if it's not defined.
+
+    If True, the parts of generated specs that stay in memory between requests
+    (reusable operations, and the indexes that spec shards are sliced from)
+    are kept as rendered JSON or pickled data instead of as trees of objects.
+    """
+    return getattr(settings, 'OPENAPI_COMPACT_SPECS', False)
+
+
+def get_docs_deployment_id():
+    """
+    Return OPENAPI_DEPLOYMENT_ID setting, or None if it's not defined.
+
+    This identifies the deployment (for example, by its commit hash), and is
+    part of the key that generated specs are cached under. Set it to make each
+    deployment generate its own specs, even if the fingerprint of the API that
+    they document is unchanged.
+    """
+    return getattr(settings, 'OPENAPI_DEPLOYMENT_ID', None)
@@ -1,11 +1,11 @@
 """
 Data definitions for API schemas.
 
-Mostly, we just use the definitions in drf_yasg.openapi
+Mostly, we just use the definitions in drf_yasg.openapi.
+Importing drf_yasg.openapi is slow, so it is only imported once a parameter
+is defined, and the constants below repeat the values of its constants.
 """
 
-from drf_yasg import openapi
-
 
 # Python 3 doesn't have a builtin `file` type,
 # so we need a constant instead.
@@ -16,13 +16,13 @@ FILE_PARAM = 'file'
 # The built-in types can be passed to the `parameter` function  in place of the
 # OpenAPI strings for convenience.
 _PARAM_TYPE_MAP = {
-    object: openapi.TYPE_OBJECT,
-    str: openapi.TYPE_STRING,
-    float: openapi.TYPE_NUMBER,
-    int: openapi.TYPE_INTEGER,
-    bool: openapi.TYPE_BOOLEAN,
-    list: openapi.TYPE_ARRAY,
-    FILE_PARAM: openapi.TYPE_FILE,
+    object: 'object',  # openapi.TYPE_OBJECT
+    str: 'string',  # openapi.TYPE_STRING
+    float: 'number',  # openapi.TYPE_NUMBER
+    int: 'integer',  # openapi.TYPE_INTEGER
+    bool: 'boolean',  # openapi.TYPE_BOOLEAN
+    list: 'array',  # openapi.TYPE_ARRAY
+    FILE_PARAM: 'file',  # openapi.TYPE_FILE
 }
 
 
@@ -68,6 +68,7 @@ def parameter(name, in_, param_type, description=None):
 
     Returns: openapi.Parameter
     """
+    from drf_yasg import openapi  # pylint: disable=import-outside-toplevel
     try:
         openapi_type = _PARAM_TYPE_MAP[param_type]
     except KeyError as error:
@@ -86,9 +87,9 @@ class ParameterLocation:
     """
     Location of API parameter in request.
     """
-    BODY = openapi.IN_BODY
-    PATH = openapi.IN_PATH
-    QUERY = openapi.IN_QUERY
-    FORM = openapi.IN_FORM
-    HEADER = openapi.IN_HEADER
+    BODY = 'body'  # openapi.IN_BODY
+    PATH = 'path'  # openapi.IN_PATH
+    QUERY = 'query'  # openapi.IN_QUERY
+    FORM = 'formData'  # openapi.IN_FORM
+    HEADER = 'header'  # openapi.IN_HEADER
     __ALL__ = {BODY, PATH, QUERY, FORM, HEADER}
@@ -0,0 +1,115 @@
+"""
+Documentation coverage: which API endpoints are documented, excluded or undocumented.
+
+The decorators in ``view_utils`` record the view methods that they document
+or exclude here (and in the registry of ``exclusions``). The coverage report
+joins those records with the endpoints in the URLconf, without generating any
+OpenAPI objects, so it takes milliseconds rather than the seconds that
+generating a spec can take.
+
+External users: import ``get_docs_coverage`` from __init__.
+"""
+import weakref
+
+from django.conf import settings
+
+
+# Handler functions documented with ``schema``, directly or through ``schema_for``.
+documented_functions = weakref.WeakSet()
+
+# Handler functions excluded with ``exclude_schema``.
+excluded_functions = weakref.WeakSet()
+
+DOCUMENTED = 'documented'
+EXCLUDED = 'excluded'
+UNDOCUMENTED = 'undocumented'
+
+
+class EndpointCoverage:
+    """
+    Whether one endpoint is documented.
+
+    Attributes:
+        path (str): The endpoint's path.
+        method (str): The endpoint's HTTP method.
+        view_class (type): The endpoint's view class.
+        handler_name (str): The name of the view method that handles the endpoint, like "get" or "list".
+        status (str): ``DOCUMENTED``, ``EXCLUDED`` or ``UNDOCUMENTED``.
+    """
+
+    def __init__(self, path, method, view_class, handler_name, status):
+        """
+        Describe the coverage of an endpoint.
+        """
+        self.path = path
+        self.method = method
+        self.view_class = view_class
+        self.handler_name = handler_name
+        self.status = status
+
+    def __repr__(self):
+        """
+        Summarize the coverage for debugging.
+        """
+        return f'<EndpointCoverage {self.method} {self.path}: {self.status}>'
+
+    @property
+    def view_name(self):
+        """
+        The dotted path of the endpoint's view method.
+        """
+        return f'{self.view_class.__module__}.{self.view_class.__qualname__}.{self.handler_name}'
+
+
+def get_docs_coverage(api_url_patterns=None, urlconf=None):
+    """
+    Report which endpoints are documented, excluded from the docs, or undocumented.
+
+    A view method is documented if it was decorated with ``schema`` or
+    ``schema_for`` (or carries drf_yasg's ``swagger_auto_schema`` metadata),
+    and excluded if it, its view or its path is excluded from the docs.
+
+    Arguments:
+        api_url_patterns (list): Optional URL patterns to report on, as for
+            ``make_docs_urls``. By default, the endpoints of the URLconf
+            under the OPENAPI_API_PATH_PREFIXES (``/api/``) are reported on.
+        urlconf (str): Optional URLconf module; defaults to ROOT_URLCONF.
+
+    Returns: list[EndpointCoverage]
+        Sorted by path, with the methods of each path in the order that the docs list them.
+    """
+    # Import here, so that importing the decorators doesn't import drf_yasg.
+    # pylint: disable=import-outside-toplevel
+    from .exclusions import get_exclusions
+    from .generators import PrefixEndpointEnumerator
+
+    path_prefixes = ()
+    if api_url_patterns is None:
+        path_prefixes = tuple(getattr(settings, 'OPENAPI_API_PATH_PREFIXES', ("/api/",)))
+    exclusions = get_exclusions()
+    enumerator = PrefixEndpointEnumerator(api_url_patterns, urlconf, path_prefixes=path_prefixes)
+    coverage = []
+    for path, method, callback in enumerator.get_api_endpoints():
+        if path_prefixes and not path.startswith(path_prefixes):
+            continue
+        view_class = callback.cls
+        actions = getattr(callback, 'actions', None) or {}
+        handler_name = actions.get(method.lower(), method.lower())
+        handler = getattr(view_class, handler_name, None)
+        handler_function = getattr(handler, '__func__', handler)
+        overrides = getattr(handler_function, '_swagger_auto_schema', None)
+        if (
+            exclusions.is_path_excluded(path)
+            or exclusions.is_method_excluded(view_class, handler_name)
+            or handler_function in excluded_functions
+            or (overrides or {}).get('auto_schema', True) is None
+        ):
+            status = EXCLUDED
+        elif handler_function in documented_functions or overrides:
+            status = DOCUMENTED
+        else:
+            status = UNDOCUMENTED
+        coverage.append(EndpointCoverage(path, method, view_class, handler_name, status))
+    # The enumerator orders endpoints by method first; sorting is stable, so that order is kept within paths.
+    coverage.sort(key=lambda endpoint: endpoint.path)
+    return coverage
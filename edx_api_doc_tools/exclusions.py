@@ -0,0 +1,196 @@
+"""
+The registry of views, view methods and paths excluded from the API docs.
+
+``exclude_schema_for`` and ``exclude_schema_for_all`` add view classes and
+their methods to it, and ``exclude_paths`` adds path prefixes. The
+OPENAPI_EXCLUDED_VIEWS and OPENAPI_EXCLUDED_PATH_PREFIXES settings add more.
+The schema generators check it while enumerating endpoints, so excluded
+endpoints are skipped before their views are even created.
+
+External users: import ``exclude_paths`` from __init__.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+class ExclusionRegistry:
+    """
+    A set of views, view methods and path prefixes excluded from the API docs.
+
+    Excluding methods of a view class also excludes them from its subclasses,
+    unless a subclass overrides them. Excluding a whole view class excludes
+    every method of it (and of its subclasses, except those they define).
+
+    A registry with a ``base`` registry also excludes everything that the base
+    excludes, including what's added to the base later.
+    """
+
+    def __init__(self, base=None):
+        """
+        Create an empty registry, optionally on top of a ``base`` registry.
+        """
+        self.base = base
+        # Map from view class to the names of its excluded methods, or None if all of them are excluded.
+        self.views = {}
+        self.path_prefixes = ()
+        # Incremented on every change to the excluded views.
+        self.version = 0
+        # Map from (view class, method name) to whether the method is excluded,
+        # valid for the versions of this registry and its base in `_memo_versions`.
+        self._method_memo = {}
+        self._memo_versions = None
+
+    def exclude_view(self, view_class, method_names=None):
+        """
+        Exclude the methods of a view class with the given names, or all of its methods if ``method_names`` is None.
+        """
+        if method_names is None:
+            self.views[view_class] = None
+        elif self.views.get(view_class, ()) is not None:
+            self.views[view_class] = self.views.get(view_class, frozenset()) | frozenset(method_names)
+        self.version += 1
+
+    def exclude_path_prefixes(self, *path_prefixes):
+        """
+        Exclude every path that starts with one of ``path_prefixes``, like "/api/internal/".
+        """
+        self.path_prefixes = tuple(sorted(set(self.path_prefixes) | set(path_prefixes)))
+
+    def get_versions(self):
+        """
+        Return the versions of this registry's excluded views and those of its bases.
+        """
+        return (self.version, self.base.get_versions() if self.base else None)
+
+    def get_path_prefixes(self):
+        """
+        Return the excluded path prefixes, including those of the base registry.
+        """
+        if self.base is None:
+            return self.path_prefixes
+        return tuple(sorted(set(self.path_prefixes) | set(self.base.get_path_prefixes())))
+
+    def excludes_views(self):
+        """
+        Return whether any view methods are excluded.
+        """
+        return bool(self.views) or (self.base is not None and self.base.excludes_views())
+
+    def get_excluded_methods(self, view_class):
+        """
+        Return the excluded names of a view class's own methods, None if all of them are, or an empty set.
+        """
+        if self.views.get(view_class, ()) is None:
+            return None
+        base_names = self.base.get_excluded_methods(view_class) if self.base else frozenset()
+        if base_names is None:
+            return None
+        return self.views.get(view_class, frozenset()) | base_names
+
+    def is_method_excluded(self, view_class, method_name):
+        """
+        Return whether a method (like "get" or "list") of a view class is excluded.
+
+        The answer is memoized, so checking each endpoint costs a dict lookup.
+        """
+        versions = self.get_versions()
+        if versions != self._memo_versions:
+            self._method_memo = {}
+            self._memo_versions = versions
+        key = (view_class, method_name)
+        if key not in self._method_memo:
+            excluded = False
+            for base in getattr(view_class, '__mro__', (view_class,)):
+                method_names = self.get_excluded_methods(base)
+                if method_names is None or method_name in method_names:
+                    excluded = True
+                    break
+                if method_name in vars(base):
+                    # Defined here, so exclusions of the method in further bases don't apply.
+                    break
+            self._method_memo[key] = excluded
+        return self._method_memo[key]
+
+    def is_path_excluded(self, path):
+        """
+        Return whether a path, or the literal part that starts a URL pattern's path, is excluded.
+        """
+        path_prefixes = self.get_path_prefixes()
+        return bool(path_prefixes) and path.startswith(path_prefixes)
+
+
+# The exclusions made by the decorators in ``view_utils`` and by ``exclude_paths``.
+registry = ExclusionRegistry()
+
+
+def exclude_paths(*path_prefixes):
+    """
+    Exclude every path that starts with one of ``path_prefixes`` from the API docs.
+
+    The URL patterns under those prefixes aren't even enumerated.
+
+    Example::
+
+        exclude_paths('/api/internal/', '/api/v0/')
+    """
+    registry.exclude_path_prefixes(*path_prefixes)
+
+
+def get_exclusions():
+    """
+    Return a registry of everything excluded from the API docs, including by the settings.
+
+    It's based on the registry of the decorators, so it also sees the exclusions
+    of views that are imported later on (like when the URLconf is loaded).
+    """
+    exclusions = ExclusionRegistry(base=registry)
+    for view_path in get_docs_excluded_views():
+        view_class, method_name = _import_view(view_path)
+        exclusions.exclude_view(view_class, None if method_name is None else [method_name])
+    exclusions.exclude_path_prefixes(*get_docs_excluded_path_prefixes())
+    return exclusions
+
+
+def get_docs_excluded_views():
+    """
+    Get the dotted paths of the view classes and view methods excluded from the API docs.
+
+    Read from the OPENAPI_EXCLUDED_VIEWS setting, like
+    ``['lms.djangoapps.example.views.ExampleView', 'lms.djangoapps.example.views.OtherView.post']``.
+    Defaults to none.
+    """
+    return getattr(settings, 'OPENAPI_EXCLUDED_VIEWS', ())
+
+
+def get_docs_excluded_path_prefixes():
+    """
+    Get the path prefixes excluded from the API docs.
+
+    Read from the OPENAPI_EXCLUDED_PATH_PREFIXES setting, like ``['/api/internal/']``.
+    Defaults to none.
+    """
+    return getattr(settings, 'OPENAPI_EXCLUDED_PATH_PREFIXES', ())
+
+
+def _import_view(view_path):
+    """
+    Import a view class, or the class of a view method, by its dotted path.
+
+    Returns: tuple[type, str or None]
+        The view class, and the method name, if any.
+    """
+    try:
+        return import_string(view_path), None
+    except ImportError:
+        pass
+    class_path, _, method_name = view_path.rpartition('.')
+    try:
+        view_class = import_string(class_path)
+    except ImportError as error:
+        raise ImproperlyConfigured(
+            f"OPENAPI_EXCLUDED_VIEWS: {view_path!r} is neither a view class nor a view method."
+        ) from error
+    if not hasattr(view_class, method_name):
+        raise ImproperlyConfigured(f"OPENAPI_EXCLUDED_VIEWS: {class_path!r} has no method {method_name!r}.")
+    return view_class, method_name
@@ -0,0 +1,350 @@
+"""
+Merging the specs of several services into one federated spec.
+
+Each Open edX service (LMS, Studio, the IDAs) documents its own API, usually in
+a spec file prebuilt by ``build_api_docs``. This module merges those files into
+a single spec, which the ``merge_api_docs`` management command writes to disk,
+and the views built by :func:`.make_federated_docs_urls` serve.
+"""
+import hashlib
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+import yaml
+from drf_yasg.codecs import YamlLoader
+
+from .schema_provider import SPEC_CODECS, SchemaProvider
+from .shards import _DEFINITION_REF_PREFIX, _iter_operations
+
+
+log = logging.getLogger(__name__)
+
+# Top-level fields of a spec that apply to each of its operations, unless the operation sets its own.
+_OPERATION_DEFAULT_KEYS = ('consumes', 'produces', 'security')
+
+
+class ServiceSpec:
+    """
+    The spec file of one service in a federated spec.
+
+    Attributes:
+        name (str): Name of the service, like "lms". Definitions and security
+            definitions of the service that conflict with those of earlier
+            services are renamed to "<name>.<original name>".
+        path (str): Path of the service's spec file, in JSON or YAML.
+        path_prefix (str): Prefix of the service's paths in the federated spec;
+            defaults to "/<name>".
+    """
+
+    def __init__(self, name, path, path_prefix=None):
+        """
+        Describe the spec file of a service.
+        """
+        self.name = name
+        self.path = path
+        self.path_prefix = f'/{name}' if path_prefix is None else path_prefix
+
+    def __repr__(self):
+        """
+        Return a string representation of the service's spec file.
+        """
+        return f'ServiceSpec({self.name!r}, {self.path!r}, path_prefix={self.path_prefix!r})'
+
+    def load(self):
+        """
+        Read and parse the spec file.
+
+        Returns: dict
+        """
+        with open(self.path, 'rb') as spec_file:
+            if self.path.endswith('.json'):
+                return json.load(spec_file)
+            return yaml.load(spec_file, Loader=YamlLoader)
+
+
+def merge_specs(info, specs):
+    """
+    Merge the specs of several services into one spec.
+
+    The merged spec has:
+
+    * each service's paths, prefixed with the service's ``path_prefix``
+      and its own basePath;
+    * each distinct definition once: definitions with the same name and the same
+      structure (including that of the definitions they refer to) are shared by
+      all services, and those that conflict with an earlier service's are renamed;
+    * each service's security definitions, renamed on conflicts like definitions;
+    * the tags of all services, with the first service's description of each tag; and
+    * the consumes, produces and security of the services as top-level fields
+      if all services agree on them, or else copied into each operation.
+
+    Arguments:
+        info (dict): The info of the merged spec, like ``{'title': ..., 'version': ...}``.
+        specs (list of (ServiceSpec, dict)): Each service, with its parsed spec.
+
+    Returns: dict
+        The merged spec, as plain data.
+
+    Raises:
+        ValueError: if two services have the same path once prefixed,
+            or a renamed definition conflicts with another of the same service.
+    """
+    # Security definitions are merged first, since their names decide whether
+    # the services' top-level security requirements agree.
+    security_definitions = {}
+    security_definition_hashes = {}
+    all_security_renames = []
+    all_defaults = []
+    for service, spec in specs:
+        security_renames, _ = _merge_named(
+            service, spec.get('securityDefinitions', {}), security_definitions, security_definition_hashes,
+            {name: _hash_data(value) for name, value in spec.get('securityDefinitions', {}).items()},
+        )
+        defaults = {key: spec[key] for key in _OPERATION_DEFAULT_KEYS if spec.get(key) is not None}
+        if 'security' in defaults:
+            defaults['security'] = _rename_security(defaults['security'], security_renames)
+        all_security_renames.append(security_renames)
+        all_defaults.append(defaults)
+    shared_defaults = {}
+    for key in _OPERATION_DEFAULT_KEYS:
+        values = [defaults.get(key) for defaults in all_defaults]
+        if all(value == values[0] for value in values):
+            shared_defaults[key] = values[0]
+
+    paths = {}
+    path_services = {}
+    definitions = {}
+    definition_hashes = {}
+    tags = {}
+    for (service, spec), security_renames, defaults in zip(specs, all_security_renames, all_defaults):
+        definition_renames, added_definitions = _merge_named(
+            service, spec.get('definitions', {}), definitions, definition_hashes, _hash_definitions(spec),
+        )
+        for name in added_definitions:
+            definitions[name] = _rename_refs(definitions[name], definition_renames)
+        operation_defaults = {key: value for key, value in defaults.items() if key not in shared_defaults}
+        prefix = service.path_prefix.rstrip('/') + spec.get('basePath', '/').rstrip('/')
+        for path, path_item in spec.get('paths', {}).items():
+            merged_path = prefix + path
+            if merged_path in paths:
+                raise ValueError(
+                    f"Both the '{path_services[merged_path]}' and '{service.name}' services have the path "
+                    f"{merged_path}; give them different path prefixes."
+                )
+            paths[merged_path] = _merge_path_item(path_item, definition_renames, security_renames, operation_defaults)
+            path_services[merged_path] = service.name
+        for tag in spec.get('tags', []):
+            tags.setdefault(tag['name'], tag)
+
+    merged = {'swagger': '2.0', 'info': info, 'basePath': '/'}
+    for key in ('consumes', 'produces'):
+        if shared_defaults.get(key) is not None:
+            merged[key] = shared_defaults[key]
+    if security_definitions:
+        merged['securityDefinitions'] = security_definitions
+    if shared_defaults.get('security') is not None:
+        merged['security'] = shared_defaults['security']
+    merged['paths'] = paths
+    merged['definitions'] = definitions
+    if tags:
+        merged['tags'] = list(tags.values())
+    return merged
+
+
+def _merge_named(service, items, merged_items, merged_hashes, hashes):
+    """
+    Add a service's definitions (or security definitions) to the merged ones.
+
+    Items with the same hash as the merged item of the same name are shared,
+    and other items whose name is taken are renamed.
+
+    Arguments:
+        service (ServiceSpec): The service.
+        items (dict): The service's items, by name.
+        merged_items (dict): The merged items, by name, to add to.
+        merged_hashes (dict): The hashes of the merged items, by name, to add to.
+        hashes (dict): The hashes of the service's items, by name.
+
+    Returns: tuple[dict, list]
+        Map from the original name to the merged name of each renamed item,
+        and the merged names of the items that were added.
+    """
+    renames = {}
+    added = []
+    for name, item in items.items():
+        merged_name = name
+        if merged_name in merged_items and merged_hashes[merged_name] != hashes[name]:
+            merged_name = f'{service.name}.{name}'
+            if merged_name in merged_items and merged_hashes[merged_name] != hashes[name]:
+                raise ValueError(f"The '{service.name}' service has conflicting definitions of {merged_name}.")
+            renames[name] = merged_name
+            log.info("Renamed %s of the '%s' service to %s.", name, service.name, merged_name)
+        if merged_name not in merged_items:
+            merged_items[merged_name] = item
+            merged_hashes[merged_name] = hashes[name]
+            added.append(merged_name)
+    return renames, added
+
+
+def _merge_path_item(path_item, definition_renames, security_renames, operation_defaults):
+    """
+    Rename the refs and security requirements of a path item, and add the service's defaults to its operations.
+    """
+    path_item = _rename_refs(path_item, definition_renames)
+    if not (security_renames or operation_defaults):
+        return path_item
+    merged_path_item = dict(path_item)
+    for method, operation in _iter_operations(path_item):
+        operation = {**operation_defaults, **operation}
+        if 'security' in operation and security_renames:
+            operation['security'] = _rename_security(operation['security'], security_renames)
+        merged_path_item[method] = operation
+    return merged_path_item
+
+
+def _rename_refs(value, renames):
+    """
+    Return part of a spec with its refs to renamed definitions updated (or as it is, if nothing was renamed).
+    """
+    if not renames:
+        return value
+    if isinstance(value, dict):
+        ref = value.get('$ref')
+        if isinstance(ref, str) and ref[len(_DEFINITION_REF_PREFIX):] in renames:
+            value = {**value, '$ref': _DEFINITION_REF_PREFIX + renames[ref[len(_DEFINITION_REF_PREFIX):]]}
+        return {key: _rename_refs(item, renames) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rename_refs(item, renames) for item in value]
+    return value
+
+
+def _rename_security(requirements, renames):
+    """
+    Return a list of security requirements with renamed security definitions updated.
+    """
+    return [
+        {renames.get(name, name): scopes for name, scopes in requirement.items()}
+        for requirement in requirements
+    ]
+
+
+def _hash_definitions(spec):
+    """
+    Return the structural hash of each definition of a spec.
+
+    The hash of a definition covers its content, with each of its refs
+    replaced by the hash of the definition that it refers to, so that two
+    definitions have the same hash if and only if they (and everything they
+    refer to) would render the same, whatever the referred definitions are called.
+    Refs that form a cycle are hashed by name.
+
+    Returns: dict
+        Map from definition name to hash.
+    """
+    definitions = spec.get('definitions', {})
+    hashes = {}
+    in_progress = set()
+
+    def resolve_refs(value):
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, str) and ref.startswith(_DEFINITION_REF_PREFIX):
+                name = ref[len(_DEFINITION_REF_PREFIX):]
+                return {**value, '$ref': name if name in in_progress else hash_definition(name)}
+            return {key: resolve_refs(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [resolve_refs(item) for item in value]
+        return value
+
+    def hash_definition(name):
+        if name not in hashes:
+            in_progress.add(name)
+            hashes[name] = _hash_data(resolve_refs(definitions.get(name)))
+            in_progress.discard(name)
+        return hashes[name]
+
+    for name in definitions:
+        hash_definition(name)
+    return hashes
+
+
+def _hash_data(data):
+    """
+    Return a hash of JSON-serializable data, independent of the order of its keys.
+    """
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class FederatedSchemaProvider(SchemaProvider):
+    """
+    Provides a spec merged from the spec files of several services.
+
+    If ``spec_dir`` contains a merged spec file (as written by ``merge_api_docs``
+    or ``build_api_docs``), it is served as-is. Otherwise, the services' spec files
+    are merged when the spec is first needed, and the result is treated like
+    a prebuilt spec file: kept in memory, and never generated or cached.
+    """
+
+    def __init__(self, api_info, service_specs, spec_dir=None, **kwargs):
+        """
+        Create a federated schema provider.
+
+        Arguments:
+            api_info (openapi.Info): Information about the federated API.
+            service_specs (list of ServiceSpec): The spec files of the services to merge, in order of precedence.
+            spec_dir (str): Optional directory containing the prebuilt merged spec files.
+            kwargs: Other arguments of ``SchemaProvider``.
+        """
+        super().__init__(api_info, generator_class=None, spec_dir=spec_dir, **kwargs)
+        self.service_specs = service_specs
+
+    def merge(self, url=None):
+        """
+        Merge the spec files of the services.
+
+        Arguments:
+            url (str): Optional absolute URL used to set the merged spec's host and scheme.
+
+        Returns: dict
+        """
+        start = time.perf_counter()
+        info = {
+            **self.api_info.as_dict(),
+            'version': self.api_info._default_version,  # pylint: disable=protected-access
+        }
+        merged = merge_specs(info, [(service, service.load()) for service in self.service_specs])
+        if url:
+            parts = urlsplit(url)
+            merged['host'] = parts.netloc
+            merged['schemes'] = [parts.scheme]
+        log.info(
+            "Merged the specs of %d services into %d paths in %.1fms.",
+            len(self.service_specs), len(merged['paths']), (time.perf_counter() - start) * 1000,
+        )
+        return merged
+
+    def read_spec_file(self, spec_format):
+        """
+        Read the merged spec file for a format or, if there is no JSON spec file, merge the services' spec files.
+        """
+        spec_file = super().read_spec_file(spec_format)
+        if spec_file is None and spec_format == 'json':
+            spec_file = (self.render_data(self.merge(), 'json'), time.time())
+        return spec_file
+
+    def write_spec_files(self, spec_dir=None, url=None, spec_formats=tuple(SPEC_CODECS)):
+        """
+        Merge the services' spec files once and write the merged spec to disk in every format.
+
+        Arguments: as for ``SchemaProvider.write_spec_files``, plus:
+            spec_formats (tuple of str): The formats to write. Rendering YAML takes
+                far longer than merging; if only the JSON spec is written, the YAML
+                spec is rendered from it when it's first served.
+        """
+        merged = self.merge(url)
+        return self.write_rendered_specs(
+            {spec_format: self.render_data(merged, spec_format) for spec_format in spec_formats},
+            spec_dir,
+        )
@@ -0,0 +1,672 @@
+"""
+Schema generators used by the API docs views.
+
+External users: import these from __init__.
+"""
+import functools
+import hashlib
+import logging
+import pickle
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_script_prefix, get_urlconf, set_script_prefix, set_urlconf
+from django.utils import translation
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.errors import SwaggerGenerationError
+from drf_yasg.generators import EndpointEnumerator, OpenAPISchemaGenerator
+from rest_framework.schemas.generators import EndpointEnumerator as RestFrameworkEndpointEnumerator
+from rest_framework.serializers import BaseSerializer
+
+from .exclusions import get_exclusions
+from .view_utils import _stub_schema_hooks
+
+
+log = logging.getLogger(__name__)
+
+# How many reusable operations each generator class keeps in memory. Operations
+# are kept per language and per host, among other things, so this leaves room
+# for a few copies of a large API; when it's full, the cache is cleared.
+OPERATION_CACHE_SIZE = 16384
+
+# Matches the part of a simplified URL path before its first parameter
+# or any leftover regex syntax.
+_LITERAL_PATH_PREFIX_RE = re.compile(r'[^{}<>()\[\]*+?|\\$^]*')
+
+# Sentinel for cached operations that were excluded from the schema.
+_EXCLUDED = object()
+
+# Methods of drf_yasg's view inspectors that inspect serializers. Their results are
+# memoized, and their time counts as serializer inspection when profiling.
+_SERIALIZER_INSPECTION_METHODS = ('serializer_to_schema', 'serializer_to_parameters')
+
+# Logger that drf_yasg reports exceptions raised by views during schema generation to.
+_VIEW_EXCEPTION_LOGGER = logging.getLogger('drf_yasg.inspectors.base')
+
+# Holds the generator, and the EndpointProfile (if any), of the operation being generated on each thread.
+_generation = threading.local()
+
+# Serializer arguments that don't affect a serializer's schema.
+_SERIALIZER_RUNTIME_KWARGS = ('instance', 'data', 'context')
+
+# Attributes of a view that, besides its handler and schema overrides,
+# decide what its operations look like.
+_OPERATION_VIEW_ATTRIBUTES = (
+    'serializer_class',
+    'pagination_class',
+    'filter_backends',
+    'parser_classes',
+    'renderer_classes',
+    'lookup_field',
+    'swagger_schema',
+)
+
+
+class DocsSchemaGenerator(OpenAPISchemaGenerator):
+    """
+    The schema generator behind the API docs views built by this package.
+
+    Generating an operation means inspecting its view, serializers and schema
+    metadata, which is the bulk of the cost of generating a schema. So,
+    each operation is cached in memory along with the definitions it refers
+    to, and reused by later generations in the same process as long as its
+    view, handler and schema metadata haven't changed.
+    Set OPENAPI_REUSE_OPERATIONS to False to turn this off.
+
+    Generated operations hold their translated strings as plain text, so
+    operations are cached per language.
+
+    If the OPENAPI_COMPACT_SPECS setting is True, cached operations are kept
+    as pickled plain data rather than as trees of drf_yasg objects, which takes
+    a fraction of the memory, and are unpickled when they are reused.
+
+    After generating a schema, ``operations_reused`` and ``operations_rebuilt``
+    tell how many operations were taken from the cache and how many were
+    generated from scratch.
+
+    If the OPENAPI_GENERATION_WORKERS setting is more than 1, the operations
+    of different paths are generated concurrently by that many threads.
+    Their results are merged in path order, so the schema is the same as
+    one generated sequentially. This only pays off if the views block on I/O
+    while they're inspected; otherwise, the threads contend for the GIL.
+
+    Within a generation, serializers of the same class, built with the same
+    arguments, are only inspected once: later occurrences get the same schema
+    (usually a ref to its definition) or parameters. ``serializer_memo_hits``
+    and ``serializer_memo_misses`` tell how many inspections were reused and made.
+    This assumes that a serializer's fields don't depend on the view or request
+    it is used for; set OPENAPI_MEMOIZE_SERIALIZERS to False if yours do.
+
+    If ``profile`` is True (as it is by default if the OPENAPI_PROFILE_GENERATION
+    setting is True), generating a schema also fills in ``endpoint_profiles``,
+    a list of :class:`EndpointProfile` objects, one per operation.
+
+    Endpoints excluded by the registry in ``exclusions`` (or the settings it
+    reads) are skipped while enumerating them, before their views are created.
+    The hooks of the views created to be inspected are replaced by the stubs
+    declared with ``schema_stubs``, if any.
+    """
+
+    # Map from operation keys (see `get_operation_key`) to (operation, definitions)
+    # tuples, shared by all instances of each class, of up to OPERATION_CACHE_SIZE entries.
+    _operation_cache = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create a schema generator; takes the same arguments as OpenAPISchemaGenerator.
+        """
+        super().__init__(*args, **kwargs)
+        self.reuse_operations = getattr(settings, 'OPENAPI_REUSE_OPERATIONS', True)
+        self.generation_workers = getattr(settings, 'OPENAPI_GENERATION_WORKERS', 0)
+        self.profile = getattr(settings, 'OPENAPI_PROFILE_GENERATION', False)
+        self.compact_operations = getattr(settings, 'OPENAPI_COMPACT_SPECS', False)
+        self.memoize_serializers = getattr(settings, 'OPENAPI_MEMOIZE_SERIALIZERS', True)
+        self.exclusions = get_exclusions()
+        self.endpoint_enumerator_class = functools.partial(PrefixEndpointEnumerator, exclusions=self.exclusions)
+        self.endpoint_profiles = []
+        self.operations_reused = 0
+        self.operations_rebuilt = 0
+        self.serializer_memo_hits = 0
+        self.serializer_memo_misses = 0
+        self._serializer_memo = {}
+        self._counter_lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Give each subclass its own operation cache.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._operation_cache = {}
+
+    def get_schema(self, request=None, public=False):
+        """
+        Generate the schema, and log how many operations were reused.
+        """
+        self._serializer_memo = {}
+        if self.profile:
+            exception_counter = _ViewExceptionCounter()
+            _VIEW_EXCEPTION_LOGGER.addHandler(exception_counter)
+            try:
+                schema = super().get_schema(request, public)
+            finally:
+                _VIEW_EXCEPTION_LOGGER.removeHandler(exception_counter)
+        else:
+            schema = super().get_schema(request, public)
+        if self.reuse_operations:
+            log.debug(
+                "Generated API schema: reused %d operations and rebuilt %d.",
+                self.operations_reused,
+                self.operations_rebuilt,
+            )
+        return schema
+
+    def create_view(self, callback, method, request=None):
+        """
+        Create a view to inspect, with its hooks stubbed out as declared with ``schema_stubs``.
+        """
+        return _stub_schema_hooks(super().create_view(callback, method, request))
+
+    def get_endpoints(self, request):
+        """
+        Return the endpoints to document, without those under excluded path prefixes.
+
+        The endpoint enumerator only skips patterns whose literal path is
+        excluded, so this also catches prefixes with path parameters in them.
+        """
+        endpoints = super().get_endpoints(request)
+        if not self.exclusions.get_path_prefixes():
+            return endpoints
+        return type(endpoints)(
+            (path, endpoint) for path, endpoint in endpoints.items() if not self.exclusions.is_path_excluded(path)
+        )
+
+    def get_paths(self, endpoints, components, request, public):
+        """
+        Generate the Swagger Paths for the API, using a pool of threads if configured to.
+
+        Each path gets its own set of definitions while its operations are
+        generated. Those are then merged into ``components`` in path order,
+        which is the order that sequential generation would have added them in.
+        """
+        if self.generation_workers <= 1 or len(endpoints) <= 1:
+            return super().get_paths(endpoints, components, request, public)
+
+        prefix = self.determine_path_prefix(list(endpoints.keys())) or ""
+        assert "{" not in prefix, "base path cannot be templated in swagger 2.0"
+
+        # Worker threads don't inherit these thread-local settings, which end up in the schema.
+        language = translation.get_language()
+        script_prefix = get_script_prefix()
+        urlconf = get_urlconf()
+
+        def get_path_operations(endpoint):
+            path, (_view_cls, methods) = endpoint
+            path_components = self.reference_resolver_class(openapi.SCHEMA_DEFINITIONS, force_init=True)
+            set_script_prefix(script_prefix)
+            set_urlconf(urlconf)
+            operations = {}
+            try:
+                with translation.override(language):
+                    for method, view in methods:
+                        if not self.should_include_endpoint(path, method, view, public):
+                            continue
+                        operation = self.get_operation(view, path, prefix, method, path_components, request)
+                        if operation is not None:
+                            operations[method.lower()] = operation
+            finally:
+                # Close any database connections that the views opened in this thread, or nothing would.
+                connections.close_all()
+            return operations, path_components
+
+        sorted_endpoints = sorted(endpoints.items())
+        with ThreadPoolExecutor(max_workers=self.generation_workers) as executor:
+            results = list(executor.map(get_path_operations, sorted_endpoints))
+
+        definitions = components.with_scope(openapi.SCHEMA_DEFINITIONS)
+        paths = {}
+        for (path, (view_cls, _methods)), (operations, path_components) in zip(sorted_endpoints, results):
+            path_definitions = path_components.with_scope(openapi.SCHEMA_DEFINITIONS)
+            for name in path_definitions.keys():
+                _merge_definition(definitions, name, path_definitions.getdefault(name))
+            if operations:
+                # Same as drf_yasg: strip the common prefix, which is used as the basePath.
+                path_suffix = path[len(prefix):]
+                if not path_suffix.startswith("/"):
+                    path_suffix = "/" + path_suffix
+                paths[path_suffix] = self.get_path_item(path, view_cls, operations)
+
+        return self.get_paths_object(paths), prefix
+
+    def get_operation(self, view, path, prefix, method, components, request):
+        """
+        Get the operation for an endpoint, profiling it if we're profiling.
+        """
+        profile = EndpointProfile(path, method) if self.profile else None
+        _generation.generator = self
+        _generation.profile = profile
+        start = time.perf_counter()
+        try:
+            return self.get_or_reuse_operation(view, path, prefix, method, components, request)
+        except Exception:
+            if profile is not None:
+                profile.exceptions += 1
+            raise
+        finally:
+            _generation.generator = None
+            _generation.profile = None
+            if profile is not None:
+                profile.seconds = time.perf_counter() - start
+                with self._counter_lock:
+                    self.endpoint_profiles.append(profile)
+
+    def get_overrides(self, view, method):
+        """
+        Get the schema overrides for an operation.
+
+        When memoizing serializers or profiling, these make drf_yasg use a view
+        inspector that passes serializer inspections through ``inspect_serializer``.
+        """
+        overrides = super().get_overrides(view, method)
+        if self.memoize_serializers or self.profile:
+            view_inspector_class = getattr(view, 'swagger_schema', swagger_settings.DEFAULT_AUTO_SCHEMA_CLASS)
+            view_inspector_class = overrides.get('auto_schema', view_inspector_class)
+            if view_inspector_class is not None:
+                overrides['auto_schema'] = _get_generation_inspector_class(view_inspector_class)
+        return overrides
+
+    def inspect_serializer(self, inspect, view_inspector, serializer, *args, **kwargs):
+        """
+        Inspect a serializer with a view inspector's method, reusing the result of an identical inspection.
+
+        An inspection is identical if it was made earlier in this generation, with
+        the same method of the same kind of view inspector, with the same field
+        inspectors and definitions, of a serializer of the same class that was
+        built with the same arguments.
+
+        Arguments:
+            inspect (function): The view inspector method, like ``SwaggerAutoSchema.serializer_to_schema``.
+            view_inspector (SwaggerAutoSchema): The view inspector to call it on.
+            serializer (Serializer): The serializer to inspect.
+            args, kwargs: Any other arguments of the method.
+        """
+        if not self.memoize_serializers or not isinstance(serializer, BaseSerializer):
+            return inspect(view_inspector, serializer, *args, **kwargs)
+        key = (
+            inspect,
+            type(view_inspector),
+            tuple(view_inspector.field_inspectors),
+            view_inspector.components,
+            _get_serializer_key(serializer),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        try:
+            result = self._serializer_memo.get(key)
+        except TypeError:
+            # Some argument can't be hashed, so this inspection can't be memoized.
+            return inspect(view_inspector, serializer, *args, **kwargs)
+        profile = getattr(_generation, 'profile', None)
+        if result is not None:
+            with self._counter_lock:
+                self.serializer_memo_hits += 1
+            if profile is not None:
+                profile.serializer_memo_hits += 1
+            # Callers may add to the list of parameters that they get back.
+            return list(result) if isinstance(result, list) else result
+        result = inspect(view_inspector, serializer, *args, **kwargs)
+        self._serializer_memo[key] = result
+        with self._counter_lock:
+            self.serializer_memo_misses += 1
+        if profile is not None:
+            profile.serializer_memo_misses += 1
+        return list(result) if isinstance(result, list) else result
+
+    def get_or_reuse_operation(self, view, path, prefix, method, components, request):
+        """
+        Get the operation for an endpoint, reusing a cached one if its inputs haven't changed.
+        """
+        if not self.reuse_operations:
+            return super().get_operation(view, path, prefix, method, components, request)
+        definitions = components.with_scope(openapi.SCHEMA_DEFINITIONS)
+        key = self.get_operation_key(view, path, prefix, method, request)
+        cached = self._operation_cache.get(key)
+        if cached is not None:
+            operation, operation_definitions = cached
+            for name, definition in operation_definitions:
+                definitions.setdefault(name, lambda definition=definition: definition)
+            with self._counter_lock:
+                self.operations_reused += 1
+            if self.profile:
+                _generation.profile.reused = True
+            if operation is _EXCLUDED:
+                return None
+            return pickle.loads(operation) if self.compact_operations else operation
+
+        known_names = set(definitions.keys())
+        operation = super().get_operation(view, path, prefix, method, components, request)
+        # Remember every definition that the operation needs, starting with the ones
+        # it added (in the order it added them) so that reusing it adds them in the same order.
+        needed_names = [name for name in definitions.keys() if name not in known_names]
+        needed_names += [
+            name for name in _find_definition_refs(operation, definitions)
+            if name not in needed_names
+        ]
+        operation_definitions = tuple(
+            (name, definitions.getdefault(name)) for name in needed_names if definitions.has(name)
+        )
+        if operation is None:
+            cached_operation = _EXCLUDED
+        elif self.compact_operations:
+            cached_operation = pickle.dumps(operation.as_dict(), pickle.HIGHEST_PROTOCOL)
+        else:
+            cached_operation = operation
+        if len(self._operation_cache) >= OPERATION_CACHE_SIZE:
+            self._operation_cache.clear()
+        self._operation_cache[key] = (cached_operation, operation_definitions)
+        with self._counter_lock:
+            self.operations_rebuilt += 1
+        return operation
+
+    def get_operation_key(self, view, path, prefix, method, request):
+        """
+        Get a hashable key of everything that the operation for an endpoint depends on.
+
+        That is: the endpoint's path, method, view class and handler function,
+        the view's serializer and other schema-relevant attributes,
+        the schema metadata attached by the decorators in ``view_utils``,
+        and the active language, since translations are rendered when the
+        operation is generated. For compact operations, the serializer,
+        attributes and metadata are reduced to a digest.
+        """
+        action = getattr(view, 'action', None) or method.lower()
+        handler = getattr(view, action, None)
+        handler_function = getattr(handler, '__func__', handler)
+        overrides = getattr(handler_function, '_swagger_auto_schema', None)
+        view_attributes = tuple(
+            repr(getattr(view, attribute, None)) for attribute in _OPERATION_VIEW_ATTRIBUTES
+        )
+        schema_inputs = (repr(overrides), view_attributes)
+        if self.compact_operations:
+            # These reprs can take more memory than a compact operation does.
+            schema_inputs = hashlib.sha256(repr(schema_inputs).encode('utf-8')).digest()
+        return (
+            path,
+            prefix,
+            method,
+            getattr(request, 'version', None),
+            type(view),
+            action,
+            handler_function,
+            schema_inputs,
+            translation.get_language(),
+        )
+
+
+class EndpointProfile:
+    """
+    What it took to generate the operation for one endpoint.
+
+    Attributes:
+        path (str): The endpoint's path.
+        method (str): The endpoint's HTTP method.
+        seconds (float): Wall time spent generating the operation.
+        serializer_seconds (float): The part of ``seconds`` spent inspecting serializers.
+        exceptions (int): Number of exceptions raised by the view (and caught by drf_yasg)
+            or by the generation itself.
+        reused (bool): Whether the operation was reused from an earlier generation.
+        serializer_memo_hits (int): Number of serializer inspections reused from earlier in the generation.
+        serializer_memo_misses (int): Number of serializer inspections made and memoized.
+    """
+
+    def __init__(self, path, method):
+        """
+        Create an empty profile of an endpoint.
+        """
+        self.path = path
+        self.method = method
+        self.seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.exceptions = 0
+        self.reused = False
+        self.serializer_memo_hits = 0
+        self.serializer_memo_misses = 0
+
+    def __repr__(self):
+        """
+        Summarize the profile for debugging.
+        """
+        return f'<EndpointProfile {self.method} {self.path}: {self.seconds * 1000:.1f}ms>'
+
+
+class _ViewExceptionCounter(logging.Handler):
+    """
+    Logging handler that counts the view exceptions that drf_yasg logs against the endpoint being profiled.
+    """
+
+    def emit(self, record):
+        profile = getattr(_generation, 'profile', None)
+        if profile is not None and record.exc_info:
+            profile.exceptions += 1
+
+
+@functools.lru_cache(maxsize=None)
+def _get_generation_inspector_class(view_inspector_class):
+    """
+    Return a subclass of a drf_yasg view inspector class whose serializer inspection is memoized and timed.
+
+    Serializer inspections are passed through the ``inspect_serializer`` method
+    of the generator of the operation being generated, and their time counts
+    towards its EndpointProfile, if it has one.
+    """
+    def make_inspection_method(method_name):
+        method = getattr(view_inspector_class, method_name)
+
+        @functools.wraps(method)
+        def inspection_method(self, serializer, *args, **kwargs):
+            generator = getattr(_generation, 'generator', None)
+            profile = getattr(_generation, 'profile', None)
+            start = time.perf_counter()
+            try:
+                if generator is None:
+                    return method(self, serializer, *args, **kwargs)
+                return generator.inspect_serializer(method, self, serializer, *args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile.serializer_seconds += time.perf_counter() - start
+
+        return inspection_method
+
+    return type(
+        view_inspector_class.__name__,
+        (view_inspector_class,),
+        {method_name: make_inspection_method(method_name) for method_name in _SERIALIZER_INSPECTION_METHODS},
+    )
+
+
+def _get_serializer_key(serializer):
+    """
+    Return a hashable key of a serializer's class and the arguments it was built with, except its data and context.
+    """
+    kwargs = tuple(sorted(
+        (name, _get_serializer_key(value) if isinstance(value, BaseSerializer) else repr(value))
+        for name, value in getattr(serializer, '_kwargs', {}).items()
+        if name not in _SERIALIZER_RUNTIME_KWARGS
+    ))
+    return (type(serializer), kwargs)
+
+
+class PrefixEndpointEnumerator(EndpointEnumerator):
+    """
+    Endpoint enumerator that skips URL patterns which can't be under any of a set of path prefixes.
+
+    Whole ``include()`` subtrees outside of those prefixes are skipped without
+    being descended into. Patterns whose path can't be worked out up front
+    (for example, because of a regex) are enumerated as usual, so callers
+    should still filter the endpoints they get back.
+
+    Excluded paths (and subtrees) and view methods are skipped too.
+    """
+
+    def __init__(self, patterns=None, urlconf=None, request=None, path_prefixes=(), exclusions=None):
+        """
+        Create an enumerator; ``path_prefixes`` is a sequence of paths like "/api/".
+
+        If ``path_prefixes`` is empty, every pattern is enumerated.
+        ``exclusions`` is an optional ``ExclusionRegistry`` of endpoints to skip.
+        """
+        super().__init__(patterns, urlconf, request)
+        self.path_prefixes = tuple(path_prefixes)
+        self.exclusions = exclusions
+
+    def get_api_endpoints(self, patterns=None, prefix='', app_name=None, namespace=None, ignored_endpoints=None):
+        """
+        Return the endpoints in ``patterns`` (by default, the whole URLconf) that may be under our prefixes.
+
+        drf_yasg calls this again for each nested ``include()``, so the
+        filtering here applies at every level of the URLconf.
+        """
+        if patterns is None:
+            patterns = self.patterns
+        if self.path_prefixes:
+            patterns = [
+                pattern for pattern in patterns
+                if self.may_be_under_prefixes(prefix + str(pattern.pattern))
+            ]
+        if self.exclusions is not None and self.exclusions.get_path_prefixes():
+            patterns = [
+                pattern for pattern in patterns
+                if not self.exclusions.is_path_excluded(self.get_literal_path_prefix(prefix + str(pattern.pattern)))
+            ]
+        return super().get_api_endpoints(
+            patterns=patterns,
+            prefix=prefix,
+            app_name=app_name,
+            namespace=namespace,
+            ignored_endpoints=ignored_endpoints,
+        )
+
+    def may_be_under_prefixes(self, path_regex):
+        """
+        Return whether a URL pattern, or anything included under it, might have a path under our prefixes.
+        """
+        literal_prefix = self.get_literal_path_prefix(path_regex)
+        return any(
+            literal_prefix.startswith(path_prefix) or path_prefix.startswith(literal_prefix)
+            for path_prefix in self.path_prefixes
+        )
+
+    def get_literal_path_prefix(self, path_regex):
+        """
+        Return the part of a URL pattern's path that every path under it starts with.
+        """
+        # Use DRF's implementation, because drf_yasg's logs a warning for
+        # regexes of included URLconfs, which don't end in '$'.
+        path = self.unescape_path(RestFrameworkEndpointEnumerator.get_path_from_regex(self, path_regex))
+        return _LITERAL_PATH_PREFIX_RE.match(path).group()
+
+    def get_allowed_methods(self, callback):
+        """
+        Return the HTTP methods of an endpoint, except those whose view methods are excluded.
+        """
+        methods = super().get_allowed_methods(callback)
+        if self.exclusions is None or not self.exclusions.excludes_views():
+            return methods
+        actions = getattr(callback, 'actions', None) or {}
+        return [
+            method for method in methods
+            if not self.exclusions.is_method_excluded(callback.cls, actions.get(method.lower(), method.lower()))
+        ]
+
+
+class ApiSchemaGenerator(DocsSchemaGenerator):
+    """
+    A schema generator for ``/api/*``.
+
+    Only includes endpoints in the ``/api/*`` url tree, and sets the path prefix
+    appropriately. Other parts of the URLconf are not even enumerated.
+
+    The OPENAPI_API_PATH_PREFIXES setting replaces ``/api/`` with a different
+    list of path prefixes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create a schema generator; takes the same arguments as OpenAPISchemaGenerator.
+        """
+        super().__init__(*args, **kwargs)
+        self.path_prefixes = tuple(getattr(settings, 'OPENAPI_API_PATH_PREFIXES', ("/api/",)))
+        self.endpoint_enumerator_class = functools.partial(
+            PrefixEndpointEnumerator, path_prefixes=self.path_prefixes, exclusions=self.exclusions
+        )
+
+    def get_endpoints(self, request):
+        """
+        Return dict of endpoints to be displayed.
+        """
+        endpoints = super().get_endpoints(request)
+        subpoints = {p: v for p, v in endpoints.items() if p.startswith(self.path_prefixes)}
+        return subpoints
+
+    def determine_path_prefix(self, paths):
+        """
+        Return common prefix for all paths.
+        """
+        if len(self.path_prefixes) == 1:
+            return self.path_prefixes[0]
+        return super().determine_path_prefix(paths)
+
+
+def _merge_definition(definitions, name, definition):
+    """
+    Add a definition generated for one path to the definitions for the whole schema.
+
+    Like drf_yasg does when generating sequentially, refuse to let two distinct
+    serializers share a definition unless both set their ref_name explicitly.
+    """
+    actual_definition = definitions.setdefault(name, lambda: definition)
+    actual_serializer = getattr(actual_definition, '_NP_serializer', None)
+    this_serializer = getattr(definition, '_NP_serializer', None)
+    if actual_serializer and this_serializer and actual_serializer != this_serializer:
+        explicit_refs = all(
+            hasattr(getattr(serializer, 'Meta', None), 'ref_name')
+            for serializer in (actual_serializer, this_serializer)
+        )
+        if not explicit_refs:
+            raise SwaggerGenerationError(
+                f"Schema for {actual_serializer} would override distinct serializer {this_serializer} "
+                "because they implicitly share the same ref_name; explicitly set the "
+                "ref_name attribute on both serializers' Meta classes"
+            )
+
+
+def _find_definition_refs(obj, definitions):
+    """
+    Find the names of all definitions that an object refers to, directly or through other definitions.
+
+    Arguments:
+        obj: Part of a schema (such as an openapi.Operation).
+        definitions (ReferenceResolver): The definitions that refs may point to.
+
+    Returns: list[str]
+        Definition names, in the order they were first found.
+    """
+    found = {}
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            ref = item.get('$ref')
+            if isinstance(ref, str) and ref.startswith('#/definitions/'):
+                name = ref[len('#/definitions/'):]
+                if name not in found:
+                    found[name] = True
+                    stack.append(definitions.getdefault(name))
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+    return list(found)
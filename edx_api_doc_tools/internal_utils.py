@@ -1,9 +1,17 @@
 """
 Utility functions internal to this package.
 """
+import functools
 import textwrap
 
 
+# How many docstrings (and other texts) to remember the processing of.
+# Docstrings are processed each time a spec is generated, but there are only
+# as many distinct ones as there are documented operations.
+DOCSTRING_MEMO_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=DOCSTRING_MEMO_SIZE)
 def dedent(text):
     """
     Dedent multi-line text nicely.
@@ -19,6 +27,7 @@ def dedent(text):
     return textwrap.dedent(text)
 
 
+@functools.lru_cache(maxsize=DOCSTRING_MEMO_SIZE)
 def split_docstring(docstring):
     """
     Split a docstring into a summary and a description.
@@ -39,3 +48,23 @@ def split_docstring(docstring):
         if len(doc_lines) > 1:
             description = dedent("\n".join(doc_lines[1:]))
     return summary, description
+
+
+def get_operation_docs(summary, description, *docstrings):
+    """
+    Return the summary and description of an operation.
+
+    Explicit ``summary`` and ``description`` take precedence over those of the
+    first docstring, which take precedence over those of the next, and so on.
+    If there is no description, the summary doubles as the description.
+
+    The schema decorators call this lazily, each time a spec is generated,
+    so the docstrings are split by the memoized ``split_docstring``.
+
+    Returns: tuple[str or None, str or None]
+    """
+    for docstring in docstrings:
+        docstring_summary, docstring_description = split_docstring(docstring)
+        summary = summary or docstring_summary
+        description = description or docstring_description
+    return summary, description or summary
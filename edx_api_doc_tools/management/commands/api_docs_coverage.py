@@ -0,0 +1,72 @@
+"""
+Management command for reporting which API endpoints are documented.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from edx_api_doc_tools.doc_coverage import DOCUMENTED, EXCLUDED, UNDOCUMENTED, get_docs_coverage
+from edx_api_doc_tools.schema_provider import get_schema_providers
+
+
+class Command(BaseCommand):
+    """
+    Print the documentation coverage of the endpoints behind each API docs view.
+
+    For each set of docs, the output shows how many endpoints are documented,
+    excluded from the docs, or undocumented, and lists the undocumented ones
+    (or every endpoint, with ``--all``). No spec is generated, so this is fast
+    enough to run in CI; with ``--fail-under``, it fails if too few of the
+    endpoints that aren't excluded are documented.
+
+    Example::
+
+        ./manage.py api_docs_coverage --fail-under 90
+    """
+    help = "Print which endpoints behind each API docs view are documented, excluded or undocumented."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="List every endpoint, not just the undocumented ones.",
+        )
+        parser.add_argument(
+            '--fail-under',
+            type=float,
+            help="Fail if less than this percentage of the endpoints that aren't excluded are documented.",
+        )
+        parser.add_argument(
+            '--urlconf',
+            help="URLconf module to look for docs views in. Defaults to ROOT_URLCONF.",
+        )
+
+    def handle(self, *args, **options):
+        providers = get_schema_providers(options['urlconf'])
+        if not providers:
+            raise CommandError("No API docs views were found in the URLconf.")
+        failures = []
+        for provider in providers:
+            if provider.generator_class is None:
+                # Federated docs are merged from other services' spec files, so their endpoints aren't ours.
+                continue
+            coverage = get_docs_coverage(provider.api_url_patterns, options['urlconf'])
+            counts = {
+                status: sum(1 for endpoint in coverage if endpoint.status == status)
+                for status in (DOCUMENTED, EXCLUDED, UNDOCUMENTED)
+            }
+            documentable = counts[DOCUMENTED] + counts[UNDOCUMENTED]
+            percentage = 100 * counts[DOCUMENTED] / documentable if documentable else 100
+            self.stdout.write(
+                f"{provider.api_info.title}: {counts[DOCUMENTED]} documented, {counts[EXCLUDED]} excluded, "
+                f"{counts[UNDOCUMENTED]} undocumented endpoints ({percentage:.1f}% documented)"
+            )
+            for endpoint in coverage:
+                if options['all'] or endpoint.status == UNDOCUMENTED:
+                    self.stdout.write(
+                        f"{endpoint.status:>12}  {endpoint.method} {endpoint.path}  {endpoint.view_name}"
+                    )
+            if options['fail_under'] is not None and percentage < options['fail_under']:
+                failures.append(f"'{provider.api_info.title}' ({percentage:.1f}%)")
+        if failures:
+            raise CommandError(
+                f"Less than {options['fail_under']:g}% of the endpoints are documented in: {', '.join(failures)}."
+            )
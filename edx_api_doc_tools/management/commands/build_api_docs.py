@@ -0,0 +1,58 @@
+"""
+Management command for prebuilding API spec files at deploy time.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from edx_api_doc_tools.schema_provider import get_schema_providers
+
+
+class Command(BaseCommand):
+    """
+    Generate the spec behind each API docs view and write it to disk as JSON and YAML.
+
+    Docs views built by ``make_docs_urls`` or ``make_docs_data_view`` serve
+    these files (if they exist in their spec directory) instead of generating
+    the spec on each request.
+
+    Example::
+
+        ./manage.py build_api_docs --output-dir /edx/var/api-docs
+    """
+    help = "Generate the spec behind each API docs view and write it to disk as JSON and YAML."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            help="Directory to write spec files to. Defaults to each docs view's spec_dir / OPENAPI_SPEC_DIR.",
+        )
+        parser.add_argument(
+            '--urlconf',
+            help="URLconf module to look for docs views in. Defaults to ROOT_URLCONF.",
+        )
+        parser.add_argument(
+            '--url',
+            help="Absolute URL (e.g. https://courses.example.com) used to set the host and scheme in the spec. "
+                 "If omitted, the spec has no host, and clients use the host that served it.",
+        )
+
+    def handle(self, *args, **options):
+        providers = get_schema_providers(options['urlconf'])
+        if not providers:
+            raise CommandError("No API docs views were found in the URLconf.")
+        spec_dirs = set()
+        for provider in providers:
+            spec_dir = options['output_dir'] or provider.spec_dir
+            if not spec_dir:
+                raise CommandError(
+                    "No output directory for the '{}' docs; pass --output-dir or set OPENAPI_SPEC_DIR.".format(
+                        provider.api_info.title
+                    )
+                )
+            if spec_dir in spec_dirs:
+                raise CommandError(
+                    f"More than one set of API docs would be written to {spec_dir}; "
+                    "give each docs view its own spec_dir."
+                )
+            spec_dirs.add(spec_dir)
+            for path in provider.write_spec_files(spec_dir, url=options['url']):
+                self.stdout.write(f"Wrote {path}")
@@ -0,0 +1,91 @@
+"""
+Management command for merging the spec files of several services into one federated spec.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from edx_api_doc_tools.conf_utils import make_api_info
+from edx_api_doc_tools.federation import FederatedSchemaProvider, ServiceSpec
+
+
+class Command(BaseCommand):
+    """
+    Merge the spec files of several services into one spec, and write it to disk as JSON and YAML.
+
+    Each service's paths are prefixed with "/<name>" (or the prefix given with
+    ``--prefix``), identical definitions are shared between services, and
+    conflicting ones are renamed to "<name>.<definition>". Serve the merged spec
+    with the views built by ``make_federated_docs_urls``.
+
+    Example::
+
+        ./manage.py merge_api_docs \\
+            lms=/edx/var/api-docs/lms/swagger.json \\
+            studio=/edx/var/api-docs/studio/swagger.json \\
+            --prefix lms=/ --output-dir /edx/var/api-docs/federated
+    """
+    help = "Merge the spec files of several services into one spec, and write it to disk as JSON and YAML."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'services',
+            nargs='+',
+            metavar='NAME=PATH',
+            help="Name of a service and the path of its spec file (JSON or YAML), in order of precedence.",
+        )
+        parser.add_argument(
+            '--output-dir',
+            required=True,
+            help="Directory to write the merged spec files to.",
+        )
+        parser.add_argument(
+            '--prefix',
+            action='append',
+            default=[],
+            metavar='NAME=PREFIX',
+            help="Path prefix of a service's paths in the merged spec. Defaults to /NAME.",
+        )
+        parser.add_argument('--title', default="Open edX APIs", help="Title of the merged spec.")
+        parser.add_argument('--api-version', default="v1", help="Version of the merged spec.")
+        parser.add_argument(
+            '--url',
+            help="Absolute URL (e.g. https://courses.example.com) used to set the host and scheme in the spec.",
+        )
+        parser.add_argument(
+            '--json-only',
+            action='store_true',
+            help="Only write swagger.json, which is much faster than also rendering YAML. "
+                 "The docs views render the YAML spec from it when it's first requested.",
+        )
+
+    def handle(self, *args, **options):
+        prefixes = dict(self.parse_pair(prefix, 'NAME=PREFIX') for prefix in options['prefix'])
+        service_specs = []
+        for service in options['services']:
+            name, path = self.parse_pair(service, 'NAME=PATH')
+            service_specs.append(ServiceSpec(name, path, path_prefix=prefixes.pop(name, None)))
+        if prefixes:
+            raise CommandError(f"There are prefixes for unknown services: {', '.join(prefixes)}.")
+        provider = FederatedSchemaProvider(
+            make_api_info(title=options['title'], version=options['api_version']),
+            service_specs,
+        )
+        try:
+            written_paths = provider.write_spec_files(
+                options['output_dir'],
+                url=options['url'],
+                spec_formats=('json',) if options['json_only'] else ('json', 'yaml'),
+            )
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Could not merge the specs: {error}") from error
+        for path in written_paths:
+            self.stdout.write(f"Wrote {path}")
+
+    @staticmethod
+    def parse_pair(value, metavar):
+        """
+        Split a command line value of the form "NAME=VALUE".
+        """
+        name, separator, pair_value = value.partition('=')
+        if not (name and separator and pair_value):
+            raise CommandError(f"Expected {metavar}, got {value!r}.")
+        return name, pair_value
@@ -0,0 +1,69 @@
+"""
+Management command for finding the endpoints that make API spec generation slow.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from edx_api_doc_tools.schema_provider import get_schema_providers
+
+
+class Command(BaseCommand):
+    """
+    Generate the spec behind each API docs view with profiling on, and print the most expensive endpoints.
+
+    For each endpoint, the output shows the time taken to generate its operation,
+    the part of that spent inspecting serializers, how many of its serializer
+    inspections were reused from earlier endpoints (hits) or made (misses),
+    and how many exceptions its view raised during generation.
+
+    Example::
+
+        ./manage.py profile_api_docs --top 10
+    """
+    help = "Generate the spec behind each API docs view and print the endpoints that took the longest."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help="Number of endpoints to print for each set of docs. Defaults to 20.",
+        )
+        parser.add_argument(
+            '--urlconf',
+            help="URLconf module to look for docs views in. Defaults to ROOT_URLCONF.",
+        )
+
+    def handle(self, *args, **options):
+        providers = get_schema_providers(options['urlconf'])
+        if not providers:
+            raise CommandError("No API docs views were found in the URLconf.")
+        for provider in providers:
+            if provider.generator_class is None:
+                # Federated docs are merged from other services' spec files, not generated.
+                continue
+            generator = provider.make_generator()
+            if not hasattr(generator, 'endpoint_profiles'):
+                raise CommandError(
+                    f"The '{provider.api_info.title}' docs use {type(generator).__name__}, which can't be profiled."
+                )
+            generator.profile = True
+            # Generate every operation from scratch, so that the timings mean something.
+            generator.reuse_operations = False
+            generator.get_schema(None, public=True)
+            profiles = sorted(generator.endpoint_profiles, key=lambda profile: profile.seconds, reverse=True)
+            total_seconds = sum(profile.seconds for profile in profiles)
+            self.stdout.write(
+                f"{provider.api_info.title}: {len(profiles)} endpoints in {total_seconds * 1000:.1f}ms, "
+                f"{generator.serializer_memo_hits} serializer memo hits, "
+                f"{generator.serializer_memo_misses} misses"
+            )
+            self.stdout.write(
+                f"{'total (ms)':>10}  {'serializers (ms)':>16}  {'memo hits':>9}  {'memo misses':>11}  "
+                f"{'exceptions':>10}  endpoint"
+            )
+            for profile in profiles[:options['top']]:
+                self.stdout.write(
+                    f"{profile.seconds * 1000:>10.1f}  {profile.serializer_seconds * 1000:>16.1f}  "
+                    f"{profile.serializer_memo_hits:>9}  {profile.serializer_memo_misses:>11}  "
+                    f"{profile.exceptions:>10}  {profile.method} {profile.path}"
+                )
@@ -0,0 +1,895 @@
+"""
+The source of the OpenAPI spec documents served by the API docs views.
+
+External users: you should not usually need to use this module directly;
+:func:`.make_docs_urls` and friends set up a schema provider for you.
+"""
+import functools
+import gzip
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+import threading
+import time
+
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.urls import URLResolver, get_resolver, get_script_prefix, get_urlconf
+from django.utils import translation
+from django.utils.functional import Promise
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml, yaml_dump
+from rest_framework.serializers import BaseSerializer
+
+from .exclusions import get_exclusions
+from .generators import _OPERATION_VIEW_ATTRIBUTES, DocsSchemaGenerator
+from .shards import SpecIndex
+from .streaming import iter_spec_chunks
+
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+# Formats that a spec can be rendered to, mapped to the drf_yasg codec used to render it.
+SPEC_CODECS = {
+    'json': OpenAPICodecJson,
+    'yaml': OpenAPICodecYaml,
+}
+
+# The content encoding of uncompressed specs.
+IDENTITY = 'identity'
+
+# Content encodings that specs can be compressed with, most preferred first,
+# mapped to the function that compresses them. Brotli needs the optional
+# ``brotli`` package.
+CONTENT_ENCODINGS = {}
+if brotli is not None:
+    CONTENT_ENCODINGS['br'] = functools.partial(brotli.compress, quality=9)
+CONTENT_ENCODINGS['gzip'] = functools.partial(gzip.compress, compresslevel=9, mtime=0)
+
+# How many indexes of full specs (for serving shards) each provider keeps in memory.
+SPEC_INDEX_MEMO_SIZE = 16
+
+# How many rendered (and maybe compressed) shards of specs each provider keeps in memory.
+SPEC_SHARD_MEMO_SIZE = 256
+
+# Base name of the spec files written by the ``build_api_docs`` management command.
+SPEC_FILE_NAME = 'swagger'
+
+# Map from the file extensions of compressed spec URLs (like swagger.json.gz)
+# to the content encoding of the spec they serve.
+SPEC_FILE_ENCODINGS = {
+    '.gz': 'gzip',
+    '.br': 'br',
+}
+
+# Prefix of the keys that generated specs are cached under.
+CACHE_KEY_PREFIX = 'edx_api_doc_tools.spec'
+
+# How long (in seconds) one process may hold the lock on generating a spec,
+# and how often other processes check whether it has finished.
+GENERATION_LOCK_TIMEOUT = 60
+GENERATION_LOCK_POLL_INTERVAL = 0.2
+
+# Distributions whose versions are part of every spec's fingerprint,
+# since they decide what the spec generated from the same code looks like.
+FINGERPRINT_DISTRIBUTIONS = ('Django', 'djangorestframework', 'drf-yasg')
+
+# Memory addresses in reprs, which vary between processes.
+_MEMORY_ADDRESS_RE = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+class SchemaProvider:
+    """
+    Provides the rendered OpenAPI spec for one set of API docs views.
+
+    If a prebuilt spec file (as written by the ``build_api_docs`` management
+    command) exists in ``spec_dir``, it is served as-is. Otherwise, the spec is
+    generated on demand and, if caching is enabled, stored in a Django cache
+    so that every process using that cache can reuse it.
+
+    Specs can also be served compressed with any of the ``CONTENT_ENCODINGS``.
+    Each spec is compressed once per encoding, when it's first requested in that
+    encoding, and the compressed variants are kept alongside the uncompressed one.
+
+    Besides the specs themselves, the provider keeps some metadata about each
+    one (see ``get_spec_metadata``), which lets views answer conditional
+    requests without rendering or even fetching the spec.
+    """
+
+    def __init__(
+            self,
+            api_info,
+            api_url_patterns=None,
+            generator_class=DocsSchemaGenerator,
+            spec_dir=None,
+            cache_alias='default',
+            cache_timeout=0,
+            streaming=False,
+            compact=False,
+            deployment_id=None,
+    ):
+        """
+        Create a schema provider.
+
+        Arguments:
+            api_info (openapi.Info): Information about the API.
+            api_url_patterns (list of url patterns): URL patterns that API docs will be generated for
+            generator_class (type): Subclass of drf_yasg's OpenAPISchemaGenerator used to generate the spec.
+            spec_dir (str): Optional directory containing prebuilt spec files.
+            cache_alias (str): Alias of the Django cache that generated specs are stored in.
+            cache_timeout (int): Seconds to cache generated specs for; zero disables caching,
+                and None caches them until their fingerprint (see ``get_fingerprint``) changes.
+            streaming (bool): Whether specs that are neither prebuilt nor cached
+                may be rendered incrementally by ``get_spec_stream``.
+            compact (bool): Whether to keep the indexes of specs that shards are sliced from
+                in a compact form (see ``SpecIndex``).
+            deployment_id (str): Optional identifier of the deployment (such as a commit hash),
+                added to the fingerprint of generated specs.
+        """
+        self.api_info = api_info
+        self.api_url_patterns = api_url_patterns
+        self.generator_class = generator_class
+        self.spec_dir = spec_dir
+        self.cache_alias = cache_alias
+        self.cache_timeout = cache_timeout
+        self.streaming = streaming
+        self.compact = compact
+        self.deployment_id = deployment_id
+        self._spec_files = {}
+        self._spec_file_metadata = {}
+        self._spec_indexes = {}
+        self._spec_shards = {}
+        self._last_generation = threading.local()
+        self._fingerprints = {}
+
+    def get_spec(self, spec_format, request=None, version='', encoding=IDENTITY):
+        """
+        Get the rendered spec in a format, from the first place that has it.
+
+        In order, those places are: the prebuilt spec file, the cache,
+        and a fresh generation of the spec.
+
+        Arguments:
+            spec_format (str): 'json' or 'yaml'.
+            request (Request): Optional request that the spec is being served for.
+            version (str): API version; defaults to the version in ``api_info``.
+            encoding (str): 'identity', or one of the ``CONTENT_ENCODINGS`` to get the compressed spec.
+
+        Returns: bytes
+        """
+        content = self.get_prebuilt_spec(spec_format, encoding)
+        if content is not None:
+            return content
+        if self.cache_timeout == 0:
+            content = self.render(self.generate(request, version), spec_format)
+            return self.compress(content, encoding)
+        cache = caches[self.cache_alias]
+        content = cache.get(self.get_cache_key(spec_format, request, version, encoding))
+        if content is None:
+            content = self._derive_from_cached_spec(cache, spec_format, request, version, encoding)
+        if content is None:
+            content = self._generate_once(cache, spec_format, request, version, encoding)
+        return content
+
+    def _derive_from_cached_spec(self, cache, spec_format, request, version, encoding):
+        """
+        Derive the spec in a format and encoding from a cached variant, and cache it; return None if there's none.
+
+        Generating a spec only caches it as JSON and in the format and encoding
+        that was requested. Other variants are derived the first time they're
+        requested: compressed specs from the uncompressed spec in their format,
+        and other formats from the JSON spec. The same goes for variants that
+        the cache evicted before the JSON spec.
+        """
+        if encoding != IDENTITY:
+            content = cache.get(self.get_cache_key(spec_format, request, version))
+            if content is None:
+                content = self._derive_from_cached_spec(cache, spec_format, request, version, IDENTITY)
+            if content is None:
+                return None
+            content = self.compress(content, encoding)
+        elif spec_format != 'json':
+            json_content = cache.get(self.get_cache_key('json', request, version))
+            if json_content is None:
+                return None
+            content = self.render_data(json.loads(json_content), spec_format)
+        else:
+            return None
+        json_metadata = self.get_spec_metadata('json', request, version)
+        cache.set_many(
+            self._get_cache_entries(
+                content, spec_format, request, version, encoding, json_metadata and json_metadata['last_modified'],
+            ),
+            self.cache_timeout,
+        )
+        return content
+
+    def get_spec_shard(self, spec_format, request=None, version='', encoding=IDENTITY, tag=None, path_prefix=None):
+        """
+        Get the rendered shard of the spec with only the operations that have a tag or are under a path.
+
+        Shards are sliced out of the full spec (from wherever ``get_spec`` gets it)
+        through an index that is built once per spec, rather than being generated.
+        Once rendered, a shard is kept in memory for as long as the full spec's
+        content doesn't change.
+
+        Arguments:
+            spec_format (str): 'json' or 'yaml'.
+            request (Request): Optional request that the spec is being served for.
+            version (str): API version; defaults to the version in ``api_info``.
+            encoding (str): 'identity', or one of the ``CONTENT_ENCODINGS`` to get the compressed shard.
+            tag (str): The tag of the operations to include.
+            path_prefix (str): If ``tag`` isn't given, the path (including the basePath,
+                like "/api/courses") of the operations to include.
+
+        Returns: bytes, or None if no operations have the tag or are under the path.
+        """
+        spec_metadata = self.get_spec_metadata('json', request, version)
+        memo_key = spec_metadata and (spec_metadata['etag'], spec_format, encoding, tag, path_prefix)
+        if memo_key in self._spec_shards:
+            return self._spec_shards[memo_key][0]
+        index = self.get_spec_index(request, version)
+        if tag is not None:
+            shard = index.get_tag_shard(tag)
+        else:
+            shard = index.get_path_prefix_shard(path_prefix)
+        content = None if shard is None else self.compress(self.render_data(shard, spec_format), encoding)
+        # The full spec may have been generated (and cached) just now.
+        spec_metadata = spec_metadata or self.get_spec_metadata('json', request, version)
+        memo_key = spec_metadata and (spec_metadata['etag'], spec_format, encoding, tag, path_prefix)
+        if memo_key:
+            if len(self._spec_shards) >= SPEC_SHARD_MEMO_SIZE:
+                self._spec_shards.clear()
+            self._spec_shards[memo_key] = (
+                content,
+                None if content is None else self.get_content_metadata(content, spec_metadata['last_modified']),
+            )
+        return content
+
+    def get_spec_shard_metadata(
+            self, spec_format, request=None, version='', encoding=IDENTITY, tag=None, path_prefix=None,
+    ):
+        """
+        Get metadata about the shard that ``get_spec_shard`` would return, if it's available without rendering it.
+
+        That is, if the shard has been rendered since the full spec last changed.
+        The metadata is in the form returned by ``get_spec_metadata``, with the
+        last-modified time of the full spec.
+
+        Arguments: as for ``get_spec_shard``.
+
+        Returns: dict or None
+        """
+        spec_metadata = self.get_spec_metadata('json', request, version)
+        if spec_metadata is None:
+            return None
+        memo_key = (spec_metadata['etag'], spec_format, encoding, tag, path_prefix)
+        return self._spec_shards.get(memo_key, (None, None))[1]
+
+    def get_spec_index(self, request=None, version=''):
+        """
+        Get the index of the full spec for a request, for slicing it into shards.
+
+        The index is kept in memory for as long as the spec's content doesn't change,
+        so the full spec is only fetched (or generated) and parsed once.
+
+        Returns: SpecIndex
+        """
+        metadata = self.get_spec_metadata('json', request, version)
+        index = self._spec_indexes.get(metadata['etag']) if metadata else None
+        if index is None:
+            index = SpecIndex(json.loads(self.get_spec('json', request, version)), compact=self.compact)
+            metadata = metadata or self.get_spec_metadata('json', request, version)
+            if metadata is not None:
+                if len(self._spec_indexes) >= SPEC_INDEX_MEMO_SIZE:
+                    self._spec_indexes.clear()
+                self._spec_indexes[metadata['etag']] = index
+        return index
+
+    def get_spec_stream(self, spec_format, request=None, version=''):
+        """
+        Get the rendered spec in a format as an iterator of chunks, if it can be streamed.
+
+        Only specs that would be generated for this one request can be streamed:
+        prebuilt and cached specs already exist in full, and a spec that is about to
+        be cached has to be rendered in full anyway. So this returns None unless
+        streaming is enabled, caching is disabled, and there is no prebuilt spec file.
+
+        Arguments: as for ``get_spec``.
+
+        Returns: iterator of bytes, or None
+        """
+        if not self.streaming or self.cache_timeout != 0 or self.get_prebuilt_spec(spec_format) is not None:
+            return None
+        return iter_spec_chunks(self.generate(request, version), spec_format)
+
+    def _generate_once(self, cache, spec_format, request, version, encoding):
+        """
+        Generate the spec and cache it as JSON and in the requested format and encoding.
+
+        Other variants are derived from those when they're requested
+        (see ``_derive_from_cached_spec``), so that the generation lock isn't
+        held for rendering and compressing specs that may never be requested.
+
+        If another process is already generating the spec, wait for it to cache
+        the spec instead of generating it again here. If that process fails
+        (and so releases the lock without caching the spec), take over the
+        generation. Give up waiting after ``GENERATION_LOCK_TIMEOUT`` seconds.
+        """
+        cache_key = self.get_cache_key(spec_format, request, version, encoding)
+        lock_key = f'{self.get_cache_key(None, request, version)}.lock'
+        has_lock = cache.add(lock_key, True, GENERATION_LOCK_TIMEOUT)
+        if not has_lock:
+            deadline = time.monotonic() + GENERATION_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(GENERATION_LOCK_POLL_INTERVAL)
+                # The other process may be generating the spec for another format or encoding.
+                content = (
+                    cache.get(cache_key) or
+                    self._derive_from_cached_spec(cache, spec_format, request, version, encoding)
+                )
+                if content is not None:
+                    return content
+                has_lock = cache.add(lock_key, True, GENERATION_LOCK_TIMEOUT)
+                if has_lock:
+                    break
+        try:
+            data = self.generate(request, version).as_dict()
+            last_modified = time.time()
+            json_content = self.render_data(data, 'json')
+            cache_entries = self._get_cache_entries(json_content, 'json', request, version, IDENTITY, last_modified)
+            content = json_content if spec_format == 'json' else self.render_data(data, spec_format)
+            content = self.compress(content, encoding)
+            cache_entries.update(
+                self._get_cache_entries(content, spec_format, request, version, encoding, last_modified)
+            )
+            cache.set_many(cache_entries, self.cache_timeout)
+        finally:
+            if has_lock:
+                cache.delete(lock_key)
+        return content
+
+    def _get_cache_entries(self, content, spec_format, request, version, encoding, last_modified=None):
+        """
+        Return the cache entries for a rendered (and maybe compressed) spec and its metadata.
+        """
+        return {
+            self.get_cache_key(spec_format, request, version, encoding): content,
+            self._get_metadata_cache_key(spec_format, request, version, encoding): self.get_content_metadata(
+                content, last_modified,
+            ),
+        }
+
+    def get_spec_metadata(self, spec_format, request=None, version='', encoding=IDENTITY):
+        """
+        Get metadata about the spec that ``get_spec`` would return, if it's available without generating the spec.
+
+        Metadata is available for prebuilt spec files and cached specs. It is a dict of:
+
+        * etag: a hash of the spec's content; and
+        * last_modified: the time (in seconds since the epoch) that it was generated or written.
+
+        Returns: dict or None
+        """
+        if self.get_prebuilt_spec(spec_format, encoding) is not None:
+            return self._spec_file_metadata[(spec_format, encoding)]
+        if self.cache_timeout == 0:
+            return None
+        return caches[self.cache_alias].get(self._get_metadata_cache_key(spec_format, request, version, encoding))
+
+    def _get_metadata_cache_key(self, spec_format, request, version, encoding=IDENTITY):
+        """
+        Get the key that the metadata about the spec for a request is cached under.
+        """
+        return f'{self.get_cache_key(spec_format, request, version, encoding)}.metadata'
+
+    def get_cache_key(self, spec_format, request=None, version='', encoding=IDENTITY):
+        """
+        Get the key that the spec for a request is cached under.
+
+        Besides the format and content encoding, the key is made of:
+
+        * a fingerprint of the documented API (see ``get_fingerprint``),
+          so that a new deployment doesn't serve a stale spec; and
+        * the parts of the request that end up in the spec:
+          its version, script prefix, scheme and host, and the active
+          language, which translated descriptions are rendered in.
+
+        If ``spec_format`` is None, return the part of the key that all formats share.
+        """
+        if request is not None:
+            version = getattr(request, 'version', None) or version
+        url = swagger_settings.DEFAULT_API_URL
+        if url is None and request is not None:
+            url = f'{request.scheme}://{request.get_host()}'
+        request_fingerprint = _hash([version or '', get_script_prefix(), url or '', translation.get_language()])
+        cache_key = f'{CACHE_KEY_PREFIX}.{self.get_fingerprint()}.{request_fingerprint}'
+        if spec_format is None:
+            return cache_key
+        cache_key = f'{cache_key}.{spec_format}'
+        if encoding != IDENTITY:
+            cache_key = f'{cache_key}.{encoding}'
+        return cache_key
+
+    def get_fingerprint(self):
+        """
+        Return a hash of everything, other than the request, that the spec depends on.
+
+        That is:
+
+        * the URL patterns being documented, and for each of their views,
+          its docstrings, the schema metadata attached by the decorators in
+          ``view_utils``, and its serializer and other schema-relevant attributes;
+        * the views, view methods and paths excluded from the docs;
+        * the API info and generator class;
+        * the versions of this package, Django, DRF and drf-yasg; and
+        * the deployment ID, if any.
+
+        So a spec only needs to be regenerated when its fingerprint changes,
+        and can be cached indefinitely. Changes that the fingerprint can't see,
+        like a model field that a ModelSerializer picks up, or a custom inspector,
+        call for a new deployment ID. The fingerprint is computed once per URLconf,
+        with translation deactivated, so that it doesn't depend on the language
+        of the request that happens to compute it; the language is part of the
+        cache key instead.
+        """
+        urlconf = get_urlconf()
+        if urlconf not in self._fingerprints:
+            # Import here, where the package is guaranteed to be fully imported.
+            from edx_api_doc_tools import __version__  # pylint: disable=import-outside-toplevel
+            patterns = self.api_url_patterns
+            if patterns is None:
+                patterns = get_resolver(urlconf).url_patterns
+            exclusions = get_exclusions()
+            with translation.override(None):
+                api_info = {key: value for key, value in self.api_info.as_dict().items() if key != 'version'}
+                self._fingerprints[urlconf] = _hash([
+                    __version__,
+                    get_dependency_versions(),
+                    self.deployment_id or '',
+                    _qualified_name(self.generator_class),
+                    api_info,
+                    self.api_info._default_version,  # pylint: disable=protected-access
+                    _describe_url_patterns(patterns, describe_views=True, exclusions=exclusions),
+                    list(exclusions.get_path_prefixes()),
+                ])
+        return self._fingerprints[urlconf]
+
+    def generate(self, request=None, version='', url=None):
+        """
+        Generate the spec.
+
+        Arguments:
+            request (Request): Optional request that the spec is being generated for.
+            version (str): API version; defaults to the version in ``api_info``.
+            url (str): Optional absolute URL used to set the spec's host and scheme.
+                If None, it is inferred from ``request`` (if given).
+
+        Returns: openapi.Swagger
+        """
+        generator = self.make_generator(version, url)
+        start = time.perf_counter()
+        spec = generator.get_schema(request, public=True)
+        if getattr(generator, 'profile', False):
+            self._last_generation.profile = (time.perf_counter() - start, generator.endpoint_profiles)
+        return spec
+
+    def make_generator(self, version='', url=None):
+        """
+        Create a schema generator for the spec; see ``generate`` for the arguments.
+        """
+        return self.generator_class(self.api_info, version, url, self.api_url_patterns)
+
+    def pop_generation_profile(self):
+        """
+        Return the profile of the last profiled generation on this thread, and forget it.
+
+        Returns: tuple[float, list[EndpointProfile]] or None
+            The time the generation took, and the profiles of its endpoints;
+            or None if no generation was profiled since the last call.
+        """
+        profile = getattr(self._last_generation, 'profile', None)
+        self._last_generation.profile = None
+        return profile
+
+    @staticmethod
+    def render(spec, spec_format):
+        """
+        Render a generated spec to bytes in the given format ('json' or 'yaml').
+
+        The output is identical to what drf_yasg's own renderers would produce.
+        """
+        return SPEC_CODECS[spec_format](validators=[]).encode(spec)
+
+    @classmethod
+    def render_all(cls, spec):
+        """
+        Render a generated spec to bytes in every format.
+
+        The spec is only converted to plain data once, and then rendered by
+        ``render_data``, so the output is identical to that of ``render``.
+
+        Returns: dict[str, bytes]
+            Map from spec format to rendered spec.
+        """
+        data = spec.as_dict()
+        return {spec_format: cls.render_data(data, spec_format) for spec_format in SPEC_CODECS}
+
+    @staticmethod
+    def render_data(data, spec_format):
+        """
+        Render a spec given as plain data (like a parsed spec, or a shard of one) to bytes.
+
+        The output is formatted like that of ``render``. YAML is dumped by
+        drf_yasg's dumper, which uses PyYAML's LibYAML bindings when they are available.
+        """
+        if spec_format == 'json':
+            return json.dumps(data, ensure_ascii=False).encode('utf-8')
+        return yaml_dump(data, binary=True)
+
+    @staticmethod
+    def compress(content, encoding):
+        """
+        Compress a rendered spec with a content encoding ('identity' leaves it as it is).
+        """
+        if encoding == IDENTITY:
+            return content
+        return CONTENT_ENCODINGS[encoding](content)
+
+    @staticmethod
+    def get_content_metadata(content, last_modified=None):
+        """
+        Describe a spec's content in the form returned by ``get_spec_metadata``.
+
+        ``last_modified`` defaults to now.
+        """
+        if last_modified is None:
+            last_modified = time.time()
+        return {
+            'etag': hashlib.sha256(content).hexdigest()[:32],
+            'last_modified': int(last_modified),
+        }
+
+    def get_spec_file_path(self, spec_format, spec_dir=None):
+        """
+        Return the path of the prebuilt spec file for a format, or None if there is no spec directory.
+        """
+        spec_dir = spec_dir or self.spec_dir
+        if not spec_dir:
+            return None
+        return os.path.join(spec_dir, f'{SPEC_FILE_NAME}.{spec_format}')
+
+    def get_prebuilt_spec(self, spec_format, encoding=IDENTITY):
+        """
+        Return the contents of the prebuilt spec file for a format, or None if it doesn't exist.
+
+        If there's a JSON spec file but no file for the format, the spec is rendered from the JSON spec.
+        Spec files are only written at deploy time, so once found, their contents
+        (and, as they are asked for, their compressed variants) are kept in memory.
+        """
+        key = (spec_format, encoding)
+        if key not in self._spec_files:
+            if encoding == IDENTITY:
+                spec_file = self.read_spec_file(spec_format)
+                if spec_file is not None:
+                    content, last_modified = spec_file
+                elif spec_format == 'json' or self.get_prebuilt_spec('json') is None:
+                    return None
+                else:
+                    # Derive the spec in this format from the JSON one.
+                    content = self.render_data(json.loads(self.get_prebuilt_spec('json')), spec_format)
+                    last_modified = self._spec_file_metadata[('json', IDENTITY)]['last_modified']
+            else:
+                content = self.get_prebuilt_spec(spec_format)
+                if content is None:
+                    return None
+                content = self.compress(content, encoding)
+                last_modified = self._spec_file_metadata[(spec_format, IDENTITY)]['last_modified']
+            self._spec_files[key] = content
+            self._spec_file_metadata[key] = self.get_content_metadata(content, last_modified)
+        return self._spec_files[key]
+
+    def read_spec_file(self, spec_format):
+        """
+        Read the prebuilt spec file for a format.
+
+        Returns: tuple[bytes, float] or None
+            The file's contents and modification time, or None if there is no such file.
+        """
+        path = self.get_spec_file_path(spec_format)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as spec_file:
+                return spec_file.read(), os.fstat(spec_file.fileno()).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def write_spec_files(self, spec_dir=None, url=None):
+        """
+        Generate the spec once and write it to disk in every format.
+
+        Arguments:
+            spec_dir (str): Directory to write to; defaults to ``self.spec_dir``.
+            url (str): Optional absolute URL used to set the spec's host and scheme.
+
+        Returns: list[str]
+            Paths of the files that were written.
+        """
+        return self.write_rendered_specs(self.render_all(self.generate(url=url)), spec_dir)
+
+    def write_rendered_specs(self, rendered_specs, spec_dir=None):
+        """
+        Write a spec, rendered in some formats, to disk.
+
+        Spec files in other formats, and compressed spec files, left by earlier
+        runs are removed, so that they aren't served instead of the spec
+        derived from the new files.
+
+        Arguments:
+            rendered_specs (dict[str, bytes]): Map from spec format to rendered spec, as returned by ``render_all``.
+            spec_dir (str): Directory to write to; defaults to ``self.spec_dir``.
+
+        Returns: list[str]
+            Paths of the files that were written.
+        """
+        spec_dir = spec_dir or self.spec_dir
+        os.makedirs(spec_dir, exist_ok=True)
+        written_paths = []
+        for spec_format, content in rendered_specs.items():
+            path = self.get_spec_file_path(spec_format, spec_dir)
+            # Write to a temporary file first so that a running server never
+            # serves a partially-written spec.
+            temp_path = f'{path}.tmp'
+            with open(temp_path, 'wb') as spec_file:
+                spec_file.write(content)
+            os.replace(temp_path, path)
+            written_paths.append(path)
+        for spec_format in SPEC_CODECS:
+            path = self.get_spec_file_path(spec_format, spec_dir)
+            stale_paths = [f'{path}{extension}' for extension in SPEC_FILE_ENCODINGS]
+            if spec_format not in rendered_specs:
+                stale_paths.append(path)
+            for stale_path in stale_paths:
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass
+        self._spec_files.clear()
+        self._spec_file_metadata.clear()
+        return written_paths
+
+
+def choose_content_encoding(accept_encoding):
+    """
+    Choose the encoding to serve a spec in, given the value of an Accept-Encoding header.
+
+    Returns the most preferred of the ``CONTENT_ENCODINGS`` that the header
+    accepts, or 'identity' if it accepts none of them.
+    """
+    accepted = {}
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        quality = re.search(r'q=([0-9.]+)', params)
+        try:
+            accepted[name.strip().lower()] = float(quality.group(1)) if quality else 1.0
+        except ValueError:
+            continue
+    for encoding in CONTENT_ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return IDENTITY
+
+
+def get_schema_providers(urlconf=None):
+    """
+    Find the schema providers behind the API docs views routed in a URLconf.
+
+    Arguments:
+        urlconf (str): URLconf module name; defaults to ``ROOT_URLCONF``.
+
+    Returns: list[SchemaProvider]
+        One provider per set of docs, in URL pattern order. Providers for the
+        same API info and URL patterns (such as those behind the data and UI
+        views built by ``make_docs_urls``) count as the same set of docs.
+    """
+    providers = {}
+
+    def visit(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                visit(pattern.url_patterns)
+                continue
+            view_class = getattr(pattern.callback, 'cls', None)
+            provider = getattr(view_class, 'schema_provider', None)
+            if provider is None:
+                # Docs views built by make_docs_urls(lazy=True) have the provider themselves.
+                provider = getattr(pattern.callback, 'schema_provider', None)
+            if provider is not None:
+                providers.setdefault((id(provider.api_info), id(provider.api_url_patterns)), provider)
+
+    visit(get_resolver(urlconf).url_patterns)
+    return list(providers.values())
+
+
+@functools.lru_cache(maxsize=None)
+def get_dependency_versions():
+    """
+    Return the installed versions of the ``FINGERPRINT_DISTRIBUTIONS``, as a list of pairs.
+    """
+    versions = []
+    for distribution in FINGERPRINT_DISTRIBUTIONS:
+        try:
+            versions.append([distribution, importlib.metadata.version(distribution)])
+        except importlib.metadata.PackageNotFoundError:
+            versions.append([distribution, ''])
+    return versions
+
+
+def _describe_url_patterns(patterns, describe_views=False, serializers=None, exclusions=None):
+    """
+    Describe the structure of a list of URL patterns as nested lists of strings.
+
+    The description includes each pattern's route, name and view,
+    but nothing that varies between processes. If ``describe_views`` is True,
+    it also includes what each view contributes to the spec (see ``_describe_view``),
+    given the ``ExclusionRegistry`` of ``exclusions``.
+    """
+    if serializers is None:
+        serializers = {}
+    description = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            description.append([
+                str(pattern.pattern),
+                pattern.namespace or '',
+                _describe_url_patterns(pattern.url_patterns, describe_views, serializers, exclusions),
+            ])
+        else:
+            callback = pattern.callback
+            view = getattr(callback, 'cls', callback)
+            # DRF adds HEAD to a viewset's actions on its first request, and it's never documented anyway.
+            actions = {
+                method: action for method, action in (getattr(callback, 'actions', None) or {}).items()
+                if method != 'head'
+            }
+            description.append([
+                str(pattern.pattern),
+                pattern.name or '',
+                _qualified_name(view),
+                sorted(actions.items()),
+            ])
+            if describe_views:
+                description[-1].append(_describe_view(view, actions, serializers, exclusions))
+    return description
+
+
+def _describe_view(view, actions, serializers, exclusions=None):
+    """
+    Describe what a view contributes to the spec.
+
+    That is: its docstrings, the schema metadata on its handlers and whether
+    ``exclusions`` excludes them, its schema-relevant attributes, including
+    the fields of its serializer, and its ``schema_stubs``. ``serializers``
+    memoizes the descriptions of serializer classes.
+    """
+    if actions:
+        handler_names = sorted(set(actions.values()))
+    else:
+        handler_names = [name for name in getattr(view, 'http_method_names', ()) if hasattr(view, name)]
+    handlers = []
+    for name in handler_names:
+        handler = getattr(view, name, None)
+        handler_function = getattr(handler, '__func__', handler)
+        handlers.append([
+            name,
+            getattr(handler_function, '__doc__', None) or '',
+            _describe_schema_value(getattr(handler_function, '_swagger_auto_schema', None), serializers),
+            exclusions is not None and exclusions.is_method_excluded(view, name),
+        ])
+    attributes = [
+        [attribute, _describe_schema_value(getattr(view, attribute, None), serializers)]
+        for attribute in _OPERATION_VIEW_ATTRIBUTES
+    ]
+    stubs = _describe_schema_value(getattr(view, '_schema_stubs', None), serializers)
+    return [view.__doc__ or '', handlers, attributes, stubs]
+
+
+def _describe_schema_value(value, serializers):
+    """
+    Describe a piece of schema metadata as JSON-serializable data that doesn't vary between processes.
+
+    Serializers (and serializer classes) are described by their fields,
+    and the descriptions of serializer classes are memoized in ``serializers``.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, Promise):
+        # Lazy summaries and descriptions, which would otherwise be described by their repr.
+        return str(value)
+    if isinstance(value, QuerySet):
+        # The repr of a queryset would query the database.
+        return ['queryset', _qualified_name(value.model)]
+    if isinstance(value, dict):
+        return [
+            [str(key), _describe_schema_value(item, serializers)]
+            for key, item in sorted(value.items(), key=lambda item: str(item[0]))
+        ]
+    if isinstance(value, (list, tuple)):
+        return [_describe_schema_value(item, serializers) for item in value]
+    if isinstance(value, type) and issubclass(value, BaseSerializer):
+        return _describe_serializer_class(value, serializers)
+    if isinstance(value, BaseSerializer):
+        return _describe_field(value, serializers)
+    return _stable_repr(value)
+
+
+def _describe_serializer_class(serializer_class, serializers):
+    """
+    Describe a serializer class by a hash of its declared fields and Meta options, without instantiating it.
+    """
+    if serializer_class not in serializers:
+        # Stand in for the description while it's being built, in case the serializer refers to itself.
+        serializers[serializer_class] = _qualified_name(serializer_class)
+        meta = getattr(serializer_class, 'Meta', None)
+        serializers[serializer_class] = _hash([
+            _qualified_name(serializer_class),
+            serializer_class.__doc__ or '',
+            [
+                [name, _describe_field(field, serializers)]
+                for name, field in getattr(serializer_class, '_declared_fields', {}).items()
+            ],
+            _describe_schema_value(
+                {name: option for name, option in vars(meta).items() if not name.startswith('_')} if meta else {},
+                serializers,
+            ),
+        ])
+    return serializers[serializer_class]
+
+
+def _describe_field(field, serializers):
+    """
+    Describe a serializer field (or nested serializer) by its class and the arguments it was created with.
+    """
+    if isinstance(field, BaseSerializer) and hasattr(field, 'child'):
+        # A ListSerializer, created by passing many=True to its child's class.
+        return ['many', _describe_field(field.child, serializers)]
+    if isinstance(field, BaseSerializer):
+        field_class = _describe_serializer_class(type(field), serializers)
+    else:
+        field_class = _qualified_name(type(field))
+    return [
+        field_class,
+        _describe_schema_value(getattr(field, '_args', ()), serializers),
+        _describe_schema_value(getattr(field, '_kwargs', {}), serializers),
+    ]
+
+
+def _stable_repr(value):
+    """
+    Return the repr of a value, without the memory addresses that vary between processes.
+    """
+    return _MEMORY_ADDRESS_RE.sub('', repr(value))
+
+
+def _qualified_name(obj):
+    """
+    Return the dotted path of a class or function (or of the class of any other object).
+    """
+    if not hasattr(obj, '__qualname__'):
+        obj = type(obj)
+    return f'{obj.__module__}.{obj.__qualname__}'
+
+
+def _hash(data):
+    """
+    Return a short, stable hash of JSON-serializable data.
+    """
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:32]
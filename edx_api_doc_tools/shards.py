@@ -0,0 +1,176 @@
+"""
+Slicing of OpenAPI specs into smaller, self-contained specs (shards).
+
+External users: you should not usually need to use this module directly;
+:func:`.get_docs_urls` routes the docs data view's shard URLs for you.
+"""
+import bisect
+import json
+
+
+# Keys of a Swagger path item that aren't operations.
+_PATH_ITEM_NON_OPERATION_KEYS = ('$ref', 'parameters')
+
+# Prefix of a ref to a definition.
+_DEFINITION_REF_PREFIX = '#/definitions/'
+
+
+class SpecIndex:
+    """
+    An index of a full spec by tag and by path, for slicing it into shards.
+
+    Building the index walks the spec once, recording which operations have
+    each tag and which definitions each operation and definition refers to.
+    After that, a shard only costs a lookup in the index, plus copying the
+    paths and definitions it includes.
+
+    A compact index doesn't keep the spec's operations and definitions as
+    plain data, but as their rendered JSON, which takes a fraction of the memory.
+    Only the ones that a shard includes are parsed again, when building it.
+    """
+
+    def __init__(self, spec, compact=False):
+        """
+        Index a spec.
+
+        Arguments:
+            spec (dict): A full spec, as plain data (like the parsed ``swagger.json``).
+            compact (bool): Whether to keep the spec's operations and definitions as JSON.
+        """
+        self.compact = compact
+        base_path = (spec.get('basePath') or '').rstrip('/')
+        paths = spec.get('paths') or {}
+        # Sorted pairs of full paths (including the basePath) and their keys in the spec.
+        self.full_paths = sorted((base_path + path, path) for path in paths)
+        self.path_positions = {path: position for position, path in enumerate(paths)}
+        self.tag_operations = {}
+        self.operation_refs = {}
+        for path, path_item in paths.items():
+            for method, operation in _iter_operations(path_item):
+                for tag in operation.get('tags') or ():
+                    self.tag_operations.setdefault(tag, []).append((path, method))
+                self.operation_refs[(path, method)] = _find_refs(operation)
+            self.operation_refs[(path, None)] = _find_refs(path_item.get('parameters'))
+        self.definition_refs = {
+            name: _find_refs(definition) for name, definition in (spec.get('definitions') or {}).items()
+        }
+        if compact:
+            spec = dict(spec)
+            spec['paths'] = {
+                path: {key: _freeze(value) for key, value in path_item.items()}
+                for path, path_item in paths.items()
+            }
+            if 'definitions' in spec:
+                spec['definitions'] = {name: _freeze(value) for name, value in spec['definitions'].items()}
+        self.spec = spec
+
+    def get_tag_shard(self, tag):
+        """
+        Return a spec with only the operations that have a tag, or None if no operation has it.
+        """
+        operations = self.tag_operations.get(tag)
+        if not operations:
+            return None
+        return self._make_shard(operations)
+
+    def get_path_prefix_shard(self, path_prefix):
+        """
+        Return a spec with only the paths under a prefix, or None if there are none.
+
+        The prefix is a full path (including the spec's basePath), like "/api/courses",
+        and only matches whole path segments: it includes "/api/courses/v1/" but not "/api/coursesv1/".
+        """
+        path_prefix = '/' + path_prefix.strip('/')
+        start = bisect.bisect_left(self.full_paths, (path_prefix,))
+        operations = []
+        for full_path, path in self.full_paths[start:]:
+            if not full_path.startswith(path_prefix):
+                break
+            if full_path == path_prefix or full_path[len(path_prefix):].startswith('/') or path_prefix == '/':
+                operations.extend((path, method) for method, _ in _iter_operations(self.spec['paths'][path]))
+        if not operations:
+            return None
+        return self._make_shard(operations)
+
+    def _make_shard(self, operations):
+        """
+        Return a copy of the spec with only some operations, and only the definitions they need.
+
+        Arguments:
+            operations (list[tuple[str, str]]): (path, method) pairs of the operations to include.
+        """
+        spec_paths = self.spec['paths']
+        thaw = json.loads if self.compact else _identity
+        included_operations = set(operations)
+        # Keep paths, and operations within them, in the same order as in the full spec.
+        paths = {
+            path: {
+                key: thaw(value) for key, value in spec_paths[path].items()
+                if key in _PATH_ITEM_NON_OPERATION_KEYS or (path, key) in included_operations
+            }
+            for path in sorted({path for path, _ in operations}, key=self.path_positions.get)
+        }
+
+        needed_definitions = set()
+        stack = []
+        for path, method in operations:
+            stack.extend(self.operation_refs[(path, method)])
+            stack.extend(self.operation_refs[(path, None)])
+        while stack:
+            name = stack.pop()
+            if name not in needed_definitions and name in self.definition_refs:
+                needed_definitions.add(name)
+                stack.extend(self.definition_refs[name])
+
+        shard = {}
+        for key, value in self.spec.items():
+            if key == 'paths':
+                shard[key] = paths
+            elif key == 'definitions':
+                definitions = {name: thaw(value[name]) for name in value if name in needed_definitions}
+                if definitions:
+                    shard[key] = definitions
+            else:
+                shard[key] = value
+        return shard
+
+
+def _iter_operations(path_item):
+    """
+    Iterate over the (method, operation) pairs of a path item.
+    """
+    for method, operation in path_item.items():
+        if method not in _PATH_ITEM_NON_OPERATION_KEYS:
+            yield method, operation
+
+
+def _find_refs(obj):
+    """
+    Return the names of the definitions that part of a spec refers to directly.
+    """
+    refs = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            ref = item.get('$ref')
+            if isinstance(ref, str) and ref.startswith(_DEFINITION_REF_PREFIX):
+                refs.add(ref[len(_DEFINITION_REF_PREFIX):])
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return refs
+
+
+def _freeze(value):
+    """
+    Render part of a spec to compact JSON bytes, for a compact index to keep.
+    """
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+def _identity(value):
+    """
+    Return a value as it is.
+    """
+    return value
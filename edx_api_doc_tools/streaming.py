@@ -0,0 +1,188 @@
+"""
+Incremental rendering of OpenAPI specs.
+
+External users: you should not usually need to use this module directly;
+set OPENAPI_STREAMING_RESPONSES to have the API docs views use it.
+"""
+import json
+
+from drf_yasg.codecs import YamlDumper
+from drf_yasg.openapi import SwaggerDict
+from yaml.events import (
+    DocumentEndEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+    StreamStartEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+
+# Top-level keys of a spec whose values are rendered one entry at a time.
+# Between them, these hold nearly all of a large spec.
+STREAMED_KEYS = ('paths', 'definitions')
+
+
+def iter_spec_chunks(spec, spec_format):
+    """
+    Render a generated spec to bytes incrementally.
+
+    The concatenated chunks are identical to ``SchemaProvider.render(spec, spec_format)``,
+    but only one path or definition at a time is converted to plain data and
+    serialized, so the whole serialized spec is never held in memory at once.
+
+    Arguments:
+        spec (openapi.Swagger): The generated spec.
+        spec_format (str): 'json' or 'yaml'.
+
+    Returns: iterator of bytes
+    """
+    if spec_format == 'json':
+        chunks = _iter_json_chunks(spec)
+    else:
+        chunks = _iter_yaml_chunks(spec)
+    for chunk in chunks:
+        if chunk:
+            yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+def _iter_items(obj):
+    """
+    Iterate over the items of a part of a spec, converted to plain data lazily.
+
+    Items are in the same order, and converted the same way, as by ``SwaggerDict.as_dict``.
+    """
+    items = obj.items()
+    if not isinstance(obj, dict):
+        items = sorted(items)
+    for key, value in items:
+        yield _as_data(key), value
+
+
+def _as_data(obj):
+    """
+    Convert part of a spec to plain data (dicts, lists, strings and so on), like ``SwaggerDict.as_dict``.
+    """
+    return SwaggerDict._as_dict(obj, {})  # pylint: disable=protected-access
+
+
+def _iter_json_chunks(spec):
+    """
+    Render a spec to JSON like drf_yasg's OpenAPICodecJson (without ``pretty``), one piece at a time.
+    """
+    def dumps(obj):
+        return json.dumps(_as_data(obj), ensure_ascii=False)
+
+    yield '{'
+    for index, (key, value) in enumerate(_iter_items(spec)):
+        yield f'{", " if index else ""}{dumps(key)}: '
+        if key in STREAMED_KEYS and isinstance(value, dict):
+            yield '{'
+            for entry_index, (entry_key, entry_value) in enumerate(_iter_items(value)):
+                yield f'{", " if entry_index else ""}{dumps(entry_key)}: {dumps(entry_value)}'
+            yield '}'
+        else:
+            yield dumps(value)
+    yield '}'
+
+
+def _iter_yaml_chunks(spec):
+    """
+    Render a spec to YAML like drf_yasg's OpenAPICodecYaml, one piece at a time.
+
+    The spec is fed to the same dumper that drf_yasg uses as a series of YAML events,
+    and whatever the dumper has written out is yielded after each path or definition.
+    """
+    output = _ChunkBuffer()
+    dumper = YamlDumper(
+        output,
+        default_flow_style=False,
+        encoding='utf-8',
+        allow_unicode=True,
+        sort_keys=False,
+    )
+    try:
+        dumper.emit(StreamStartEvent(encoding='utf-8'))
+        dumper.emit(DocumentStartEvent(explicit=False))
+        dumper.emit(_mapping_start_event(dumper))
+        for key, value in _iter_items(spec):
+            _emit_node(dumper, dumper.represent_data(key))
+            if key in STREAMED_KEYS and isinstance(value, dict):
+                dumper.emit(_mapping_start_event(dumper))
+                for entry_key, entry_value in _iter_items(value):
+                    _emit_node(dumper, dumper.represent_data(entry_key))
+                    _emit_node(dumper, dumper.represent_data(_as_data(entry_value)))
+                    yield output.drain()
+                dumper.emit(MappingEndEvent())
+            else:
+                _emit_node(dumper, dumper.represent_data(_as_data(value)))
+            yield output.drain()
+        dumper.emit(MappingEndEvent())
+        dumper.emit(DocumentEndEvent(explicit=False))
+        dumper.emit(StreamEndEvent())
+    finally:
+        dumper.dispose()
+    yield output.drain()
+
+
+class _ChunkBuffer:
+    """
+    A write-only stream that collects what is written to it until it's drained.
+    """
+
+    def __init__(self):
+        """
+        Create an empty buffer.
+        """
+        self.chunks = []
+
+    def write(self, data):
+        """
+        Add data to the buffer.
+        """
+        self.chunks.append(data)
+
+    def drain(self):
+        """
+        Return everything written since the last drain, and empty the buffer.
+        """
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _mapping_start_event(dumper):
+    """
+    Return the event that starts a block mapping, as the dumper would emit for a dict.
+    """
+    tag = 'tag:yaml.org,2002:map'
+    implicit = tag == dumper.resolve(MappingNode, [], True)
+    return MappingStartEvent(None, tag, implicit, flow_style=False)
+
+
+def _emit_node(dumper, node):
+    """
+    Emit the events for a represented node, like PyYAML's Serializer does when there are no aliases.
+    """
+    if isinstance(node, ScalarNode):
+        detected_tag = dumper.resolve(ScalarNode, node.value, (True, False))
+        default_tag = dumper.resolve(ScalarNode, node.value, (False, True))
+        implicit = (node.tag == detected_tag, node.tag == default_tag)
+        dumper.emit(ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+    elif isinstance(node, SequenceNode):
+        implicit = node.tag == dumper.resolve(SequenceNode, node.value, True)
+        dumper.emit(SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+        for item in node.value:
+            _emit_node(dumper, item)
+        dumper.emit(SequenceEndEvent())
+    elif isinstance(node, MappingNode):
+        implicit = node.tag == dumper.resolve(MappingNode, node.value, True)
+        dumper.emit(MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+        for key, value in node.value:
+            _emit_node(dumper, key)
+            _emit_node(dumper, value)
+        dumper.emit(MappingEndEvent())
@@ -2,12 +2,28 @@
 Utilities for annotating API views with schema info.
 
 External users: import these from __init__.
+
+drf_yasg is only imported when a decorator is applied,
+so that importing these decorators is cheap. Likewise, docstrings and
+descriptions are only processed when a spec is generated, not when the
+decorators are applied.
+
+The class decorators attach schema metadata to a copy of the method in the
+decorated class, rather than wrapping it, so that documented views handle
+requests exactly as fast as undocumented ones. Those that exclude methods
+from the docs add them to the registry in ``exclusions``, which the schema
+generators check before inspecting any endpoint. All of them record the
+methods they document or exclude for ``doc_coverage``.
 """
+import inspect
+import types
+
 from django.utils.decorators import method_decorator
-from drf_yasg.utils import swagger_auto_schema
-from rest_framework.viewsets import ViewSet
+from django.utils.functional import lazy
 
-from .internal_utils import dedent, split_docstring
+from .doc_coverage import documented_functions, excluded_functions
+from .exclusions import registry as exclusion_registry
+from .internal_utils import dedent, get_operation_docs
 
 
 def schema_for(method_name, docstring=None, **schema_kwargs):
@@ -35,14 +51,7 @@ def schema_for(method_name, docstring=None, **schema_kwargs):
         """
         Decorate a view class with the specified schema.
         """
-        summary, description = split_docstring(docstring)
-        decorated_class = method_decorator(
-            name=method_name,
-            decorator=schema(
-                summary=summary, description=description, **schema_kwargs
-            ),
-        )(view_class)
-        return decorated_class
+        return _decorate_method(view_class, method_name, _schema(docstrings=(docstring,), **schema_kwargs))
     return schema_for_inner
 
 
@@ -67,9 +76,9 @@ def exclude_schema_for(*method_names):
         Decorate a view class to exclude specified methods.
         """
         for method_name in method_names:
-            method_decorator(
-                name=method_name, decorator=exclude_schema
-            )(view_class)
+            if not callable(getattr(view_class, method_name, None)):
+                raise ValueError(f"{view_class.__name__} has no method {method_name!r} to exclude from the API docs.")
+        exclusion_registry.exclude_view(view_class, method_names)
         return view_class
     return exclude_schema_for_inner
 
@@ -81,24 +90,16 @@ def exclude_schema_for_all(view_class):
     Arguments:
         view_class (type): A type, typically a subclass of View or ViewSet.
 
+    Subclasses are excluded too, except for the methods that they define.
+
     Example::
 
         @exclude_schema_for_all
         class MyView(RetrieveUpdateDestroyAPIView):
             pass
     """
-    all_viewset_api_methods = {
-        'list', 'retrieve', 'create', 'update', 'partial_update', 'destroy'
-    }
-    all_view_api_methods = {
-        'get', 'post', 'put', 'patch', 'delete'
-    }
-    is_viewset = issubclass(view_class, ViewSet)
-    all_api_methods = all_viewset_api_methods if is_viewset else all_view_api_methods
-    methods_to_exclude = {
-        method for method in all_api_methods if hasattr(view_class, method)
-    }
-    return exclude_schema_for(*methods_to_exclude)(view_class)
+    exclusion_registry.exclude_view(view_class)
+    return view_class
 
 
 def schema(
@@ -130,16 +131,35 @@ def schema(
             If None, we attempt to extract it from the rest of the docstring.
         request_body (Serializer): Optional serializer class corresponding to the body of the request.
     """
+    return _schema(body, parameters, responses, summary, description)
+
+
+def _schema(body=None, parameters=None, responses=None, summary=None, description=None, docstrings=None):
+    """
+    Decorate an API-endpoint-handling function to specify its schema; see :func:`.schema`.
+
+    ``docstrings`` are the docstrings to take the summary and description from,
+    in order of precedence; by default, the function's own docstring.
+    """
     for param in parameters or ():
-        param.description = dedent(param.description)
+        # Parameters shared between operations may already have a lazy description.
+        if isinstance(param.get('description'), str):
+            param.description = _lazy_dedent(param.description)
 
     def schema_inner(view_func):
         """
         Decorate a view function with the specified schema.
         """
-        docstring_summary, docstring_description = split_docstring(view_func.__doc__)
-        final_summary = summary or docstring_summary
-        final_description = description or docstring_description or final_summary
+        from drf_yasg.utils import swagger_auto_schema  # pylint: disable=import-outside-toplevel
+
+        operation_docstrings = (view_func.__doc__,) if docstrings is None else docstrings
+        if any(operation_docstrings):
+            final_summary = _lazy_operation_summary(summary, description, *operation_docstrings)
+            final_description = _lazy_operation_description(summary, description, *operation_docstrings)
+        else:
+            final_summary = summary
+            final_description = description or summary
+        documented_functions.add(view_func)
         return swagger_auto_schema(
             request_body=body,
             manual_parameters=parameters,
@@ -150,6 +170,56 @@ def schema(
     return schema_inner
 
 
+def _decorate_method(view_class, method_name, decorator):
+    """
+    Apply a schema decorator to a method of a view class, which may be inherited.
+
+    The decorator is applied to a copy of the method's function, which is set on
+    the view class (so that the class's bases are left as they were). Methods
+    that aren't plain functions fall back to ``method_decorator``, which wraps
+    them in a function that applies the decorator on every call.
+    """
+    method = inspect.getattr_static(view_class, method_name, None)
+    if not isinstance(method, types.FunctionType):
+        return method_decorator(name=method_name, decorator=decorator)(view_class)
+    copied_method = types.FunctionType(
+        method.__code__, method.__globals__, method.__name__, method.__defaults__, method.__closure__,
+    )
+    copied_method.__kwdefaults__ = method.__kwdefaults__
+    copied_method.__qualname__ = method.__qualname__
+    copied_method.__module__ = method.__module__
+    copied_method.__doc__ = method.__doc__
+    copied_method.__annotations__ = method.__annotations__
+    # Keep attributes like the routing of DRF's @action, but not the schema of the original method.
+    copied_method.__dict__.update(
+        (name, value) for name, value in method.__dict__.items() if name != '_swagger_auto_schema'
+    )
+    setattr(view_class, method_name, decorator(copied_method))
+    return view_class
+
+
+def _get_operation_summary(*args):
+    """
+    Return the summary of an operation; see ``get_operation_docs``.
+    """
+    return get_operation_docs(*args)[0]
+
+
+def _get_operation_description(*args):
+    """
+    Return the description of an operation; see ``get_operation_docs``.
+    """
+    return get_operation_docs(*args)[1]
+
+
+# Lazy versions of the functions above, whose results are strings that are
+# only computed when they are used. They must only be called with at least one
+# docstring, so that the summary and description they compute aren't None.
+_lazy_operation_summary = lazy(_get_operation_summary, str)
+_lazy_operation_description = lazy(_get_operation_description, str)
+_lazy_dedent = lazy(dedent, str)
+
+
 def exclude_schema(view_func):
     """
     Decorate an API-endpoint-handling function to exclude it from the API docs.
@@ -166,6 +236,9 @@ def exclude_schema(view_func):
             def post(...):
                 pass
     """
+    from drf_yasg.utils import swagger_auto_schema  # pylint: disable=import-outside-toplevel
+
+    excluded_functions.add(view_func)
     return swagger_auto_schema(auto_schema=None)(view_func)
 
 
@@ -174,3 +247,78 @@ def is_schema_request(request):
     Return whether this request is serving an OpenAPI schema.
     """
     return request.query_params.get('format') == 'openapi'
+
+
+def schema_stubs(queryset=None, serializer_class=None, **hooks):
+    """
+    Decorate a view class to stub out its expensive hooks while the API docs are generated.
+
+    drf_yasg calls hooks like ``get_queryset`` and ``get_serializer_class`` on
+    the views it inspects, which may hit the database or other services.
+    Rather than checking :func:`.is_schema_request` in each of them, declare
+    what they should return while the docs are generated. The schema generators
+    in this package replace those hooks on the views that they create to inspect
+    (which drf_yasg flags with ``swagger_fake_view``), so views that handle
+    requests are left as they are. Subclasses inherit the stubs.
+
+    Arguments:
+        queryset (QuerySet or Model): ``get_queryset`` returns ``queryset.none()``,
+            or an empty queryset of the model. Anything else is returned as-is.
+        serializer_class (type): ``get_serializer_class`` returns this serializer class.
+        **hooks: Other methods of the view, like ``get_permissions``,
+            mapped to what they should return, whatever their arguments.
+
+    Example::
+
+        @schema_stubs(queryset=Hedgehog, serializer_class=HedgehogSerializer, get_serializer_context={})
+        class HedgehogViewSet(ModelViewSet):
+            ...
+    """
+    stubs = dict(hooks)
+    if queryset is not None:
+        stubs['get_queryset'] = queryset
+    if serializer_class is not None:
+        stubs['get_serializer_class'] = serializer_class
+
+    def schema_stubs_inner(view_class):
+        """
+        Decorate a view class with the specified stubs.
+        """
+        for name in stubs:
+            if not callable(getattr(view_class, name, None)):
+                raise ValueError(f"{view_class.__name__} has no method {name!r} to stub out.")
+        view_class._schema_stubs = {**getattr(view_class, '_schema_stubs', {}), **stubs}
+        return view_class
+    return schema_stubs_inner
+
+
+def _stub_schema_hooks(view):
+    """
+    Replace the hooks of a view that is being inspected with the stubs declared by :func:`.schema_stubs`.
+    """
+    for name, value in getattr(view, '_schema_stubs', {}).items():
+        if name == 'get_queryset':
+            value = _empty_queryset(value)
+        setattr(view, name, _make_stub(value))
+    return view
+
+
+def _empty_queryset(queryset):
+    """
+    Return an empty queryset like ``queryset``, which may also be a model class; or anything else as it is.
+    """
+    if hasattr(queryset, 'none'):
+        return queryset.none()
+    manager = getattr(queryset, '_default_manager', None)
+    if manager is not None:
+        return manager.none()
+    return queryset
+
+
+def _make_stub(value):
+    """
+    Make a function that returns ``value``, whatever its arguments.
+    """
+    def stub(*args, **kwargs):  # pylint: disable=unused-argument
+        return value
+    return stub
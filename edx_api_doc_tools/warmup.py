@@ -0,0 +1,154 @@
+"""
+Generating and caching API specs in the background when a process starts.
+
+This module is imported by ``EdxApiDocToolsConfig.ready``, so it only imports
+drf-yasg and the schema providers once a warmup actually runs.
+"""
+import logging
+import os
+import sys
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.urls import set_script_prefix
+
+
+log = logging.getLogger(__name__)
+
+# Management commands that serve requests, and so may be warmed up.
+SERVER_COMMANDS = ('runserver',)
+
+# Servers that run Django's WSGI or ASGI application, and so may be warmed up.
+SERVER_PROGRAMS = ('gunicorn', 'uwsgi', 'uvicorn', 'daphne', 'hypercorn', 'waitress-serve')
+
+# Programs that run management commands.
+MANAGEMENT_PROGRAMS = ('manage.py', 'django-admin', 'django-admin.py', '__main__.py')
+
+
+def get_docs_warmup():
+    """
+    Return OPENAPI_WARMUP setting, or False if it's not defined.
+
+    If True, each process that serves requests generates (and caches) the spec
+    behind each docs view in a background thread shortly after it starts, so
+    that the first visitor to the docs doesn't have to wait for it.
+    """
+    return getattr(settings, 'OPENAPI_WARMUP', False)
+
+
+def get_docs_warmup_delay():
+    """
+    Return OPENAPI_WARMUP_DELAY setting, or 5 if it's not defined.
+
+    This is how many seconds after startup the warmup begins, which leaves the
+    process to finish starting up and serve its first requests undisturbed.
+    """
+    return getattr(settings, 'OPENAPI_WARMUP_DELAY', 5)
+
+
+def get_docs_warmup_urls():
+    """
+    Return OPENAPI_WARMUP_URLS setting, or an empty list if it's not defined.
+
+    These are the absolute URLs (like "https://courses.example.com") that specs
+    are warmed up for. Cached specs are keyed by the scheme and host they were
+    requested through, so list each one that the docs are served from. If there
+    are none, the spec is warmed up without a host, which only matches requests
+    if drf-yasg's ``DEFAULT_API_URL`` is set.
+    """
+    return getattr(settings, 'OPENAPI_WARMUP_URLS', [])
+
+
+def get_docs_warmup_programs():
+    """
+    Return OPENAPI_WARMUP_PROGRAMS setting, or ``SERVER_PROGRAMS`` if it's not defined.
+
+    These are the names of the programs (like "gunicorn") whose processes serve
+    requests, and so warm up specs. Other processes, like Celery workers and
+    scripts, only import the docs views, and never warm up.
+    """
+    return getattr(settings, 'OPENAPI_WARMUP_PROGRAMS', SERVER_PROGRAMS)
+
+
+def is_warmup_allowed():
+    """
+    Return whether this process should warm up specs.
+
+    Warmups only run in processes of the servers in OPENAPI_WARMUP_PROGRAMS
+    and in the process of ``runserver`` that actually serves requests;
+    never under pytest, nor in a gunicorn master that preloads the application
+    before forking its workers.
+    """
+    if 'pytest' in sys.modules:
+        return False
+    argv = sys.argv or ['']
+    program = os.path.basename(argv[0])
+    if program not in MANAGEMENT_PROGRAMS:
+        # A thread started before the fork doesn't run in the workers that serve requests.
+        return program in get_docs_warmup_programs() and '--preload' not in argv
+    if not any(command in argv[1:] for command in SERVER_COMMANDS):
+        return False
+    # With autoreloading, runserver serves requests from a child process.
+    return '--noreload' in argv or os.environ.get('RUN_MAIN') == 'true'
+
+
+def start_warmup():
+    """
+    Start warming up specs in a background thread, if warmups are enabled and allowed in this process.
+
+    Returns: the thread, which is a daemon so that it never delays shutdown, or None.
+    """
+    if not get_docs_warmup() or not is_warmup_allowed():
+        return None
+    thread = threading.Timer(get_docs_warmup_delay(), warm_up_specs)
+    thread.name = 'edx-api-doc-tools-warmup'
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def warm_up_specs(urlconf=None):
+    """
+    Generate and cache the spec behind each docs view in the URLconf, unless it's already cached or prebuilt.
+
+    Docs views whose specs aren't cached are skipped, since their specs would be
+    generated again for each request anyway. Errors are logged, not raised.
+
+    Returns: number of specs warmed up.
+    """
+    # Import here, so that starting the app doesn't import drf-yasg.
+    from .schema_provider import get_schema_providers  # pylint: disable=import-outside-toplevel
+    warmed_up = 0
+    try:
+        set_script_prefix(getattr(settings, 'FORCE_SCRIPT_NAME', None) or '/')
+        requests = [make_warmup_request(url) for url in get_docs_warmup_urls()] or [None]
+        for provider in get_schema_providers(urlconf):
+            if provider.cache_timeout == 0:
+                log.info("Not warming up the '%s' docs, which aren't cached.", provider.api_info.title)
+                continue
+            for request in requests:
+                try:
+                    provider.get_spec('json', request)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Failed to warm up the '%s' docs.", provider.api_info.title)
+                else:
+                    warmed_up += 1
+    except Exception:  # pylint: disable=broad-except
+        log.exception("Failed to find the API docs to warm up.")
+    finally:
+        connections.close_all()
+    log.info("Warmed up %d API specs.", warmed_up)
+    return warmed_up
+
+
+def make_warmup_request(url):
+    """
+    Make a request for the spec, through the scheme and host of an absolute URL.
+    """
+    # Import here, so that starting the app doesn't import DRF.
+    from django.test import RequestFactory  # pylint: disable=import-outside-toplevel
+    from rest_framework.request import Request  # pylint: disable=import-outside-toplevel
+    parts = urlsplit(url)
+    return Request(RequestFactory().get('/', HTTP_HOST=parts.netloc, secure=parts.scheme == 'https'))
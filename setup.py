@@ -162,6 +162,8 @@ setup(
     url="https://github.com/openedx/api-doc-tools",
     packages=[
         "edx_api_doc_tools",
+        "edx_api_doc_tools.management",
+        "edx_api_doc_tools.management.commands",
     ],
     include_package_data=True,
     install_requires=load_requirements("requirements/base.in"),
@@ -0,0 +1,30 @@
+"""
+A view whose schema is translated to the active language, for testing per-language generation and caching.
+"""
+
+from django.utils import translation
+from django.utils.functional import lazy
+from rest_framework import serializers
+from rest_framework.generics import GenericAPIView
+
+from edx_api_doc_tools import schema
+
+
+class TranslatedSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    A serializer whose help text is translated to the active language.
+    """
+    name = serializers.CharField(help_text=lazy(lambda: f'lang={translation.get_language()}', str)())
+
+
+class TranslatedView(GenericAPIView):
+    """
+    A view that uses the translated serializer.
+    """
+    serializer_class = TranslatedSerializer
+
+    @schema()
+    def get(self, request):
+        """
+        Get a name.
+        """
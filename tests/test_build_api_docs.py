@@ -0,0 +1,116 @@
+"""
+Tests for prebuilding spec files and serving them from the docs views.
+"""
+
+import json
+import os.path
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils.http import http_date
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info, make_docs_data_view, make_docs_urls
+from example import urls as example_urls
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class BuildApiDocsTests(SimpleTestCase):
+    """
+    Test the ``build_api_docs`` management command and serving of the files it writes.
+    """
+    maxDiff = None
+
+    path_of_expected_schema = os.path.join(os.path.dirname(__file__), 'expected_schema.json')
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self.spec_dir = temp_dir.name
+
+    def get_spec(self, view, spec_format):
+        """
+        Call a docs data view and return the response.
+        """
+        request = APIRequestFactory().get(f'/swagger.{spec_format}')
+        response = view(request, format=f'.{spec_format}')
+        if hasattr(response, 'render'):
+            # Generated specs come back as DRF responses that still need rendering.
+            response.render()
+        return response
+
+    def test_build_api_docs(self):
+        call_command('build_api_docs', output_dir=self.spec_dir, url='http://testserver')
+        assert sorted(os.listdir(self.spec_dir)) == ['swagger.json', 'swagger.yaml']
+        with open(os.path.join(self.spec_dir, 'swagger.json'), encoding='utf-8') as spec_file:
+            actual_schema = json.load(spec_file)
+        with open(self.path_of_expected_schema, encoding='utf-8') as schema_file:
+            expected_schema = json.load(schema_file)
+        assert actual_schema == expected_schema
+
+    def test_build_api_docs_needs_output_dir(self):
+        with pytest.raises(CommandError, match='--output-dir'):
+            call_command('build_api_docs')
+
+    def test_serve_prebuilt_spec(self):
+        call_command('build_api_docs', output_dir=self.spec_dir)
+        with open(os.path.join(self.spec_dir, 'swagger.json'), 'rb') as spec_file:
+            prebuilt_json = spec_file.read()
+        view = make_docs_data_view(make_api_info(), spec_dir=self.spec_dir)
+        response = self.get_spec(view, 'json')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json; charset=utf-8'
+        assert response.content == prebuilt_json
+        # The prebuilt spec has no host, unlike a spec generated for a request.
+        assert 'host' not in json.loads(response.content)
+
+    def test_docs_with_prebuilt_spec_never_generate(self):
+        call_command('build_api_docs', output_dir=self.spec_dir)
+        docs_views = {
+            pattern.name: pattern.callback for pattern in make_docs_urls(make_api_info(), spec_dir=self.spec_dir)
+        }
+        with patch.object(ApiSchemaGenerator, 'get_schema') as mock_get_schema:
+            for _ in range(2):
+                assert docs_views['apidocs-ui'](APIRequestFactory().get('/api-docs/')).status_code == 200
+            ui_data_response = docs_views['apidocs-ui'](APIRequestFactory().get('/api-docs/', {'format': 'openapi'}))
+            assert ui_data_response.status_code == 200
+            assert self.get_spec(docs_views['apidocs-data'], 'yaml').status_code == 200
+        assert not mock_get_schema.called
+
+    def test_prebuilt_spec_not_modified(self):
+        call_command('build_api_docs', output_dir=self.spec_dir)
+        view = make_docs_data_view(make_api_info(), spec_dir=self.spec_dir)
+        response = self.get_spec(view, 'json')
+        last_modified = os.path.getmtime(os.path.join(self.spec_dir, 'swagger.json'))
+        assert response['Last-Modified'] == http_date(last_modified)
+        request = APIRequestFactory().get('/swagger.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert view(request, format='.json').status_code == 304
+
+    def test_derive_yaml_from_prebuilt_json(self):
+        call_command('build_api_docs', output_dir=self.spec_dir)
+        yaml_path = os.path.join(self.spec_dir, 'swagger.yaml')
+        with open(yaml_path, 'rb') as spec_file:
+            prebuilt_yaml = spec_file.read()
+        os.remove(yaml_path)
+        view = make_docs_data_view(make_api_info(), spec_dir=self.spec_dir)
+        assert self.get_spec(view, 'yaml').content == prebuilt_yaml
+
+    def test_fall_back_to_generation(self):
+        call_command('build_api_docs', output_dir=self.spec_dir)
+        os.remove(os.path.join(self.spec_dir, 'swagger.json'))
+        os.remove(os.path.join(self.spec_dir, 'swagger.yaml'))
+        view = make_docs_data_view(make_api_info(), spec_dir=self.spec_dir)
+        response = self.get_spec(view, 'yaml')
+        assert response.status_code == 200
+        assert b'host: testserver' in response.content
+
+    @override_settings(OPENAPI_SPEC_DIR='/nonexistent/spec/dir')
+    def test_spec_dir_setting(self):
+        view = make_docs_data_view(make_api_info())
+        assert view.cls.schema_provider.spec_dir == '/nonexistent/spec/dir'
+        assert self.get_spec(view, 'json').status_code == 200
@@ -0,0 +1,108 @@
+"""
+Tests for the documentation coverage report.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import path
+from rest_framework.views import APIView
+
+from edx_api_doc_tools import ApiSchemaGenerator, exclude_schema, get_docs_coverage, make_api_info, schema
+from edx_api_doc_tools.doc_coverage import DOCUMENTED, EXCLUDED, UNDOCUMENTED
+from example import urls as example_urls
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class DocsCoverageTests(SimpleTestCase):
+    """
+    Test reporting which endpoints are documented.
+    """
+
+    def test_coverage(self):
+        coverage = {(endpoint.method, endpoint.path): endpoint for endpoint in get_docs_coverage()}
+        statuses = {key: endpoint.status for key, endpoint in coverage.items()}
+        assert statuses == {
+            ('GET', '/api/hedgehog/v0/hogs/'): DOCUMENTED,
+            ('POST', '/api/hedgehog/v0/hogs/'): DOCUMENTED,
+            ('GET', '/api/hedgehog/v0/hogs/{hedgehog_key}/'): DOCUMENTED,
+            ('PUT', '/api/hedgehog/v0/hogs/{hedgehog_key}/'): EXCLUDED,
+            ('PATCH', '/api/hedgehog/v0/hogs/{hedgehog_key}/'): EXCLUDED,
+            ('DELETE', '/api/hedgehog/v0/hogs/{hedgehog_key}/'): DOCUMENTED,
+            ('GET', '/api/hedgehog/v0/info'): DOCUMENTED,
+            ('PUT', '/api/hedgehog/v0/info'): DOCUMENTED,
+            ('PATCH', '/api/hedgehog/v0/info'): EXCLUDED,
+            ('DELETE', '/api/hedgehog/v0/info'): UNDOCUMENTED,
+            ('GET', '/api/hedgehog/v0/undoc-view'): EXCLUDED,
+            ('GET', '/api/hedgehog/v0/undoc-viewset/{pk}/'): EXCLUDED,
+        }
+        assert coverage[('PUT', '/api/hedgehog/v0/hogs/{hedgehog_key}/')].view_name == (
+            'example.views.HedgehogViewSet.update'
+        )
+
+    def test_coverage_matches_generated_spec(self):
+        spec = ApiSchemaGenerator(make_api_info()).get_schema(public=True)
+        generated = {
+            (method.upper(), f'/api{spec_path}')
+            for spec_path, operations in spec['paths'].items()
+            for method in operations if method != 'parameters'
+        }
+        coverage = get_docs_coverage()
+        assert generated == {
+            (endpoint.method, endpoint.path) for endpoint in coverage if endpoint.status != EXCLUDED
+        }
+
+    @override_settings(OPENAPI_EXCLUDED_PATH_PREFIXES=['/api/hedgehog/v0/hogs/{hedgehog_key}/'])
+    def test_coverage_matches_spec_with_parameterized_exclusion(self):
+        self.test_coverage_matches_generated_spec()
+
+    @override_settings(OPENAPI_EXCLUDED_VIEWS=['example.views.HedgehogInfoView.delete'])
+    def test_coverage_exclusion_settings(self):
+        statuses = {(endpoint.method, endpoint.path): endpoint.status for endpoint in get_docs_coverage()}
+        assert statuses[('DELETE', '/api/hedgehog/v0/info')] == EXCLUDED
+
+    def test_coverage_command(self):
+        output = StringIO()
+        call_command('api_docs_coverage', stdout=output)
+        lines = output.getvalue().splitlines()
+        assert lines[0] == (
+            'edX Hedgehog Service API: 6 documented, 5 excluded, 1 undocumented endpoints (85.7% documented)'
+        )
+        assert lines[1].split() == [
+            'undocumented', 'DELETE', '/api/hedgehog/v0/info', 'example.views.HedgehogInfoView.delete',
+        ]
+        assert len(lines) == 2
+        output = StringIO()
+        call_command('api_docs_coverage', '--all', '--fail-under', '80', stdout=output)
+        assert len(output.getvalue().splitlines()) == 13
+        with pytest.raises(CommandError, match=r"Less than 90% .* 'edX Hedgehog Service API' \(85.7%\)"):
+            call_command('api_docs_coverage', '--fail-under', '90', stdout=StringIO())
+
+
+class CoveredView(APIView):
+    """
+    A view with a documented, an excluded and an undocumented method.
+    """
+
+    @schema()
+    def get(self, request):
+        """
+        Get the thing.
+        """
+
+    @exclude_schema
+    def post(self, request):
+        pass
+
+    def put(self, request):
+        pass
+
+
+def test_coverage_of_patterns():
+    patterns = [path('covered/', CoveredView.as_view())]
+    statuses = {endpoint.method: endpoint.status for endpoint in get_docs_coverage(patterns)}
+    assert statuses == {'GET': DOCUMENTED, 'POST': EXCLUDED, 'PUT': UNDOCUMENTED}
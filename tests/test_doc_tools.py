@@ -4,6 +4,7 @@ Tests for API docs tooling.
 
 import json
 import os.path
+import types
 from unittest.mock import patch
 
 import pytest
@@ -11,11 +12,30 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.test import SimpleTestCase
 from django.test.utils import override_settings
+from django.urls import path
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
 
+from edx_api_doc_tools import (
+    ApiSchemaGenerator,
+    conf_utils,
+    exclude_schema_for,
+    exclusions,
+    internal_utils,
+    make_api_info,
+    make_docs_urls,
+    query_parameter,
+    schema,
+    schema_for,
+    schema_stubs,
+)
 from edx_api_doc_tools.apps import EdxApiDocToolsConfig
-from edx_api_doc_tools.internal_utils import split_docstring
+from edx_api_doc_tools.internal_utils import get_operation_docs, split_docstring
+from edx_api_doc_tools.schema_provider import get_schema_providers
 from example import urls as example_urls
 from example import urls_with_pattern as test_pattern_urls
+from example.serializers import HedgehogSerializer
 
 
 @override_settings(ROOT_URLCONF=example_urls.__name__)
@@ -119,6 +139,81 @@ def test_split_docstring(docstring, summary, description):
     assert actual_description == description
 
 
+@pytest.mark.parametrize("summary, description, docstrings, expected", [
+    (None, None, (None, None), (None, None)),
+    ("Summary.", None, ("Docstring.\n\nDescription.",), ("Summary.", "Description.")),
+    (None, None, ("First.", "Second.\n\nDescription."), ("First.", "Description.")),
+    (None, "Description.", ("Docstring.\n\nOther.",), ("Docstring.", "Description.")),
+    (None, None, ("Docstring.",), ("Docstring.", "Docstring.")),
+])
+def test_get_operation_docs(summary, description, docstrings, expected):
+    assert get_operation_docs(summary, description, *docstrings) == expected
+
+
+def test_schema_processes_docstrings_lazily():
+    parameter = query_parameter('page', int, """
+        Page number.
+    """)
+
+    def view_func(request):
+        """
+        Get a page.
+
+        Of results.
+        """
+    with patch.object(internal_utils, 'split_docstring', wraps=split_docstring) as mock_split_docstring:
+        schema(parameters=[parameter])(view_func)
+        # Parameters may be shared between views.
+        schema(parameters=[parameter])(lambda request: None)
+        mock_split_docstring.assert_not_called()
+        overrides = view_func._swagger_auto_schema  # pylint: disable=protected-access
+        assert overrides['operation_summary'] == "Get a page."
+        assert overrides['operation_description'] == "Of results."
+        mock_split_docstring.assert_called()
+    assert parameter.description == "Page number.\n"
+
+
+class BaseViewSet(ViewSet):
+    """
+    A ViewSet whose methods are documented by its subclasses.
+    """
+
+    def list(self, request):  # pylint: disable=unused-argument
+        """
+        Not part of the docs.
+        """
+        return 'list'
+
+    def create(self, request):  # pylint: disable=unused-argument
+        return super().create(request)
+
+
+def test_schema_for_copies_method():
+    @schema_for('list', "List the objects.")
+    @exclude_schema_for('create')
+    class DocumentedViewSet(BaseViewSet):
+        pass
+
+    @schema_for('list', "List other objects.")
+    class OtherViewSet(DocumentedViewSet):
+        pass
+
+    # pylint: disable=no-member,protected-access
+    for viewset_class in (DocumentedViewSet, OtherViewSet):
+        method = vars(viewset_class)['list']
+        assert isinstance(method, types.FunctionType)
+        assert method.__code__ is BaseViewSet.list.__code__
+        assert viewset_class().list(None) == 'list'
+    assert not hasattr(BaseViewSet.list, '_swagger_auto_schema')
+    assert DocumentedViewSet.list._swagger_auto_schema['operation_summary'] == "List the objects."
+    assert DocumentedViewSet.list._swagger_auto_schema['operation_description'] == "List the objects."
+    assert OtherViewSet.list._swagger_auto_schema['operation_summary'] == "List other objects."
+    assert exclusions.registry.is_method_excluded(DocumentedViewSet, 'create')
+    # The copied method still calls the methods of BaseViewSet's bases.
+    with pytest.raises(AttributeError):
+        DocumentedViewSet().create(None)
+
+
 class AppConfigTests(SimpleTestCase):
     """
     Tests for EdxApiDocToolsConfig.
@@ -182,3 +277,86 @@ class DocViewPatternTests(SimpleTestCase):
             "did not match schema loaded from expected_schema_with_patterns.json."
             .format(os.path.relpath(self.path_of_actual_schema))
         )
+
+
+class LazyDocsUrlsTests(SimpleTestCase):
+    """
+    Test docs URLs whose views are only built when they are first requested.
+    """
+
+    def test_lazy_docs_urls(self):
+        with patch.object(conf_utils, 'make_schema_provider', wraps=conf_utils.make_schema_provider) as mock_make:
+            docs_urls = make_docs_urls(make_api_info(title="Lazy Hedgehog API"), lazy=True)
+            assert not mock_make.called
+
+            class LazyUrls:
+                urlpatterns = [
+                    pattern for pattern in example_urls.urlpatterns
+                    if not (pattern.name or '').startswith('apidocs')
+                ] + docs_urls
+
+            with override_settings(ROOT_URLCONF=LazyUrls):
+                data_response = self.client.get('/swagger.json')
+                ui_response = self.client.get('/api-docs/')
+                providers = get_schema_providers()
+            mock_make.assert_called_once()
+        assert data_response.status_code == ui_response.status_code == 200
+        assert '<title>Lazy Hedgehog API</title>' in ui_response.content.decode('utf-8')
+        with override_settings(ROOT_URLCONF=example_urls.__name__):
+            assert data_response.json()['paths'] == self.client.get('/swagger.json').json()['paths']
+        assert [provider.api_info.title for provider in providers] == ["Lazy Hedgehog API"]
+
+
+@schema_stubs(queryset=[], serializer_class=HedgehogSerializer, get_serializer_context={})
+class ExpensiveView(GenericAPIView):
+    """
+    A view whose hooks can't be called while the API docs are generated.
+    """
+
+    def get_queryset(self):
+        raise RuntimeError("Queried the database.")
+
+    def get_serializer_class(self):
+        raise RuntimeError("Called a remote service.")
+
+    def get_serializer_context(self):
+        raise RuntimeError("Called a remote service.")
+
+    def get(self, request):
+        """
+        Get a hedgehog.
+        """
+        return Response(self.get_serializer(self.get_queryset()).data)
+
+
+class SchemaStubsTests(SimpleTestCase):
+    """
+    Test that the hooks declared with ``schema_stubs`` are stubbed out while generating the API docs.
+    """
+
+    def test_stubs(self):
+        generator = ApiSchemaGenerator(make_api_info(), patterns=[path('api/expensive/', ExpensiveView.as_view())])
+        endpoints = generator.get_endpoints(None)
+        (_, view), = endpoints['/api/expensive/'][1]
+        assert view.get_queryset() == []
+        assert view.get_serializer_class() is HedgehogSerializer
+        spec = generator.get_schema(public=True)
+        assert spec['paths']['/expensive/']['get']['responses']['200']['schema']['items'] == {
+            '$ref': '#/definitions/Hedgehog',
+        }
+        # Views that handle requests are left as they are.
+        with pytest.raises(RuntimeError):
+            ExpensiveView().get_queryset()
+
+    def test_inherited_stubs(self):
+        @schema_stubs(get_serializer_context={'stubbed': True})
+        class ChildView(ExpensiveView):
+            pass
+
+        assert ChildView._schema_stubs == {  # pylint: disable=no-member
+            'get_queryset': [],
+            'get_serializer_class': HedgehogSerializer,
+            'get_serializer_context': {'stubbed': True},
+        }
+        with pytest.raises(ValueError, match="no method 'get_nothing'"):
+            schema_stubs(get_nothing=None)(ChildView)
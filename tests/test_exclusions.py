@@ -0,0 +1,175 @@
+"""
+Tests for excluding views, view methods and paths from the API docs.
+"""
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import include, path
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+from edx_api_doc_tools import (
+    ApiSchemaGenerator,
+    exclude_paths,
+    exclude_schema_for,
+    exclude_schema_for_all,
+    make_api_info,
+)
+from edx_api_doc_tools.exclusions import ExclusionRegistry, get_exclusions, registry
+from edx_api_doc_tools.generators import PrefixEndpointEnumerator
+from example import urls as example_urls
+from example.views import HedgehogInfoView, HedgehogViewSet
+
+
+class BaseView(APIView):
+    """
+    A view to exclude methods of.
+    """
+
+    def get(self, request):
+        pass
+
+    def post(self, request):
+        pass
+
+
+class ChildView(BaseView):
+    """
+    A subclass that overrides one of the excluded methods.
+    """
+
+    def post(self, request):
+        pass
+
+
+def test_exclusions_are_inherited():
+    exclusions = ExclusionRegistry()
+    exclusions.exclude_view(BaseView, ['get', 'post'])
+    assert exclusions.is_method_excluded(BaseView, 'get')
+    assert exclusions.is_method_excluded(ChildView, 'get')
+    assert not exclusions.is_method_excluded(ChildView, 'post')
+    assert not exclusions.is_method_excluded(APIView, 'get')
+    exclusions.exclude_view(ChildView)
+    assert exclusions.is_method_excluded(ChildView, 'post')
+    assert not exclusions.is_method_excluded(BaseView, 'put')
+
+
+def test_exclude_schema_decorators():
+    @exclude_schema_for('list')
+    class PartlyExcludedViewSet(ViewSet):
+        def list(self, request):
+            pass
+
+        def create(self, request):
+            pass
+
+    @exclude_schema_for_all
+    class ExcludedViewSet(PartlyExcludedViewSet):
+        pass
+
+    class DocumentedViewSet(ExcludedViewSet):
+        def create(self, request):
+            pass
+
+    assert registry.is_method_excluded(PartlyExcludedViewSet, 'list')
+    assert not registry.is_method_excluded(PartlyExcludedViewSet, 'create')
+    assert registry.is_method_excluded(ExcludedViewSet, 'create')
+    assert not registry.is_method_excluded(DocumentedViewSet, 'create')
+    # The methods themselves are left as they were.
+    assert not hasattr(PartlyExcludedViewSet.list, '_swagger_auto_schema')
+    with pytest.raises(ValueError, match="has no method 'retrieve'"):
+        exclude_schema_for('retrieve')(PartlyExcludedViewSet)
+
+
+def test_exclusions_see_later_decorators():
+    exclusions = get_exclusions()
+
+    @exclude_schema_for('get')
+    class LaterView(BaseView):
+        pass
+
+    assert exclusions.is_method_excluded(LaterView, 'get')
+    assert not exclusions.is_method_excluded(LaterView, 'post')
+    exclude_schema_for_all(LaterView)
+    assert exclusions.is_method_excluded(LaterView, 'post')
+
+
+@override_settings(
+    OPENAPI_EXCLUDED_VIEWS=['example.views.HedgehogInfoView', 'example.views.HedgehogViewSet.destroy'],
+    OPENAPI_EXCLUDED_PATH_PREFIXES=['/api/internal/'],
+)
+def test_exclusion_settings():
+    exclusions = get_exclusions()
+    assert exclusions.is_method_excluded(HedgehogInfoView, 'get')
+    assert exclusions.is_method_excluded(HedgehogViewSet, 'destroy')
+    assert not exclusions.is_method_excluded(HedgehogViewSet, 'list')
+    assert exclusions.is_path_excluded('/api/internal/things/')
+    assert not registry.is_path_excluded('/api/internal/things/')
+
+
+@pytest.mark.parametrize('view_path', ['example.views.Missing', 'example.views.HedgehogViewSet.missing'])
+def test_exclusion_settings_errors(view_path):
+    with override_settings(OPENAPI_EXCLUDED_VIEWS=[view_path]):
+        with pytest.raises(ImproperlyConfigured, match=view_path.rpartition('.')[2]):
+            get_exclusions()
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class ExcludedEndpointsTests(SimpleTestCase):
+    """
+    Test that excluded endpoints are skipped before their views are created.
+    """
+
+    def get_endpoints(self, patterns=None):
+        """
+        Return the paths and methods of the endpoints that get documented, and those whose views were created.
+        """
+        generator = ApiSchemaGenerator(make_api_info(), patterns=patterns)
+        with patch.object(generator, 'create_view', wraps=generator.create_view) as mock_create_view:
+            endpoints = generator.get_endpoints(None)
+        created = sorted((call.args[1], call.args[0].cls.__name__) for call in mock_create_view.call_args_list)
+        documented = sorted(
+            (path, method) for path, (_, methods) in endpoints.items() for method, _ in methods
+        )
+        return documented, created
+
+    def test_skip_excluded_views(self):
+        documented, created = self.get_endpoints()
+        assert ('GET', 'HedgehogUndocumentedViewset') not in created
+        assert ('GET', 'HedgehogUndocumentedView') not in created
+        # exclude_schema_for('update', 'partial_update')
+        assert ('PUT', 'HedgehogViewSet') not in created
+        assert ('/api/hedgehog/v0/hogs/{hedgehog_key}/', 'GET') in documented
+        assert not any('undoc' in endpoint_path for endpoint_path, _ in documented)
+
+    @override_settings(OPENAPI_EXCLUDED_VIEWS=['example.views.HedgehogViewSet.list'])
+    def test_exclusion_settings(self):
+        documented, _ = self.get_endpoints()
+        assert ('/api/hedgehog/v0/hogs/', 'GET') not in documented
+        assert ('/api/hedgehog/v0/hogs/', 'POST') in documented
+
+    @override_settings(OPENAPI_EXCLUDED_PATH_PREFIXES=['/api/hedgehog/v0/hogs/{hedgehog_key}/'])
+    def test_exclude_parameterized_path(self):
+        documented, _ = self.get_endpoints()
+        assert not any(endpoint_path.startswith('/api/hedgehog/v0/hogs/{') for endpoint_path, _ in documented)
+        assert ('/api/hedgehog/v0/hogs/', 'GET') in documented
+
+    def test_exclude_paths(self):
+        info_view = HedgehogInfoView.as_view()
+        patterns = [
+            path('api/internal/', include([path('info', info_view)])),
+            path('api/hedgehog/info', info_view),
+        ]
+        with patch.object(registry, 'path_prefixes', ()):
+            exclude_paths('/api/internal/')
+            enumerator = PrefixEndpointEnumerator(patterns, exclusions=get_exclusions())
+            with patch.object(
+                enumerator, 'should_include_endpoint', wraps=enumerator.should_include_endpoint
+            ) as mock_should_include_endpoint:
+                endpoint_paths = {endpoint[0] for endpoint in enumerator.get_api_endpoints()}
+        assert endpoint_paths == {'/api/hedgehog/info'}
+        # The excluded subtree isn't even descended into.
+        assert [call.args[0] for call in mock_should_include_endpoint.call_args_list] == ['/api/hedgehog/info']
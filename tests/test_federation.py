@@ -0,0 +1,215 @@
+"""
+Tests for merging the specs of several services into one federated spec.
+"""
+
+import json
+import os.path
+import tempfile
+from unittest.mock import patch
+
+import pytest
+import yaml
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import ServiceSpec, make_api_info, make_federated_docs_urls, merge_specs
+
+
+EXPECTED_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'expected_schema.json')
+
+
+def make_spec(paths, definitions, **fields):
+    """
+    Make a minimal spec of a service.
+    """
+    return {'swagger': '2.0', 'info': {'title': "Service", 'version': 'v1'}, **fields,
+            'paths': paths, 'definitions': definitions}
+
+
+def ref(name):
+    """
+    Make a ref to a definition.
+    """
+    return {'$ref': f'#/definitions/{name}'}
+
+
+COUNTRY = {'type': 'object', 'properties': {'code': {'type': 'string'}}}
+OTHER_COUNTRY = {'type': 'object', 'properties': {'iso_code': {'type': 'string'}}}
+ADDRESS = {'type': 'object', 'properties': {'country': ref('Country')}}
+USER = {'type': 'object', 'properties': {'username': {'type': 'string'}}}
+
+LMS_SPEC = make_spec(
+    {'/users/': {
+        'get': {'operationId': 'users_list', 'tags': ['users'], 'responses': {'200': {'schema': ref('User')}}},
+    }},
+    {'User': USER, 'Address': ADDRESS, 'Country': COUNTRY},
+    basePath='/api', consumes=['application/json'], produces=['application/json'],
+    securityDefinitions={'Basic': {'type': 'basic'}}, security=[{'Basic': []}],
+    tags=[{'name': 'users', 'description': "LMS users."}],
+)
+STUDIO_SPEC = make_spec(
+    {'/addresses/': {
+        'parameters': [],
+        'get': {'operationId': 'addresses_list', 'tags': ['users'], 'responses': {'200': {'schema': ref('Address')}}},
+        'post': {'operationId': 'addresses_create', 'consumes': ['multipart/form-data'], 'responses': {}},
+    }},
+    {'User': USER, 'Address': ADDRESS, 'Country': OTHER_COUNTRY},
+    basePath='/', consumes=['application/x-www-form-urlencoded'], produces=['application/json'],
+    securityDefinitions={'Basic': {'type': 'apiKey', 'name': 'Authorization', 'in': 'header'}},
+    security=[{'Basic': []}],
+    tags=[{'name': 'users', 'description': "Studio users."}],
+)
+SERVICES = [ServiceSpec('lms', 'lms.json', path_prefix=''), ServiceSpec('studio', 'studio.json')]
+
+
+def test_merge_specs():
+    merged = merge_specs({'title': "Open edX APIs", 'version': 'v1'}, list(zip(SERVICES, [LMS_SPEC, STUDIO_SPEC])))
+    assert merged['info'] == {'title': "Open edX APIs", 'version': 'v1'}
+    assert list(merged['paths']) == ['/api/users/', '/studio/addresses/']
+    # Identical definitions are shared; Address conflicts through the Country it refers to.
+    assert merged['definitions'] == {
+        'User': USER,
+        'Address': ADDRESS,
+        'Country': COUNTRY,
+        'studio.Address': {'type': 'object', 'properties': {'country': ref('studio.Country')}},
+        'studio.Country': OTHER_COUNTRY,
+    }
+    assert merged['securityDefinitions'] == {
+        'Basic': LMS_SPEC['securityDefinitions']['Basic'],
+        'studio.Basic': STUDIO_SPEC['securityDefinitions']['Basic'],
+    }
+    assert merged['produces'] == ['application/json']
+    assert 'consumes' not in merged and 'security' not in merged
+    assert merged['tags'] == [{'name': 'users', 'description': "LMS users."}]
+
+    lms_operation = merged['paths']['/api/users/']['get']
+    assert lms_operation['consumes'] == ['application/json']
+    assert lms_operation['security'] == [{'Basic': []}]
+    addresses = merged['paths']['/studio/addresses/']
+    assert addresses['parameters'] == []
+    assert addresses['get']['responses']['200']['schema'] == ref('studio.Address')
+    assert addresses['get']['consumes'] == ['application/x-www-form-urlencoded']
+    assert addresses['get']['security'] == [{'studio.Basic': []}]
+    assert addresses['post']['consumes'] == ['multipart/form-data']
+    # The input specs are left as they were.
+    assert STUDIO_SPEC['paths']['/addresses/']['get']['responses']['200']['schema'] == ref('Address')
+
+
+def test_merge_identical_specs():
+    with open(EXPECTED_SCHEMA_PATH, encoding='utf-8') as spec_file:
+        spec = json.load(spec_file)
+    services = [ServiceSpec('lms', 'lms.json'), ServiceSpec('studio', 'studio.json')]
+    merged = merge_specs(spec['info'], [(service, spec) for service in services])
+    assert len(merged['paths']) == 2 * len(spec['paths'])
+    assert '/studio/api/hedgehog/v0/hogs/' in merged['paths']
+    assert merged['definitions'] == spec['definitions']
+    assert merged['consumes'] == spec['consumes']
+
+
+def test_merge_path_conflict():
+    services = [ServiceSpec('lms', 'lms.json', path_prefix='/'), ServiceSpec('studio', 'studio.json', '/')]
+    with pytest.raises(ValueError, match="Both the 'lms' and 'studio' services have the path /api/users/"):
+        merge_specs({}, [(services[0], LMS_SPEC), (services[1], LMS_SPEC)])
+
+
+def test_cyclic_definitions():
+    tree = {'type': 'object', 'properties': {'children': {'type': 'array', 'items': ref('Tree')}}}
+    other_tree = {**tree, 'title': "Other"}
+    merged = merge_specs({}, [
+        (ServiceSpec('lms', 'lms.json'), make_spec({}, {'Tree': tree})),
+        (ServiceSpec('studio', 'studio.json'), make_spec({}, {'Tree': tree})),
+        (ServiceSpec('discovery', 'discovery.json'), make_spec({}, {'Tree': other_tree})),
+    ])
+    assert merged['definitions'] == {
+        'Tree': tree,
+        'discovery.Tree': {**other_tree, 'properties': {'children': {'type': 'array', 'items': ref('discovery.Tree')}}},
+    }
+
+
+class FederatedDocsTests(SimpleTestCase):
+    """
+    Test the ``merge_api_docs`` management command and the federated docs views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.lms_path = os.path.join(self.temp_dir, 'lms.json')
+        with open(self.lms_path, 'w', encoding='utf-8') as spec_file:
+            json.dump(LMS_SPEC, spec_file)
+        self.studio_path = os.path.join(self.temp_dir, 'studio.yaml')
+        with open(self.studio_path, 'w', encoding='utf-8') as spec_file:
+            yaml.safe_dump(STUDIO_SPEC, spec_file)
+        self.output_dir = os.path.join(self.temp_dir, 'federated')
+
+    def get_spec(self, view, spec_format, **kwargs):
+        """
+        Call a docs data view and return the parsed spec.
+        """
+        response = view(APIRequestFactory().get(f'/swagger.{spec_format}'), format=f'.{spec_format}', **kwargs)
+        assert response.status_code == 200
+        return yaml.safe_load(response.content)
+
+    def test_merge_api_docs(self):
+        call_command(
+            'merge_api_docs', f'lms={self.lms_path}', f'studio={self.studio_path}',
+            prefix=['lms=/'], output_dir=self.output_dir, title="Federated API", url='https://api.example.com',
+        )
+        assert sorted(os.listdir(self.output_dir)) == ['swagger.json', 'swagger.yaml']
+        with open(os.path.join(self.output_dir, 'swagger.json'), encoding='utf-8') as spec_file:
+            merged = json.load(spec_file)
+        with open(os.path.join(self.output_dir, 'swagger.yaml'), encoding='utf-8') as spec_file:
+            assert yaml.safe_load(spec_file) == merged
+        assert merged['info']['title'] == "Federated API"
+        assert (merged['host'], merged['schemes']) == ('api.example.com', ['https'])
+        assert list(merged['paths']) == ['/api/users/', '/studio/addresses/']
+
+    def test_merge_api_docs_json_only(self):
+        call_command('merge_api_docs', f'lms={self.lms_path}', output_dir=self.output_dir)
+        call_command('merge_api_docs', f'studio={self.studio_path}', output_dir=self.output_dir, json_only=True)
+        # The YAML spec of the first run is gone, so it can't be served instead of the new spec.
+        assert os.listdir(self.output_dir) == ['swagger.json']
+        docs_views = {
+            pattern.name: pattern.callback
+            for pattern in make_federated_docs_urls(make_api_info(), [], self.output_dir)
+        }
+        assert list(self.get_spec(docs_views['apidocs-data'], 'yaml')['paths']) == ['/studio/addresses/']
+
+    def test_merge_api_docs_errors(self):
+        with pytest.raises(CommandError, match="Expected NAME=PATH"):
+            call_command('merge_api_docs', self.lms_path, output_dir=self.output_dir)
+        with pytest.raises(CommandError, match="unknown services: studio"):
+            call_command('merge_api_docs', f'lms={self.lms_path}', prefix=['studio=/'], output_dir=self.output_dir)
+        with pytest.raises(CommandError, match="have the path /api/users/"):
+            call_command('merge_api_docs', f'a={self.lms_path}', f'b={self.lms_path}',
+                         prefix=['a=/', 'b=/'], output_dir=self.output_dir)
+
+    def test_federated_docs_views(self):
+        services = [ServiceSpec('lms', self.lms_path, path_prefix=''), ServiceSpec('studio', self.studio_path)]
+        docs_views = {
+            pattern.name: pattern.callback
+            for pattern in make_federated_docs_urls(make_api_info(title="Federated API"), services, self.output_dir)
+        }
+        data_view = docs_views['apidocs-data']
+        merged = self.get_spec(data_view, 'json')
+        assert merged['info']['title'] == "Federated API"
+        assert list(merged['paths']) == ['/api/users/', '/studio/addresses/']
+        assert self.get_spec(data_view, 'yaml') == merged
+        shard = self.get_spec(docs_views['apidocs-data-path-prefix'], 'json', path_prefix='studio')
+        assert list(shard['paths']) == ['/studio/addresses/']
+        assert set(shard['definitions']) == {'studio.Address', 'studio.Country'}
+
+        # The UI page is rendered without generating a schema for this service's own URLconf.
+        with patch.object(OpenAPISchemaGenerator, 'get_schema') as mock_get_schema:
+            ui_response = docs_views['apidocs-ui'](APIRequestFactory().get('/api-docs/'))
+            assert '<title>Federated API</title>' in ui_response.rendered_content.decode('utf-8')
+        assert not mock_get_schema.called
+
+        # build_api_docs writes the merged spec, which is then served as it is.
+        data_view.cls.schema_provider.write_spec_files()
+        with open(os.path.join(self.output_dir, 'swagger.json'), encoding='utf-8') as spec_file:
+            assert json.load(spec_file) == merged
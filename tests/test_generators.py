@@ -0,0 +1,222 @@
+"""
+Tests for the schema generators.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import include, path, re_path
+from django.utils import translation
+
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info
+from edx_api_doc_tools.generators import PrefixEndpointEnumerator, _get_serializer_key
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from example import urls as example_urls
+from example.serializers import HedgehogSerializer
+from example.views import HedgehogInfoView, HedgehogViewSet
+from test_utils.translated import TranslatedView
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class OperationReuseTests(SimpleTestCase):
+    """
+    Test that generated operations are reused by later generations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        ApiSchemaGenerator._operation_cache.clear()  # pylint: disable=protected-access
+
+    def generate(self):
+        """
+        Generate the example API's schema, returning the generator and the rendered schema.
+        """
+        generator = ApiSchemaGenerator(make_api_info())
+        return generator, SchemaProvider.render(generator.get_schema(public=True), 'json')
+
+    def test_reuse_operations(self):
+        first_generator, first_schema = self.generate()
+        assert first_generator.operations_reused == 0
+        assert first_generator.operations_rebuilt == 8
+        second_generator, second_schema = self.generate()
+        assert second_generator.operations_reused == 8
+        assert second_generator.operations_rebuilt == 0
+        assert second_schema == first_schema
+
+    def test_rebuild_changed_operation(self):
+        self.generate()
+        with patch.dict(HedgehogViewSet.list._swagger_auto_schema, operation_summary="Fetch hogs."):
+            generator, schema = self.generate()
+        assert generator.operations_reused == 7
+        assert generator.operations_rebuilt == 1
+        assert b'"summary": "Fetch hogs."' in schema
+
+    def test_bounded_cache(self):
+        with patch('edx_api_doc_tools.generators.OPERATION_CACHE_SIZE', 5):
+            _, first_schema = self.generate()
+            assert len(ApiSchemaGenerator._operation_cache) <= 5  # pylint: disable=protected-access
+            generator, second_schema = self.generate()
+            assert len(ApiSchemaGenerator._operation_cache) <= 5  # pylint: disable=protected-access
+        assert generator.operations_rebuilt > 0
+        assert second_schema == first_schema
+
+    def test_reuse_per_language(self):
+        patterns = [path('api/translated/', TranslatedView.as_view())]
+        schemas = {}
+        for language in ('en', 'fr', 'en'):
+            with translation.override(language):
+                generator = ApiSchemaGenerator(make_api_info(), patterns=patterns)
+                schemas[language] = SchemaProvider.render(generator.get_schema(public=True), 'json')
+        assert b'lang=en' in schemas['en']
+        assert b'lang=fr' in schemas['fr']
+        # The last generation, in English again, reused the first one's operation.
+        assert generator.operations_reused == 1
+
+    @override_settings(OPENAPI_REUSE_OPERATIONS=False)
+    def test_reuse_disabled(self):
+        self.generate()
+        generator, _ = self.generate()
+        assert generator.operations_reused == 0
+        assert not ApiSchemaGenerator._operation_cache  # pylint: disable=protected-access
+
+    @override_settings(OPENAPI_COMPACT_SPECS=True)
+    def test_compact_operations(self):
+        first_generator, first_schema = self.generate()
+        operation_cache = ApiSchemaGenerator._operation_cache  # pylint: disable=protected-access
+        # The other cached operation is the one excluded from the schema by exclude_schema.
+        assert sum(isinstance(operation, bytes) for operation, _ in operation_cache.values()) == 7
+        second_generator, second_schema = self.generate()
+        assert second_generator.operations_reused == 8
+        assert second_schema == first_schema
+        yaml_schemas = [
+            SchemaProvider.render(generator.get_schema(public=True), 'yaml')
+            for generator in (first_generator, second_generator)
+        ]
+        assert yaml_schemas[0] == yaml_schemas[1]
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__, OPENAPI_REUSE_OPERATIONS=False)
+class ParallelGenerationTests(SimpleTestCase):
+    """
+    Test that generating operations in a thread pool gives the same schema as generating them sequentially.
+    """
+
+    def generate(self, spec_format='json'):
+        """
+        Generate and render the example API's schema.
+        """
+        generator = ApiSchemaGenerator(make_api_info(), url='http://testserver')
+        return SchemaProvider.render(generator.get_schema(public=True), spec_format)
+
+    def test_same_as_sequential(self):
+        sequential_json, sequential_yaml = self.generate(), self.generate('yaml')
+        with override_settings(OPENAPI_GENERATION_WORKERS=4):
+            with patch('edx_api_doc_tools.generators.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_executor:
+                assert self.generate() == sequential_json
+                assert self.generate('yaml') == sequential_yaml
+        mock_executor.assert_called_with(max_workers=4)
+
+    @override_settings(OPENAPI_GENERATION_WORKERS=4)
+    def test_close_worker_connections(self):
+        closing_threads = set()
+        with patch('edx_api_doc_tools.generators.connections') as mock_connections:
+            mock_connections.close_all.side_effect = lambda: closing_threads.add(threading.get_ident())
+            self.generate()
+        assert closing_threads
+        assert threading.get_ident() not in closing_threads
+
+    @override_settings(OPENAPI_GENERATION_WORKERS=4, OPENAPI_REUSE_OPERATIONS=True)
+    def test_count_operations(self):
+        ApiSchemaGenerator._operation_cache.clear()  # pylint: disable=protected-access
+        generator = ApiSchemaGenerator(make_api_info())
+        generator.get_schema(public=True)
+        assert generator.operations_rebuilt == 8
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__, OPENAPI_REUSE_OPERATIONS=False)
+class SerializerMemoTests(SimpleTestCase):
+    """
+    Test that serializers are only inspected once per generation.
+    """
+
+    def generate(self):
+        """
+        Generate the example API's schema, returning the generator and the rendered schema.
+        """
+        generator = ApiSchemaGenerator(make_api_info(), url='http://testserver')
+        return generator, SchemaProvider.render(generator.get_schema(public=True), 'json')
+
+    def test_memoize_serializers(self):
+        generator, schema = self.generate()
+        # HedgehogSerializer is inspected once, and its schema reused by the other 5 endpoints that use it.
+        assert generator.serializer_memo_misses == 1
+        assert generator.serializer_memo_hits == 5
+        with override_settings(OPENAPI_MEMOIZE_SERIALIZERS=False):
+            unmemoized_generator, unmemoized_schema = self.generate()
+        assert unmemoized_schema == schema
+        assert unmemoized_generator.serializer_memo_hits == 0
+        # Each generation starts with an empty memo.
+        generator.get_schema(public=True)
+        assert generator.serializer_memo_misses == 2
+
+    def test_serializer_key(self):
+        key = _get_serializer_key(HedgehogSerializer())
+        assert _get_serializer_key(HedgehogSerializer(context={'request': None})) == key
+        assert _get_serializer_key(HedgehogSerializer(partial=True)) != key
+        assert _get_serializer_key(HedgehogSerializer(help_text="A hog.")) != key
+        list_key = _get_serializer_key(HedgehogSerializer(many=True))
+        assert list_key == _get_serializer_key(HedgehogSerializer(many=True))
+        assert list_key != key
+
+
+class EndpointPruningTests(SimpleTestCase):
+    """
+    Test that ApiSchemaGenerator doesn't enumerate URL patterns outside of /api/.
+    """
+    info_view = HedgehogInfoView.as_view()
+    patterns = [
+        path('api/hedgehog/', include([
+            path('info', info_view),
+            re_path(r'^(?P<version>v[0-9]+)/info$', info_view),
+        ])),
+        path('ap', include([path('i/info', info_view)])),
+        path('courses/', include([path('info', info_view)])),
+        re_path(r'^(?P<section>[a-z]+)/', include([path('info', info_view)])),
+        path('info', info_view),
+    ]
+
+    def enumerate_paths(self, path_prefixes):
+        """
+        Return the paths of the endpoints that get enumerated for some path prefixes, and all paths checked.
+        """
+        enumerator = PrefixEndpointEnumerator(self.patterns, path_prefixes=path_prefixes)
+        with patch.object(
+            enumerator, 'should_include_endpoint', wraps=enumerator.should_include_endpoint
+        ) as mock_should_include_endpoint:
+            endpoint_paths = sorted({endpoint[0] for endpoint in enumerator.get_api_endpoints()})
+        checked_paths = sorted(call.args[0] for call in mock_should_include_endpoint.call_args_list)
+        return endpoint_paths, checked_paths
+
+    def test_prune_enumeration(self):
+        endpoint_paths, checked_paths = self.enumerate_paths(['/api/'])
+        assert endpoint_paths == [
+            '/api/hedgehog/info',
+            '/api/hedgehog/{version}/info',
+            '/api/info',
+            '/{section}/info',
+        ]
+        assert checked_paths == endpoint_paths
+
+    def test_no_prefixes(self):
+        endpoint_paths, _ = self.enumerate_paths([])
+        assert len(endpoint_paths) == 6
+
+    @override_settings(OPENAPI_API_PATH_PREFIXES=['/api/hedgehog/', '/courses/'])
+    def test_path_prefixes_setting(self):
+        generator = ApiSchemaGenerator(make_api_info(), patterns=self.patterns)
+        endpoints = generator.get_endpoints(None)
+        assert sorted(endpoints) == ['/api/hedgehog/info', '/api/hedgehog/{version}/info', '/courses/info']
+        assert generator.determine_path_prefix(list(endpoints)) == '/'
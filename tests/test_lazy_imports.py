@@ -0,0 +1,63 @@
+"""
+Tests for the lazily imported public API of edx_api_doc_tools.
+"""
+
+import subprocess
+import sys
+
+import pytest
+from drf_yasg import openapi
+
+import edx_api_doc_tools
+from edx_api_doc_tools.data import _PARAM_TYPE_MAP, FILE_PARAM, ParameterLocation, parameter
+
+
+def run_python(code):
+    """
+    Run Python code in a fresh interpreter, and return what it prints.
+    """
+    return subprocess.run(
+        [sys.executable, '-c', code], check=True, capture_output=True, text=True,
+    ).stdout.split()
+
+
+def test_import_package():
+    output = run_python(
+        "import sys; import edx_api_doc_tools; "
+        "print(*(module for module in ['drf_yasg', 'rest_framework', 'django.urls'] if module in sys.modules))"
+    )
+    assert not output
+
+
+def test_import_decorators():
+    output = run_python(
+        "import sys; from edx_api_doc_tools import schema, schema_for, query_parameter; "
+        "print('drf_yasg' in sys.modules)"
+    )
+    assert output == ['False']
+
+
+def test_public_names():
+    for name in edx_api_doc_tools.__all__:
+        assert getattr(edx_api_doc_tools, name) is not None
+        assert name in dir(edx_api_doc_tools)
+    assert edx_api_doc_tools.openapi is openapi
+    with pytest.raises(AttributeError):
+        edx_api_doc_tools.nonexistent  # pylint: disable=no-member,pointless-statement
+
+
+def test_openapi_constants():
+    assert ParameterLocation.__ALL__ == {
+        openapi.IN_BODY, openapi.IN_PATH, openapi.IN_QUERY, openapi.IN_FORM, openapi.IN_HEADER,
+    }
+    assert (ParameterLocation.FORM, ParameterLocation.HEADER) == (openapi.IN_FORM, openapi.IN_HEADER)
+    assert _PARAM_TYPE_MAP == {
+        object: openapi.TYPE_OBJECT,
+        str: openapi.TYPE_STRING,
+        float: openapi.TYPE_NUMBER,
+        int: openapi.TYPE_INTEGER,
+        bool: openapi.TYPE_BOOLEAN,
+        list: openapi.TYPE_ARRAY,
+        FILE_PARAM: openapi.TYPE_FILE,
+    }
+    assert parameter('name', ParameterLocation.QUERY, int).type == openapi.TYPE_INTEGER
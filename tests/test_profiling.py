@@ -0,0 +1,72 @@
+"""
+Tests for profiling spec generation.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info, make_docs_data_view
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from example import urls as example_urls
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__, OPENAPI_REUSE_OPERATIONS=False)
+class GenerationProfilingTests(SimpleTestCase):
+    """
+    Test profiling of generated endpoints.
+    """
+
+    def generate(self):
+        """
+        Generate the example API's schema, returning the generator and the rendered schema.
+        """
+        generator = ApiSchemaGenerator(make_api_info())
+        return generator, SchemaProvider.render(generator.get_schema(public=True), 'json')
+
+    @override_settings(OPENAPI_PROFILE_GENERATION=True)
+    def test_profile(self):
+        generator, schema = self.generate()
+        profiles = {(profile.method, profile.path): profile for profile in generator.endpoint_profiles}
+        assert len(profiles) == 8
+        hogs_profile = profiles[('POST', '/api/hedgehog/v0/hogs/')]
+        assert 0 < hogs_profile.serializer_seconds <= hogs_profile.seconds
+        assert hogs_profile.exceptions == 0
+        # HedgehogInfoView has no serializer_class, so calling its get_serializer raises.
+        assert profiles[('GET', '/api/hedgehog/v0/info')].exceptions == 1
+        assert sum(profile.serializer_memo_hits for profile in profiles.values()) == generator.serializer_memo_hits
+        assert sum(profile.serializer_memo_misses for profile in profiles.values()) == 1
+        with override_settings(OPENAPI_PROFILE_GENERATION=False):
+            unprofiled_generator, unprofiled_schema = self.generate()
+        assert schema == unprofiled_schema
+        assert not unprofiled_generator.endpoint_profiles
+
+    @override_settings(OPENAPI_PROFILE_GENERATION=True, OPENAPI_REUSE_OPERATIONS=True)
+    def test_profile_reused_operations(self):
+        ApiSchemaGenerator._operation_cache.clear()  # pylint: disable=protected-access
+        first_generator, _ = self.generate()
+        second_generator, _ = self.generate()
+        assert not any(profile.reused for profile in first_generator.endpoint_profiles)
+        assert all(profile.reused for profile in second_generator.endpoint_profiles)
+
+    def test_profile_command(self):
+        output = StringIO()
+        call_command('profile_api_docs', top=3, stdout=output)
+        lines = output.getvalue().splitlines()
+        assert lines[0].startswith('edX Hedgehog Service API: 8 endpoints in ')
+        assert len(lines) == 5
+        assert lines[2].split()[-1].startswith('/api/hedgehog/v0/')
+
+    def test_server_timing(self):
+        view = make_docs_data_view(make_api_info())
+        response = view(APIRequestFactory().get('/swagger.json'), format='.json')
+        assert 'Server-Timing' not in response
+        with override_settings(OPENAPI_PROFILE_GENERATION=True):
+            response = view(APIRequestFactory().get('/swagger.json'), format='.json')
+        metrics = response['Server-Timing'].split(', ')
+        assert metrics[0].startswith('generate;dur=')
+        assert len(metrics) == 9
+        assert metrics[1].startswith('endpoint-1;desc="')
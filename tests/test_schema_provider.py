@@ -0,0 +1,379 @@
+"""
+Tests for the schema provider behind the API docs views.
+"""
+
+import gzip
+import json
+import subprocess
+import sys
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import path, resolve
+from django.utils import translation
+from django.utils.cache import has_vary_header
+from rest_framework.serializers import CharField
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info, make_docs_data_view, make_docs_urls
+from edx_api_doc_tools.schema_provider import CONTENT_ENCODINGS, SchemaProvider, brotli, choose_content_encoding
+from example import urls as example_urls
+from example.serializers import HedgehogSerializer
+from example.views import HedgehogViewSet
+from test_utils.translated import TranslatedView
+
+
+@override_settings(
+    ROOT_URLCONF=example_urls.__name__,
+    ALLOWED_HOSTS=['testserver', 'example.com'],
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'docs': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'docs'},
+    },
+    OPENAPI_CACHE_ALIAS='docs',
+    OPENAPI_CACHE_TIMEOUT=60,
+)
+class SchemaCacheTests(SimpleTestCase):
+    """
+    Test that generated specs are shared through the configured Django cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches['docs'].clear()
+        generate_patcher = patch.object(SchemaProvider, 'generate', autospec=True, side_effect=SchemaProvider.generate)
+        self.mock_generate = generate_patcher.start()
+        self.addCleanup(generate_patcher.stop)
+
+    def get_spec(self, view, host='testserver', spec_format='json'):
+        """
+        Call a docs data view and return the response content.
+        """
+        request = APIRequestFactory().get(f'/swagger.{spec_format}', HTTP_HOST=host)
+        response = view(request, format=f'.{spec_format}')
+        assert response.status_code == 200
+        return response.content
+
+    def test_views_share_cached_spec(self):
+        # Two views with the same API info stand in for two processes.
+        first_view = make_docs_data_view(make_api_info())
+        second_view = make_docs_data_view(make_api_info())
+        first_content = self.get_spec(first_view)
+        assert self.get_spec(second_view) == first_content
+        assert self.get_spec(first_view) == first_content
+        assert self.mock_generate.call_count == 1
+        assert json.loads(first_content)['host'] == 'testserver'
+
+    def test_cache_key_varies(self):
+        view = make_docs_data_view(make_api_info())
+        other_info_view = make_docs_data_view(make_api_info(title="Other API"))
+        self.get_spec(view)
+        self.get_spec(view, spec_format='yaml')
+        self.get_spec(other_info_view)
+        assert json.loads(self.get_spec(view, host='example.com'))['host'] == 'example.com'
+        # The YAML spec was derived from the cached JSON one.
+        assert self.mock_generate.call_count == 3
+
+    def test_cache_key_varies_by_language(self):
+        view = make_docs_data_view(make_api_info(), [path('api/translated/', TranslatedView.as_view())])
+        request = APIRequestFactory().get('/swagger.json')
+        contents, cache_keys = {}, {}
+        for language in ('en', 'fr'):
+            with translation.override(language):
+                contents[language] = self.get_spec(view)
+                cache_keys[language] = view.cls.schema_provider.get_cache_key('json', request)
+        assert cache_keys['en'] != cache_keys['fr']
+        assert b'lang=en' in contents['en']
+        assert b'lang=fr' in contents['fr']
+        assert self.mock_generate.call_count == 2
+
+    @override_settings(OPENAPI_CACHE_TIMEOUT=0)
+    def test_caching_disabled(self):
+        view = make_docs_data_view(make_api_info())
+        self.get_spec(view)
+        self.get_spec(view)
+        assert self.mock_generate.call_count == 2
+
+    def test_derive_yaml_from_cached_json(self):
+        view = make_docs_data_view(make_api_info())
+        yaml_content = self.get_spec(view, spec_format='yaml')
+        caches['docs'].delete(view.cls.schema_provider.get_cache_key('yaml', APIRequestFactory().get('/')))
+        assert self.get_spec(view, spec_format='yaml') == yaml_content
+        assert self.mock_generate.call_count == 1
+
+    def test_cache_requested_variant_only(self):
+        provider = make_docs_data_view(make_api_info()).cls.schema_provider
+        cache = caches['docs']
+        yaml_gzip_content = provider.get_spec('yaml', encoding='gzip')
+        assert cache.get(provider.get_cache_key('yaml', encoding='gzip')) == yaml_gzip_content
+        # JSON is always cached, since the other variants are derived from it.
+        json_content = cache.get(provider.get_cache_key('json'))
+        assert json.loads(json_content)['swagger'] == '2.0'
+        assert cache.get(provider.get_cache_key('yaml')) is None
+        assert cache.get(provider.get_cache_key('json', encoding='gzip')) is None
+        assert gzip.decompress(provider.get_spec('json', encoding='gzip')) == json_content
+        assert gzip.decompress(yaml_gzip_content) == provider.get_spec('yaml')
+        assert provider.get_spec_metadata('json', encoding='gzip')['etag']
+        assert self.mock_generate.call_count == 1
+
+    def test_ui_page_never_generates(self):
+        docs_views = {pattern.name: pattern.callback for pattern in make_docs_urls(make_api_info())}
+        with patch.object(ApiSchemaGenerator, 'get_schema') as mock_get_schema:
+            for _ in range(3):
+                response = docs_views['apidocs-ui'](APIRequestFactory().get('/api-docs/'))
+                assert response.status_code == 200
+                assert '<title>Open edX APIs</title>' in response.rendered_content.decode('utf-8')
+        assert not mock_get_schema.called
+        assert self.mock_generate.call_count == 0
+
+    def test_docs_views_share_provider(self):
+        docs_views = {pattern.name: pattern.callback for pattern in make_docs_urls(make_api_info())}
+        data_view, ui_view = docs_views['apidocs-data'], docs_views['apidocs-ui']
+        assert data_view.cls.schema_provider is ui_view.cls.schema_provider
+        json_content = self.get_spec(data_view)
+        assert self.get_spec(data_view, spec_format='yaml').startswith(b'swagger:')
+        # The Swagger UI page fetches the spec from its own URL.
+        ui_response = ui_view(APIRequestFactory().get('/api-docs/', {'format': 'openapi'}))
+        assert ui_response.content == json_content
+        # Loading the UI page itself doesn't generate anything either.
+        for _ in range(2):
+            assert ui_view(APIRequestFactory().get('/api-docs/')).status_code == 200
+        assert self.mock_generate.call_count == 1
+
+    def test_wait_for_other_process(self):
+        """
+        Test that we wait for a process that's already generating the spec instead of generating it too.
+        """
+        view = make_docs_data_view(make_api_info())
+        provider = view.cls.schema_provider
+        request = APIRequestFactory().get('/swagger.json')
+        cache_key = provider.get_cache_key('json', request)
+        caches['docs'].add(f'{provider.get_cache_key(None, request)}.lock', True)
+
+        def finish_other_generation(_seconds):
+            caches['docs'].set(cache_key, b'{"generated": "elsewhere"}')
+
+        with patch('edx_api_doc_tools.schema_provider.time.sleep', side_effect=finish_other_generation):
+            assert self.get_spec(view) == b'{"generated": "elsewhere"}'
+        assert self.mock_generate.call_count == 0
+
+    def test_take_over_failed_generation(self):
+        """
+        Test that we generate the spec as soon as a process that was generating it fails.
+        """
+        view = make_docs_data_view(make_api_info())
+        provider = view.cls.schema_provider
+        lock_key = f'{provider.get_cache_key(None, APIRequestFactory().get("/swagger.json"))}.lock'
+        caches['docs'].add(lock_key, True)
+
+        def fail_other_generation(_seconds):
+            caches['docs'].delete(lock_key)
+
+        with patch(
+            'edx_api_doc_tools.schema_provider.time.sleep', side_effect=fail_other_generation,
+        ) as mock_sleep:
+            assert json.loads(self.get_spec(view))['swagger'] == '2.0'
+        assert mock_sleep.call_count == 1
+        assert self.mock_generate.call_count == 1
+        # The lock was released after the generation.
+        assert caches['docs'].get(lock_key) is None
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class FingerprintTests(SimpleTestCase):
+    """
+    Test that the fingerprint in cache keys changes when, and only when, the documented API does.
+    """
+
+    def get_fingerprint(self, **kwargs):
+        """
+        Get the fingerprint of the example API's spec from a new schema provider.
+        """
+        return SchemaProvider(make_api_info(), **kwargs).get_fingerprint()
+
+    def test_stable_between_processes(self):
+        output = subprocess.run(
+            [
+                sys.executable, '-c',
+                "import django; django.setup(); "
+                "from django.test.utils import override_settings; "
+                "from edx_api_doc_tools import make_api_info; "
+                "from edx_api_doc_tools.schema_provider import SchemaProvider; "
+                "override_settings(ROOT_URLCONF='example.urls').enable(); "
+                "print(SchemaProvider(make_api_info()).get_fingerprint())",
+            ],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+        # Serving requests doesn't change the fingerprint either.
+        self.client.get('/api/hedgehog/v0/hogs/')
+        assert output == self.get_fingerprint()
+
+    def test_tracks_api_surface(self):
+        fingerprint = self.get_fingerprint()
+        with patch.dict(HedgehogViewSet.list._swagger_auto_schema, operation_description="Changed."):
+            assert self.get_fingerprint() != fingerprint
+        with patch.dict(HedgehogSerializer._declared_fields, nickname=CharField()):  # pylint: disable=no-member
+            assert self.get_fingerprint() != fingerprint
+        with patch('edx_api_doc_tools.schema_provider.get_dependency_versions', return_value=[['drf-yasg', '0']]):
+            assert self.get_fingerprint() != fingerprint
+        with override_settings(OPENAPI_EXCLUDED_VIEWS=['example.views.HedgehogViewSet.list']):
+            assert self.get_fingerprint() != fingerprint
+        with override_settings(OPENAPI_EXCLUDED_PATH_PREFIXES=['/api/hedgehog/v0/info']):
+            assert self.get_fingerprint() != fingerprint
+        assert self.get_fingerprint(deployment_id='abc123') != fingerprint
+        assert self.get_fingerprint() == fingerprint
+
+    def test_independent_of_language(self):
+        patterns = [path('api/translated/', TranslatedView.as_view())]
+        with translation.override('en'):
+            fingerprint = self.get_fingerprint(api_url_patterns=patterns)
+        with translation.override('fr'):
+            assert self.get_fingerprint(api_url_patterns=patterns) == fingerprint
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'forever'}},
+        OPENAPI_CACHE_TIMEOUT=None,
+    )
+    def test_cache_forever(self):
+        provider = make_docs_data_view(make_api_info()).cls.schema_provider
+        with patch.object(caches['default'], 'set_many', wraps=caches['default'].set_many) as mock_set_many:
+            content = provider.get_spec('json')
+            assert provider.get_spec('json') == content
+        mock_set_many.assert_called_once()
+        assert mock_set_many.call_args[0][1] is None
+
+
+@override_settings(
+    ROOT_URLCONF=example_urls.__name__,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'compression'}},
+    OPENAPI_CACHE_TIMEOUT=60,
+)
+class CompressionTests(SimpleTestCase):
+    """
+    Test serving precompressed specs.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        compress_patcher = patch.dict(CONTENT_ENCODINGS, gzip=Mock(wraps=CONTENT_ENCODINGS['gzip']))
+        compress_patcher.start()
+        self.addCleanup(compress_patcher.stop)
+        self.mock_gzip = CONTENT_ENCODINGS['gzip']
+        self.view = make_docs_data_view(make_api_info())
+
+    def get_spec(self, url, accept_encoding=None):
+        """
+        Call the docs data view as routed by ``get_docs_urls`` and return the response.
+        """
+        request_kwargs = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding else {}
+        request = APIRequestFactory().get(url, **request_kwargs)
+        return self.view(request, **resolve(url).kwargs)
+
+    def test_negotiate_gzip(self):
+        plain_response = self.get_spec('/swagger.json')
+        assert 'Content-Encoding' not in plain_response
+        assert has_vary_header(plain_response, 'Accept-Encoding')
+        for _ in range(2):
+            response = self.get_spec('/swagger.json', accept_encoding='gzip, deflate')
+            assert response['Content-Encoding'] == 'gzip'
+            assert response['Content-Type'] == 'application/json; charset=utf-8'
+            assert has_vary_header(response, 'Accept-Encoding')
+            assert gzip.decompress(response.content) == plain_response.content
+        # Compressed once, when it was first requested; the JSON spec wasn't even rendered as YAML.
+        assert self.mock_gzip.call_count == 1
+
+    def test_compressed_spec_url(self):
+        response = self.get_spec('/swagger.yaml.gz')
+        assert response['Content-Encoding'] == 'gzip'
+        assert not has_vary_header(response, 'Accept-Encoding')
+        assert gzip.decompress(response.content) == self.get_spec('/swagger.yaml').content
+
+    @skipUnless(brotli, "brotli isn't installed")
+    def test_negotiate_brotli(self):
+        response = self.get_spec('/swagger.json', accept_encoding='gzip, br')
+        assert response['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.content))['swagger'] == '2.0'
+
+    @override_settings(OPENAPI_CACHE_TIMEOUT=0)
+    def test_caching_disabled(self):
+        self.view = make_docs_data_view(make_api_info())
+        response = self.get_spec('/swagger.json', accept_encoding='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.content))['swagger'] == '2.0'
+
+    def test_choose_content_encoding(self):
+        assert choose_content_encoding('') == 'identity'
+        assert choose_content_encoding('deflate') == 'identity'
+        assert choose_content_encoding('gzip;q=0, identity') == 'identity'
+        assert choose_content_encoding('GZIP;q=0.5') == 'gzip'
+        assert choose_content_encoding('*') == next(iter(CONTENT_ENCODINGS))
+
+
+@override_settings(
+    ROOT_URLCONF=example_urls.__name__,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'conditional'}},
+    OPENAPI_CACHE_TIMEOUT=60,
+)
+class ConditionalRequestTests(SimpleTestCase):
+    """
+    Test the validator and caching headers of spec responses, and conditional requests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        self.view = make_docs_data_view(make_api_info())
+
+    def get_spec(self, **headers):
+        """
+        Call the docs data view for swagger.json with some request headers and return the response.
+        """
+        request = APIRequestFactory().get('/swagger.json', **headers)
+        return self.view(request, format='.json')
+
+    def test_headers(self):
+        response = self.get_spec()
+        assert response['ETag'] == f'"{SchemaProvider.get_content_metadata(response.content)["etag"]}"'
+        assert response['Last-Modified']
+        assert response['Cache-Control'] == 'public, max-age=0'
+        gzip_response = self.get_spec(HTTP_ACCEPT_ENCODING='gzip')
+        assert gzip_response['ETag'] != response['ETag']
+        assert self.get_spec()['ETag'] == response['ETag']
+
+    @override_settings(OPENAPI_HTTP_MAX_AGE=300)
+    def test_max_age_setting(self):
+        assert self.get_spec()['Cache-Control'] == 'public, max-age=300'
+
+    def test_not_modified(self):
+        response = self.get_spec()
+        with patch.object(SchemaProvider, 'get_spec') as mock_get_spec:
+            not_modified_response = self.get_spec(HTTP_IF_NONE_MATCH=response['ETag'])
+            assert not_modified_response.status_code == 304
+            assert not_modified_response['ETag'] == response['ETag']
+            assert not_modified_response['Cache-Control'] == 'public, max-age=0'
+            assert self.get_spec(HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+        assert mock_get_spec.call_count == 0
+        assert self.get_spec(HTTP_IF_NONE_MATCH='"outdated"').status_code == 200
+
+    @override_settings(OPENAPI_CACHE_TIMEOUT=0)
+    def test_caching_disabled(self):
+        self.view = make_docs_data_view(make_api_info())
+        response = self.get_spec()
+        assert response['ETag']
+        # The spec is generated again, but the client's copy is still current.
+        not_modified_response = self.get_spec(HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified_response.status_code == 304
+        assert not_modified_response['ETag'] == response['ETag']
+        assert self.get_spec(HTTP_IF_NONE_MATCH='"outdated"').status_code == 200
+
+    def test_not_modified_cold_cache(self):
+        response = self.get_spec()
+        caches['default'].clear()
+        generate_patch = patch.object(SchemaProvider, 'generate', autospec=True, side_effect=SchemaProvider.generate)
+        with generate_patch as mock_generate:
+            assert self.get_spec(HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        assert mock_generate.call_count == 1
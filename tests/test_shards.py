@@ -0,0 +1,168 @@
+"""
+Tests for slicing specs into shards, and serving them.
+"""
+
+import json
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import make_api_info, make_docs_data_view
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from edx_api_doc_tools.shards import SpecIndex
+from example import urls as example_urls
+
+
+def ref(name):
+    """
+    Return a reference to a definition.
+    """
+    return {'$ref': f'#/definitions/{name}'}
+
+
+class SpecIndexTests(SimpleTestCase):
+    """
+    Test slicing specs by tag and path prefix.
+    """
+    spec = {
+        'swagger': '2.0',
+        'basePath': '/api',
+        'paths': {
+            '/courses/': {
+                'get': {'tags': ['courses'], 'responses': {'200': {'schema': ref('Course')}}},
+                'post': {'tags': ['admin'], 'parameters': [{'in': 'body', 'schema': ref('NewCourse')}]},
+                'parameters': [],
+            },
+            '/courses/{id}/': {
+                'get': {'tags': ['courses'], 'responses': {'200': {'schema': ref('Course')}}},
+                'parameters': [{'name': 'id', 'in': 'path'}],
+            },
+            '/coursesv2/': {
+                'get': {'tags': ['courses'], 'responses': {'200': {'schema': {'type': 'string'}}}},
+            },
+            '/users/': {
+                'get': {'tags': ['users'], 'responses': {'200': {'schema': ref('User')}}},
+            },
+        },
+        'definitions': {
+            'Org': {'type': 'object'},
+            'Course': {'type': 'object', 'properties': {'org': ref('Org')}},
+            'NewCourse': {'type': 'object'},
+            'User': {'type': 'object'},
+        },
+        'securityDefinitions': {'Bearer': {'type': 'apiKey'}},
+    }
+
+    def test_tag_shard(self):
+        shard = SpecIndex(self.spec).get_tag_shard('courses')
+        assert list(shard) == list(self.spec)
+        assert list(shard['paths']) == ['/courses/', '/courses/{id}/', '/coursesv2/']
+        assert list(shard['paths']['/courses/']) == ['get', 'parameters']
+        assert list(shard['definitions']) == ['Org', 'Course']
+        assert shard['securityDefinitions'] == self.spec['securityDefinitions']
+
+    def test_path_prefix_shard(self):
+        index = SpecIndex(self.spec)
+        shard = index.get_path_prefix_shard('api/courses')
+        assert list(shard['paths']) == ['/courses/', '/courses/{id}/']
+        assert list(shard['paths']['/courses/']) == ['get', 'post', 'parameters']
+        assert list(shard['definitions']) == ['Org', 'Course', 'NewCourse']
+        assert list(index.get_path_prefix_shard('/api/courses/{id}/')['paths']) == ['/courses/{id}/']
+        assert index.get_path_prefix_shard('/')['paths'] == self.spec['paths']
+
+    def test_no_definitions(self):
+        shard = SpecIndex(self.spec).get_path_prefix_shard('/api/coursesv2')
+        assert 'definitions' not in shard
+
+    def test_compact_index(self):
+        index = SpecIndex(self.spec)
+        compact_index = SpecIndex(self.spec, compact=True)
+        assert isinstance(compact_index.spec['paths']['/courses/']['get'], bytes)
+        assert compact_index.get_tag_shard('courses') == index.get_tag_shard('courses')
+        assert compact_index.get_path_prefix_shard('/api/courses') == index.get_path_prefix_shard('/api/courses')
+        assert compact_index.get_tag_shard('nonexistent') is None
+
+    def test_empty_shards(self):
+        index = SpecIndex(self.spec)
+        assert index.get_tag_shard('nonexistent') is None
+        assert index.get_path_prefix_shard('/api/course') is None
+        assert index.get_path_prefix_shard('/other') is None
+
+
+@override_settings(
+    ROOT_URLCONF=example_urls.__name__,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shards'}},
+    OPENAPI_CACHE_TIMEOUT=60,
+)
+class ShardViewTests(SimpleTestCase):
+    """
+    Test serving shards from the docs data view.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        generate_patcher = patch.object(SchemaProvider, 'generate', autospec=True, side_effect=SchemaProvider.generate)
+        self.mock_generate = generate_patcher.start()
+        self.addCleanup(generate_patcher.stop)
+        self.view = make_docs_data_view(make_api_info())
+
+    def get_spec(self, url, **headers):
+        """
+        Call the docs data view as routed by ``get_docs_urls`` and return the response.
+        """
+        request = APIRequestFactory().get(url, **headers)
+        return self.view(request, **resolve(url).kwargs)
+
+    def test_shards(self):
+        full_spec = json.loads(self.get_spec('/swagger.json').content)
+        tag_shard = json.loads(self.get_spec('/swagger/tags/hedgehog.json').content)
+        assert tag_shard == full_spec
+        path_shard = json.loads(self.get_spec('/swagger/paths/api/hedgehog/v0/hogs.json').content)
+        assert list(path_shard['paths']) == ['/hedgehog/v0/hogs/', '/hedgehog/v0/hogs/{hedgehog_key}/']
+        assert list(path_shard['definitions']) == ['Hedgehog']
+        yaml_response = self.get_spec('/swagger/paths/api/hedgehog/v0/info.yaml')
+        assert yaml_response['Content-Type'] == 'application/yaml; charset=utf-8'
+        assert b'/hedgehog/v0/info:' in yaml_response.content
+        assert self.mock_generate.call_count == 1
+
+    def test_not_modified(self):
+        response = self.get_spec('/swagger/tags/hedgehog.json')
+        assert self.get_spec('/swagger/tags/hedgehog.json', HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+    def test_reuse_rendered_shards(self):
+        response = self.get_spec('/swagger/tags/hedgehog.json', HTTP_ACCEPT_ENCODING='gzip')
+        with patch.object(
+            SchemaProvider, 'render_data', side_effect=SchemaProvider.render_data,
+        ) as mock_render_data, patch.object(SchemaProvider, 'compress') as mock_compress:
+            repeated_response = self.get_spec('/swagger/tags/hedgehog.json', HTTP_ACCEPT_ENCODING='gzip')
+            with patch.object(SchemaProvider, 'get_spec_shard') as mock_get_spec_shard:
+                not_modified_response = self.get_spec(
+                    '/swagger/tags/hedgehog.json', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'],
+                )
+        assert repeated_response.content == response.content
+        assert repeated_response['ETag'] == response['ETag']
+        assert not_modified_response.status_code == 304
+        assert mock_get_spec_shard.call_count == 0
+        assert mock_render_data.call_count == 0
+        assert mock_compress.call_count == 0
+        # Each format and encoding of a shard is rendered separately.
+        with patch.object(SchemaProvider, 'render_data', side_effect=SchemaProvider.render_data) as mock_render_data:
+            self.get_spec('/swagger/tags/hedgehog.json')
+        assert mock_render_data.call_count == 1
+
+    def test_unknown_shard(self):
+        assert self.get_spec('/swagger/tags/porcupine.json').status_code == 404
+        assert self.get_spec('/swagger/paths/api/porcupine.json').status_code == 404
+
+    def test_render_data(self):
+        spec = SchemaProvider(make_api_info()).generate()
+        for spec_format in ('json', 'yaml'):
+            with self.subTest(spec_format=spec_format):
+                content = SchemaProvider.render(spec, spec_format)
+                parsed_spec = json.loads(SchemaProvider.render(spec, 'json'))
+                assert SchemaProvider.render_data(parsed_spec, spec_format) == content
@@ -0,0 +1,51 @@
+"""
+Tests for incremental rendering of specs.
+"""
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from edx_api_doc_tools import ApiSchemaGenerator, make_api_info, make_docs_data_view
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from edx_api_doc_tools.streaming import iter_spec_chunks
+from example import urls as example_urls
+
+
+@override_settings(ROOT_URLCONF=example_urls.__name__)
+class StreamingTests(SimpleTestCase):
+    """
+    Test that streamed specs are the same as specs rendered in one go.
+    """
+
+    def get_spec(self, view, spec_format):
+        """
+        Call a docs data view and return the response.
+        """
+        request = APIRequestFactory().get(f'/swagger.{spec_format}')
+        return view(request, format=f'.{spec_format}')
+
+    def test_same_as_render(self):
+        api_info = make_api_info(description="Hérisson API.\n\nSee the docs for more.")
+        spec = ApiSchemaGenerator(api_info, url='http://testserver').get_schema(public=True)
+        for spec_format in ('json', 'yaml'):
+            with self.subTest(spec_format=spec_format):
+                chunks = list(iter_spec_chunks(spec, spec_format))
+                assert b''.join(chunks) == SchemaProvider.render(spec, spec_format)
+        assert len(list(iter_spec_chunks(spec, 'json'))) > len(spec['paths'])
+
+    def test_streaming_response(self):
+        view = make_docs_data_view(make_api_info())
+        with override_settings(OPENAPI_STREAMING_RESPONSES=True):
+            streaming_view = make_docs_data_view(make_api_info())
+        for spec_format in ('json', 'yaml'):
+            with self.subTest(spec_format=spec_format):
+                response = self.get_spec(streaming_view, spec_format)
+                assert response.streaming
+                assert 'ETag' not in response
+                assert b''.join(response.streaming_content) == self.get_spec(view, spec_format).content
+
+    @override_settings(OPENAPI_STREAMING_RESPONSES=True, OPENAPI_CACHE_TIMEOUT=60)
+    def test_cached_specs_not_streamed(self):
+        view = make_docs_data_view(make_api_info())
+        assert not self.get_spec(view, 'json').streaming
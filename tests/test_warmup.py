@@ -0,0 +1,105 @@
+"""
+Tests for warming up API specs in the background.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from edx_api_doc_tools import make_api_info, make_docs_urls, warmup
+from edx_api_doc_tools.apps import EdxApiDocToolsConfig
+from edx_api_doc_tools.schema_provider import SchemaProvider
+from example import urls as example_urls
+
+
+class WarmupUrls:
+    """
+    The example API, with docs views that read their settings when they're first used.
+    """
+    urlpatterns = [
+        pattern for pattern in example_urls.urlpatterns
+        if not (pattern.name or '').startswith('apidocs')
+    ] + make_docs_urls(make_api_info(title="Hedgehog API"), lazy=True)
+
+
+@override_settings(
+    ROOT_URLCONF=WarmupUrls,
+    ALLOWED_HOSTS=['testserver', 'courses.example.com'],
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'warmup'}},
+    OPENAPI_CACHE_TIMEOUT=60,
+)
+class WarmUpSpecsTests(SimpleTestCase):
+    """
+    Test that warming up caches the spec that the docs views serve.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        generate_patcher = patch.object(SchemaProvider, 'generate', autospec=True, side_effect=SchemaProvider.generate)
+        self.mock_generate = generate_patcher.start()
+        self.addCleanup(generate_patcher.stop)
+
+    @override_settings(OPENAPI_WARMUP_URLS=['http://testserver', 'https://courses.example.com'])
+    def test_warm_up_specs(self):
+        assert warmup.warm_up_specs() == 2
+        assert self.mock_generate.call_count == 2
+        response = self.client.get('/swagger.json', HTTP_HOST='courses.example.com', secure=True)
+        assert response.status_code == 200
+        assert response.json()['host'] == 'courses.example.com'
+        assert self.client.get('/swagger.yaml').status_code == 200
+        assert self.mock_generate.call_count == 2
+
+    def test_uncached_docs_skipped(self):
+        # The example's docs views were built without caching.
+        assert warmup.warm_up_specs(example_urls.__name__) == 0
+        assert not self.mock_generate.called
+
+    def test_errors_logged(self):
+        self.mock_generate.side_effect = ValueError("broken view")
+        with self.assertLogs(warmup.log, 'ERROR') as logs:
+            assert warmup.warm_up_specs() == 0
+        assert "Failed to warm up the 'Hedgehog API' docs." in logs.output[0]
+
+
+@pytest.mark.parametrize('argv, environ, modules, allowed', [
+    (['gunicorn', 'lms.wsgi'], {}, {}, True),
+    (['gunicorn', 'lms.wsgi'], {}, {'pytest': None}, False),
+    (['/edx/bin/gunicorn', '--preload', 'lms.wsgi'], {}, {}, False),
+    (['/usr/local/bin/uwsgi', '--ini', 'lms.ini'], {}, {}, True),
+    (['celery', 'worker'], {}, {}, False),
+    (['/edx/bin/python', 'script.py'], {}, {}, False),
+    (['./manage.py', 'migrate'], {}, {}, False),
+    (['/usr/bin/django-admin', 'build_api_docs'], {}, {}, False),
+    (['./manage.py', 'lms', 'runserver'], {}, {}, False),
+    (['./manage.py', 'lms', 'runserver'], {'RUN_MAIN': 'true'}, {}, True),
+    (['./manage.py', 'runserver', '--noreload'], {}, {}, True),
+])
+def test_is_warmup_allowed(argv, environ, modules, allowed):
+    with patch('sys.argv', argv), patch.dict('os.environ', environ), patch.dict('sys.modules', modules):
+        if 'pytest' not in modules:
+            del warmup.sys.modules['pytest']
+        assert warmup.is_warmup_allowed() == allowed
+
+
+@override_settings(OPENAPI_WARMUP_PROGRAMS=['celery'])
+def test_warmup_programs_setting():
+    with patch('sys.argv', ['celery', 'worker']), patch.dict('sys.modules'):
+        del warmup.sys.modules['pytest']
+        assert warmup.is_warmup_allowed()
+
+
+@patch.object(warmup, 'is_warmup_allowed', return_value=True)
+@patch.object(warmup.threading, 'Timer')
+def test_app_ready_starts_warmup(mock_timer, _mock_allowed):
+    app_config = EdxApiDocToolsConfig.create('edx_api_doc_tools')
+    app_config.ready()
+    assert not mock_timer.called
+    with override_settings(OPENAPI_WARMUP=True, OPENAPI_WARMUP_DELAY=30):
+        app_config.ready()
+    mock_timer.assert_called_once_with(30, warmup.warm_up_specs)
+    assert mock_timer.return_value.daemon
+    mock_timer.return_value.start.assert_called_once_with()